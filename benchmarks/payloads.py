@@ -0,0 +1,185 @@
+import json
+import random
+from typing import Iterator
+
+from parser.base import Parser
+from parser.hh import HhParser
+from parser.sj import SjParser
+from settings import API_URL_EXCH_RATES
+from utils.exchange_rates_api import BASE_CURRENCY, normalize_currency
+from utils.replay import FixtureStore, ReplayResponse
+from vacancy import Vacancy
+
+PER_PAGE = 50
+
+CITIES = ('Москва', 'Санкт-Петербург', 'Новосибирск', 'Екатеринбург', 'Казань', 'Нижний Новгород', 'Самара',
+          'Краснодар', 'Алматы', 'Минск')
+EXPERIENCE = ('Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет')
+TITLES = ('Python-разработчик', 'Java developer', 'Аналитик данных', 'DevOps-инженер', 'Frontend-разработчик',
+          'Тестировщик', 'Менеджер проектов', 'Системный администратор', 'Data Scientist', 'Go developer')
+WORDS = ('python', 'django', 'fastapi', 'sql', 'postgresql', 'docker', 'kubernetes', 'linux', 'git', 'java',
+         'spring', 'react', 'typescript', 'аналитика', 'разработка', 'поддержка', 'тестирование', 'команда',
+         'проект', 'архитектура', 'микросервисы', 'высоконагруженные', 'системы', 'опыт', 'знание')
+
+# Синтетические курсы в формате API курсов валют: сколько единиц валюты стоит 1 рубль
+RATES = {'USD': 0.011, 'EUR': 0.0102, 'KZT': 5.3}
+# Валюты зарплат с долями: в основном рубли, иногда иностранные валюты
+HH_CURRENCIES = ('RUR',) * 8 + ('USD', 'EUR', 'KZT')
+SJ_CURRENCIES = ('rub',) * 8 + ('usd', 'eur')
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_salary(rng: random.Random) -> tuple[int | None, int | None]:
+    """
+    Функция для генерации границ зарплаты: указаны обе, только одна или ни одной
+    :param rng: генератор случайных чисел
+    :return: пара (от, до), где отсутствующая граница - None
+    """
+    low = rng.randrange(30, 400) * 1000
+    kind = rng.random()
+
+    if kind < 0.4:
+        return low, low + rng.randrange(10, 200) * 1000
+    if kind < 0.7:
+        return low, None
+    if kind < 0.85:
+        return None, low
+
+    return None, None
+
+
+def make_hh_item(rng: random.Random, number: int) -> dict:
+    """
+    Функция для генерации вакансии в формате API hh.ru
+    :param rng: генератор случайных чисел
+    :param number: порядковый номер вакансии (входит в ссылку, поэтому ссылки не повторяются)
+    :return: словарь с вакансией
+    """
+    salary_from, salary_to = make_salary(rng)
+    salary = None
+
+    if salary_from is not None or salary_to is not None:
+        salary = {'from': salary_from, 'to': salary_to, 'currency': rng.choice(HH_CURRENCIES), 'gross': False}
+
+    return {
+        'id': str(number),
+        'name': rng.choice(TITLES),
+        'area': {'id': str(rng.randrange(1, 100)), 'name': rng.choice(CITIES)},
+        'alternate_url': f'https://hh.ru/vacancy/{number}',
+        'employer': {'id': str(rng.randrange(1, 5000)), 'name': f'Компания {rng.randrange(1, 5000)}'},
+        'salary': salary,
+        'snippet': {'responsibility': make_text(rng, rng.randrange(10, 40)),
+                    'requirement': make_text(rng, rng.randrange(5, 25))},
+        'experience': {'id': 'between1And3', 'name': rng.choice(EXPERIENCE)},
+    }
+
+
+def make_sj_item(rng: random.Random, number: int) -> dict:
+    """
+    Функция для генерации вакансии в формате API superjob.ru
+    :param rng: генератор случайных чисел
+    :param number: порядковый номер вакансии (входит в ссылку, поэтому ссылки не повторяются)
+    :return: словарь с вакансией
+    """
+    salary_from, salary_to = make_salary(rng)
+
+    return {
+        'id': number,
+        'profession': rng.choice(TITLES),
+        'town': {'id': rng.randrange(1, 100), 'title': rng.choice(CITIES)},
+        'link': f'https://www.superjob.ru/vakansii/{number}.html',
+        'firm_name': f'Компания {rng.randrange(1, 5000)}',
+        'payment_from': salary_from or 0,
+        'payment_to': salary_to or 0,
+        'currency': rng.choice(SJ_CURRENCIES),
+        'candidat': make_text(rng, rng.randrange(15, 60)),
+        'experience': {'id': rng.randrange(1, 5), 'title': rng.choice(EXPERIENCE)},
+    }
+
+
+def iter_pages(platform: str, total: int, seed: int = 0) -> Iterator[dict]:
+    """
+    Генератор страниц ответа API с вакансиями (по PER_PAGE на странице).
+
+    При одинаковых total и seed страницы всегда одинаковые, поэтому результаты сравнимы между запусками
+    :param platform: hh.ru или superjob.ru
+    :param total: общее кол-во вакансий
+    :param seed: начальное значение генератора случайных чисел
+    :return: словари с ответом API для одной страницы
+    """
+    rng = random.Random(f'{platform}:{seed}')
+    make_item, key = (make_hh_item, 'items') if platform == HhParser.platform else (make_sj_item, 'objects')
+
+    for start in range(0, total, PER_PAGE):
+        items = [make_item(rng, number) for number in range(start, min(start + PER_PAGE, total))]
+
+        if platform == HhParser.platform:
+            yield {key: items, 'found': total, 'pages': -(-total // PER_PAGE), 'per_page': PER_PAGE}
+        else:
+            yield {key: items, 'total': total, 'more': start + PER_PAGE < total}
+
+
+def make_response(url: str, data: dict) -> ReplayResponse:
+    return ReplayResponse(200, url, json.dumps(data, ensure_ascii=False))
+
+
+def record_pages(store: FixtureStore, platform: str, query: str, total: int, seed: int = 0) -> list[Parser]:
+    """
+    Функция для записи синтетических страниц в хранилище ответов API.
+
+    Парсеры, которые возвращает функция, получают эти страницы через обычный get_data
+    (в локальном режиме, см. replay.FixtureStore)
+    :param store: хранилище записанных ответов
+    :param platform: hh.ru или superjob.ru
+    :param query: поисковый запрос, для которого записываются страницы
+    :param total: общее кол-во вакансий
+    :param seed: начальное значение генератора случайных чисел
+    :return: список парсеров по одному на страницу
+    """
+    parser_class = HhParser if platform == HhParser.platform else SjParser
+    parsers = []
+
+    for page, data in enumerate(iter_pages(platform, total, seed)):
+        parser = parser_class(query, page)
+        store.save(parser.url, parser.params, make_response(parser.url, data))
+        parsers.append(parser)
+
+    return parsers
+
+
+def record_rates(store: FixtureStore) -> list[str]:
+    """
+    Функция для записи ответа API курсов валют со всеми валютами синтетических вакансий.
+    :param store: хранилище записанных ответов
+    :return: отсортированный список валют (их курсы нужно запросить одним вызовом, чтобы ответ совпал)
+    """
+    currencies = sorted(RATES)
+    params = {'base': BASE_CURRENCY, 'symbols': ','.join(currencies)}
+    store.save(API_URL_EXCH_RATES, params, make_response(API_URL_EXCH_RATES, {'base': BASE_CURRENCY, 'rates': RATES}))
+
+    return currencies
+
+
+def make_vacancies(total: int, seed: int = 0) -> list[Vacancy]:
+    """
+    Функция для создания невалидированных вакансий с зарплатами в исходных валютах (для Vacancy.validate).
+    :param total: кол-во вакансий
+    :param seed: начальное значение генератора случайных чисел
+    :return: список объектов класса Vacancy
+    """
+    vacancies = []
+
+    for page in iter_pages(HhParser.platform, total, seed):
+        for item in page['items']:
+            salary = item['salary'] and {'from': item['salary']['from'], 'to': item['salary']['to'],
+                                         'currency': normalize_currency(item['salary']['currency'])}
+            vacancies.append(Vacancy(title=item['name'], location=item['area']['name'], link=item['alternate_url'],
+                                     employer=item['employer']['name'], salary=salary,
+                                     description=item['snippet']['responsibility'],
+                                     requirement=item['snippet']['requirement'],
+                                     experience=item['experience']['name'], source=HhParser.platform))
+
+    return vacancies
@@ -0,0 +1,358 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Callable
+
+from benchmarks.payloads import RATES, make_vacancies, record_pages, record_rates
+from file_handler.factory import BACKENDS, DEFAULT_FILENAMES
+from parser.hh import HhParser
+from parser.sj import SjParser
+from settings import JSON_CODEC, STORAGE_FORMAT
+from utils import exchange_rates_api
+from utils.exchange_rates_api import RateProvider
+from utils.replay import fixture_store
+from utils.salary_stats import exact_quantile
+
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / 'results.json'
+QUERY = 'benchmark'
+# Курсы к рублю для Vacancy.validate (обратные к курсам синтетического API)
+RUB_RATES = {currency: 1 / rate for currency, rate in RATES.items()}
+
+
+def measure(make_ops: Callable[[], list[Callable]], items: int, repeat: int, track_memory: bool) -> dict:
+    """
+    Функция для замера набора операций.
+
+    make_ops подготавливает данные (это время не учитывается) и возвращает операции одного прогона.
+    Задержка замеряется для каждой операции, пропускная способность - по медиане времени прогона.
+    Пиковая память замеряется в отдельном прогоне под tracemalloc, чтобы он не искажал время
+    :param make_ops: функция, которая возвращает список операций для одного прогона
+    :param items: кол-во вакансий, обрабатываемых за прогон
+    :param repeat: кол-во прогонов
+    :param track_memory: замерять ли пиковую память
+    :return: словарь с результатами замера
+    """
+    runs = []
+    latencies = []
+
+    for _ in range(repeat):
+        ops = make_ops()
+        run_start = perf_counter()
+
+        for op in ops:
+            start = perf_counter()
+            op()
+            latencies.append(perf_counter() - start)
+
+        runs.append(perf_counter() - run_start)
+
+    latencies.sort()
+    seconds = median(runs)
+    result = {
+        'items': items,
+        'repeat': repeat,
+        'ops_per_run': len(latencies) // repeat,
+        'seconds': seconds,
+        'best_seconds': min(runs),
+        'items_per_second': items / seconds if seconds else None,
+        'latency_ms': {name: exact_quantile(latencies, q) * 1000
+                       for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'peak_memory_bytes': None,
+    }
+
+    if track_memory:
+        ops = make_ops()
+        tracemalloc.start()
+
+        try:
+            for op in ops:
+                op()
+
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def create_bench_handler(backend: str, directory: Path):
+    """
+    Функция для создания объекта хранилища, файлы которого находятся во временном каталоге, а не в DATA_PATH.
+    :param backend: тип хранилища (json, jsonl, sqlite)
+    :param directory: каталог для файлов хранилища
+    :return: объект класса FileHandler
+    """
+    class BenchHandler(BACKENDS[backend]):
+
+        @property
+        def path(self) -> str:
+            return str(directory / self.filename)
+
+    return BenchHandler(DEFAULT_FILENAMES[backend])
+
+
+def remove_store(handler):
+    """
+    Функция для удаления файлов хранилища и его служебных файлов (индексы, удаленные строки, журнал SQLite).
+    :param handler: объект класса FileHandler
+    :return: None
+    """
+    if hasattr(handler, 'close'):
+        handler.close()
+
+    for path in Path(handler.path).parent.glob(Path(handler.path).name + '*'):
+        path.unlink()
+
+
+def parse_cases(parsers: dict[str, list], size: int) -> dict[str, tuple[Callable, int]]:
+    """
+    Функция для подготовки замеров разбора страниц API (по одной операции на страницу) и Vacancy.validate.
+    :param parsers: словарь {платформа: список парсеров с записанными страницами}
+    :param size: общее кол-во вакансий
+    :return: словарь {название замера: (функция подготовки операций, кол-во вакансий)}
+    """
+    cases = {}
+
+    for platform_name, platform_parsers in parsers.items():
+        count = size // 2 if platform_name == HhParser.platform else size - size // 2
+        cases[f'parse_data.{platform_name}'] = (lambda platform_parsers=platform_parsers:
+                                                [parser.parse_data for parser in platform_parsers], count)
+
+    cases['vacancy.validate'] = (lambda: [lambda vacancies=make_vacancies(size): [vacancy.validate(RUB_RATES)
+                                                                                 for vacancy in vacancies]], size)
+
+    return cases
+
+
+def handler_cases(backend: str, directory: Path, vacancies: list, size: int) -> dict[str, tuple[Callable, int]]:
+    """
+    Функция для подготовки замеров операций хранилища.
+
+    Перед каждым прогоном хранилище создается заново (или открывается новым объектом, чтобы не было
+    кэша в памяти), поэтому замеряется холодное чтение файла, как при запуске программы
+    :param backend: тип хранилища
+    :param directory: каталог для файлов хранилища
+    :param vacancies: вакансии для записи
+    :param size: кол-во вакансий
+    :return: словарь {название замера: (функция подготовки операций, кол-во вакансий)}
+    """
+    deleted = vacancies[::10]
+
+    def fresh():
+        handler = create_bench_handler(backend, directory)
+        remove_store(handler)
+
+        return create_bench_handler(backend, directory)
+
+    def filled():
+        handler = fresh()
+        handler.add_vacancies(vacancies)
+
+        if hasattr(handler, 'close'):
+            handler.close()
+
+        return create_bench_handler(backend, directory)
+
+    def reopened():
+        handler = create_bench_handler(backend, directory)
+
+        if not os.path.exists(handler.path):
+            return filled()
+
+        return handler
+
+    def sort_by_salary(handler):
+        return sorted(handler.get_vacancies(), key=lambda el: el.salary_key, reverse=True)
+
+    return {
+        f'{backend}.add_vacancies': (lambda: [lambda handler=fresh(): handler.add_vacancies(vacancies)], size),
+        f'{backend}.get_vacancies': (lambda: [reopened().get_vacancies], size),
+        f'{backend}.filter': (lambda: [lambda handler=reopened(): handler.get_vacancies(
+            city='Москва', salary={'from': 100000, 'to': None})], size),
+        f'{backend}.search': (lambda: [lambda handler=reopened(): handler.get_vacancies(
+            text={'words': 'python docker', 'mode': 'and', 'prefix': False})], size),
+        f'{backend}.top_by_salary': (lambda: [lambda handler=reopened(): handler.top_by_salary(10)], size),
+        f'{backend}.sort_by_salary': (lambda: [lambda handler=reopened(): sort_by_salary(handler)], size),
+        f'{backend}.delete_vacancies': (lambda: [lambda handler=filled(): handler.delete_vacancies(deleted)], size),
+    }
+
+
+def run_size(size: int, backends: list[str], repeat: int, track_memory: bool, seed: int) -> list[dict]:
+    """
+    Функция для выполнения всех замеров для одного кол-ва вакансий.
+
+    Страницы API записываются в хранилище ответов во временном каталоге, и парсеры читают их
+    в локальном режиме без сети. Курсы валют тоже берутся из записанного ответа
+    :param size: кол-во вакансий
+    :param backends: типы хранилищ
+    :param repeat: кол-во прогонов
+    :param track_memory: замерять ли пиковую память
+    :param seed: начальное значение генератора случайных чисел
+    :return: список результатов замеров
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix='vacancy-bench-') as tmp:
+        directory = Path(tmp)
+        fixture_store.path = directory / 'fixtures'
+
+        parsers = {HhParser.platform: record_pages(fixture_store, HhParser.platform, QUERY, size // 2, seed),
+                   SjParser.platform: record_pages(fixture_store, SjParser.platform, QUERY, size - size // 2, seed)}
+
+        exchange_rates_api.rate_provider = RateProvider(cache_path=None)
+        exchange_rates_api.get_currency_rates(record_rates(fixture_store))
+
+        cases = parse_cases(parsers, size)
+        vacancies = [vacancy for platform_parsers in parsers.values() for parser in platform_parsers
+                     for vacancy in parser.parse_data()]
+
+        for backend in backends:
+            cases.update(handler_cases(backend, directory, vacancies, size))
+
+        for name, (make_ops, items) in cases.items():
+            result = {'name': name, 'size': size, **measure(make_ops, items, repeat, track_memory)}
+            results.append(result)
+            print_result(result)
+
+        for backend in backends:
+            remove_store(create_bench_handler(backend, directory))
+
+    return results
+
+
+def get_revision() -> str | None:
+    """
+    Функция для получения текущей ревизии git (для сравнения результатов между ревизиями)
+    :return: хэш коммита или None, если git недоступен
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result: dict):
+    memory = result['peak_memory_bytes']
+    print(f"{result['name']:<28} {result['size']:>9} {result['seconds']:>10.4f} s "
+          f"{result['items_per_second'] or 0:>12.0f}/s p50 {result['latency_ms']['p50']:>9.3f} ms "
+          f"p99 {result['latency_ms']['p99']:>9.3f} ms"
+          + (f" {memory / 2 ** 20:>8.1f} MiB" if memory is not None else ''))
+
+
+def compare_results(old: dict, new: dict, threshold: float) -> list[str]:
+    """
+    Функция для сравнения двух файлов результатов по медиане времени прогона.
+    :param old: результаты предыдущей ревизии
+    :param new: результаты текущей ревизии
+    :param threshold: допустимое относительное замедление (0.2 - на 20%)
+    :return: список замеров, которые замедлились больше допустимого
+    """
+    previous = {(result['name'], result['size']): result for result in old['results']}
+    regressions = []
+
+    print(f"\nСравнение с {old['meta'].get('revision') or 'предыдущим запуском'}:")
+
+    for result in new['results']:
+        before = previous.get((result['name'], result['size']))
+
+        if before is None or not before['seconds']:
+            continue
+
+        change = result['seconds'] / before['seconds'] - 1
+        is_regression = change > threshold
+        print(f"{result['name']:<28} {result['size']:>9} {change:>+8.1%}" + (' РЕГРЕССИЯ' if is_regression else ''))
+
+        if is_regression:
+            regressions.append(f"{result['name']}[{result['size']}]")
+
+    return regressions
+
+
+def parse_sizes(value: str) -> list[int]:
+    return [int(float(size)) for size in value.split(',') if size.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Функция для запуска замеров из командной строки: python -m benchmarks.run --sizes 1e3,1e4,1e5
+    :param argv: аргументы командной строки
+    :return: код завершения: 0 - успешно, 1 - есть регрессии относительно --compare
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run',
+                                     description='Замеры разбора, хранения, фильтрации и сортировки вакансий.')
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help='кол-ва вакансий через запятую, например 1e3,1e4,1e6 (по умолчанию 1000,10000)')
+    parser.add_argument('--backends', default='json',
+                        help=f"хранилища через запятую ({','.join(sorted(BACKENDS))}, по умолчанию json)")
+    parser.add_argument('--repeat', type=int, default=3, help='кол-во прогонов каждого замера (по умолчанию 3)')
+    parser.add_argument('--seed', type=int, default=0, help='начальное значение генератора данных')
+    parser.add_argument('--no-memory', action='store_true', help='не замерять пиковую память (быстрее)')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='файл для результатов в формате JSON')
+    parser.add_argument('--compare', type=Path, help='файл с результатами предыдущей ревизии для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='допустимое замедление относительно --compare (по умолчанию 0.2 - 20%%)')
+    args = parser.parse_args(argv)
+
+    backends = [backend.strip() for backend in args.backends.split(',') if backend.strip()]
+
+    for backend in backends:
+        if backend not in BACKENDS:
+            parser.error(f"неверное хранилище: {backend}")
+
+    store_state = (fixture_store.path, fixture_store.enabled, fixture_store.strict)
+    rate_provider = exchange_rates_api.rate_provider
+    fixture_store.enabled, fixture_store.strict = True, True
+    results = []
+
+    try:
+        for size in args.sizes:
+            results += run_size(size, backends, args.repeat, not args.no_memory, args.seed)
+    finally:
+        fixture_store.path, fixture_store.enabled, fixture_store.strict = store_state
+        exchange_rates_api.rate_provider = rate_provider
+
+    report = {
+        'meta': {
+            'revision': get_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'storage_format': STORAGE_FORMAT,
+            'json_codec': JSON_CODEC,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+
+    print(f"\nРезультаты записаны в {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            regressions = compare_results(json.load(file), report, args.threshold)
+
+        if regressions:
+            print(f"Замедлились: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,441 @@
+import argparse
+import json
+import sys
+from contextlib import nullcontext
+from itertools import chain
+
+import requests
+
+from file_handler.base import FileHandler
+from file_handler.factory import BACKENDS, create_handler
+from file_handler.json_handler import JsonHandler
+from utils.dedup import DedupIndex, ingest_vacancies
+from utils.fetch_engine import FetchEngine
+from utils.http_session import close_sessions
+from utils.instrumentation import metrics, profile
+from utils.salary_stats import DIMENSIONS, salary_report
+from utils.scheduler import Checkpoint, Job, JobScheduler, load_jobs
+from utils.sync import sync_vacancies
+from utils.user_interface import stream_vacancies
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_INTERRUPTED = 130
+
+
+def split_list(value: str) -> list[str]:
+    """
+    Функция для разбора аргумента со значениями через запятую
+    :param value: строка со значениями через запятую
+    :return: список значений без пробелов по краям
+    """
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def add_storage_arguments(parser: argparse.ArgumentParser):
+    """
+    Функция для добавления аргументов выбора хранилища.
+    :param parser: парсер подкоманды
+    :return: None
+    """
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='json', help='тип хранилища (по умолчанию json)')
+    parser.add_argument('--file', help='имя файла хранилища в каталоге данных')
+
+
+def add_fetch_arguments(parser: argparse.ArgumentParser):
+    """
+    Функция для добавления аргументов загрузки вакансий.
+    :param parser: парсер подкоманды
+    :return: None
+    """
+    parser.add_argument('-q', '--query', action='append', required=True,
+                        help='поисковый запрос (можно указать несколько раз)')
+    parser.add_argument('-p', '--platforms', type=split_list, default=['hh.ru', 'superjob.ru'],
+                        help='платформы через запятую (по умолчанию hh.ru,superjob.ru)')
+    parser.add_argument('--pages', type=int, default=1, help='кол-во страниц по 50 вакансий для каждого запроса')
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser):
+    """
+    Функция для добавления аргументов сбора метрик и профилирования.
+    :param parser: парсер подкоманды
+    :return: None
+    """
+    group = parser.add_argument_group('метрики')
+    group.add_argument('--metrics', action='store_true', help='вывести в stderr время этапов, объем данных и '
+                                                              'попадания в кэш после выполнения команды')
+    group.add_argument('--metrics-file', help='сохранить сводку метрик в JSON-файл')
+    group.add_argument('--profile', help='профилировать команду через cProfile и сохранить статистику в файл')
+
+
+def export_metrics(args: argparse.Namespace):
+    """
+    Функция для вывода и сохранения сводки метрик после выполнения команды.
+    :param args: аргументы командной строки
+    :return: None
+    """
+    if args.metrics:
+        print(metrics.format_summary(), file=sys.stderr)
+
+    if args.metrics_file:
+        metrics.save(args.metrics_file)
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser):
+    """
+    Функция для добавления аргументов фильтрации (см. filters.parse_filters).
+    :param parser: парсер подкоманды
+    :return: None
+    """
+    group = parser.add_argument_group('фильтры')
+    group.add_argument('--city', type=split_list, help='города через запятую')
+    group.add_argument('--employer', type=split_list, help='работодатели через запятую')
+    group.add_argument('--source', type=split_list, help='источники через запятую (hh.ru, superjob.ru)')
+    group.add_argument('--experience', type=split_list, help='требуемый опыт через запятую')
+    group.add_argument('--salary-from', type=int, help='минимальная зарплата')
+    group.add_argument('--salary-to', type=int, help='максимальная зарплата')
+    group.add_argument('--description', type=split_list, help='слова в описании через запятую (хотя бы одно)')
+    group.add_argument('--requirements', type=split_list, help='слова в требованиях через запятую (хотя бы одно)')
+    group.add_argument('--text', help='ключевые слова для поиска по названию, описанию и требованиям')
+    group.add_argument('--any', action='store_true', help='искать вакансии хотя бы с одним из слов --text')
+    group.add_argument('--prefix', action='store_true', help='искать слова --text как начало слов')
+
+
+def get_keywords(args: argparse.Namespace) -> dict:
+    """
+    Функция для сборки критериев фильтрации из аргументов командной строки
+    :param args: аргументы командной строки
+    :return: словарь с критериями для фильтрации вакансий
+    """
+    keywords = {}
+
+    for key in ('city', 'employer', 'source', 'experience'):
+        values = getattr(args, key)
+
+        if values:
+            keywords[key] = values[0] if len(values) == 1 else values
+
+    if args.salary_from is not None or args.salary_to is not None:
+        keywords['salary'] = {'from': args.salary_from, 'to': args.salary_to}
+
+    for key in ('description', 'requirements'):
+        if getattr(args, key):
+            keywords[key] = getattr(args, key)
+
+    if args.text:
+        keywords['text'] = {'words': args.text, 'mode': 'or' if args.any else 'and', 'prefix': args.prefix}
+
+    return keywords
+
+
+def print_vacancies(vacancies: list, as_json: bool):
+    """
+    Функция для вывода вакансий в stdout.
+    :param vacancies: список объектов класса Vacancy
+    :param as_json: True - JSON-массив словарей, False - текст
+    :return: None
+    """
+    if as_json:
+        print(json.dumps(FileHandler.transform_to_json(vacancies), ensure_ascii=False, indent=4))
+        return
+
+    for vacancy in vacancies:
+        print(vacancy)
+        print()
+
+
+def command_fetch(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда fetch: загрузка вакансий по нескольким запросам с общим пулом запросов.
+
+    По умолчанию новые вакансии добавляются к хранилищу без дублей, с --replace хранилище перезаписывается
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    engine = FetchEngine()
+
+    if args.replace:
+        pages = chain.from_iterable(stream_vacancies(args.platforms, query, args.pages, engine)
+                                    for query in args.query)
+        count = file_handler.replace_vacancies_stream(DedupIndex().filter_pages(pages))
+        print(f"В хранилище {file_handler.filename} записано {count} вакансий.")
+        return EXIT_OK
+
+    for query in args.query:
+        count = ingest_vacancies(file_handler, stream_vacancies(args.platforms, query, args.pages, engine))
+        print(f"{query}: добавлено {count} вакансий в {file_handler.filename}.")
+
+    return EXIT_OK
+
+
+def command_sync(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда sync: инкрементальная загрузка только новых вакансий по нескольким запросам.
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    engine = FetchEngine()
+
+    for query in args.query:
+        result = sync_vacancies(file_handler, args.platforms, query, args.pages, engine=engine)
+
+        for platform, count in result.items():
+            print(f"{query} ({platform}): добавлено {count} вакансий в {file_handler.filename}.")
+
+    return EXIT_OK
+
+
+def parse_budget(value: str) -> tuple[str, int]:
+    """
+    Функция для разбора аргумента бюджета вида платформа=кол-во запросов
+    :param value: строка вида hh.ru=100
+    :return: пара (платформа, кол-во запросов)
+    """
+    platform, _, limit = value.partition('=')
+
+    if not platform.strip() or not limit.strip().isdigit():
+        raise argparse.ArgumentTypeError(f"неверный бюджет: {value} (ожидается платформа=кол-во)")
+
+    return platform.strip(), int(limit)
+
+
+def command_schedule(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда schedule: выполнение нескольких заданий (запрос, платформы, страницы) общим пулом запросов
+    с бюджетом запросов к платформам и продолжением прерванного запуска.
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    jobs = load_jobs(args.jobs) if args.jobs else []
+    jobs += [Job(query, tuple(args.platforms), args.pages) for query in args.query or []]
+
+    if not jobs:
+        print("Не заданы задания: укажите --jobs или -q.", file=sys.stderr)
+        return EXIT_ERROR
+
+    checkpoint = Checkpoint()
+
+    if args.restart:
+        checkpoint.clear()
+    elif checkpoint:
+        print(f"Продолжение прерванного запуска по отметкам {checkpoint.path}.")
+
+    budgets = dict(args.budget) if args.budget else None
+    scheduler = JobScheduler(file_handler, FetchEngine(), checkpoint, budgets)
+    result = scheduler.run(jobs)
+
+    for task_id, count in result.items():
+        platform, _, query = task_id.partition('|')
+        print(f"{query} ({platform}): добавлено {count} вакансий в {file_handler.filename}.")
+
+    for platform, count in scheduler.deferred.items():
+        print(f"{platform}: бюджет запросов исчерпан, {count} страниц отложено до следующего запуска.")
+
+    return EXIT_OK
+
+
+def command_query(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда query: вывод вакансий, удовлетворяющих фильтрам.
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    vacancies = file_handler.iter_vacancies(**get_keywords(args))
+
+    if args.limit is not None:
+        vacancies = (vacancy for _, vacancy in zip(range(args.limit), vacancies))
+
+    with metrics.timer('storage.scan'):
+        vacancies = list(vacancies)
+
+    metrics.add('storage.records_matched', len(vacancies))
+    print_vacancies(vacancies, args.json)
+
+    return EXIT_OK
+
+
+def command_top(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда top: вывод топ N вакансий по зарплате среди удовлетворяющих фильтрам.
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    print_vacancies(file_handler.top_by_salary(args.n, **get_keywords(args)), args.json)
+
+    return EXIT_OK
+
+
+def command_stats(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда stats: статистика зарплат по группам (см. salary_stats.salary_report).
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    report = salary_report(file_handler.iter_vacancies(**get_keywords(args)), args.by, args.approximate)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+        return EXIT_OK
+
+    for dimension, stats in report.items():
+        print(f"Статистика по зарплатам ({dimension}):")
+
+        for group, summary in list(stats.items())[:args.limit]:
+            print(f"{group or 'Не указано'}: вакансий {summary['count']}, "
+                  f"медиана {summary['median']:.0f}, 25% {summary['p25']:.0f}, 75% {summary['p75']:.0f}, "
+                  f"среднее {summary['mean']:.0f}, мин {summary['min']:.0f}, макс {summary['max']:.0f}")
+
+        print()
+
+    return EXIT_OK
+
+
+def command_delete(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда delete: удаление вакансий, удовлетворяющих фильтрам.
+
+    Без фильтров удаляет все вакансии только с флагом --all
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    keywords = get_keywords(args)
+
+    if not keywords and not args.all:
+        print("Не заданы фильтры для удаления. Чтобы удалить все вакансии, укажите --all.", file=sys.stderr)
+        return EXIT_ERROR
+
+    deleted = file_handler.delete_where(**keywords)
+    print(f"Из хранилища {file_handler.filename} удалено {deleted} вакансий.")
+
+    return EXIT_OK
+
+
+def command_migrate(args: argparse.Namespace, file_handler: FileHandler) -> int:
+    """
+    Подкоманда migrate: перезапись файла хранилища json в формате STORAGE_FORMAT из settings.py.
+    :param args: аргументы командной строки
+    :param file_handler: объект для работы с хранилищем
+    :return: код завершения
+    """
+    if not isinstance(file_handler, JsonHandler):
+        print(f"Хранилище {args.backend} не хранит вакансии в разных форматах.", file=sys.stderr)
+        return EXIT_ERROR
+
+    if file_handler.migrate():
+        print(f"Файл {file_handler.filename} перезаписан в формате {file_handler.storage_format}.")
+    else:
+        print(f"Файл {file_handler.filename} не требует перевода в формат {file_handler.storage_format}.")
+
+    return EXIT_OK
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Функция для создания парсера аргументов командной строки
+    :return: объект argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog='main.py', description='Поиск и анализ вакансий с hh.ru и superjob.ru '
+                                                                 'без интерактивного режима.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch = subparsers.add_parser('fetch', help='загрузить вакансии по одному или нескольким запросам')
+    add_fetch_arguments(fetch)
+    fetch.add_argument('--replace', action='store_true', help='перезаписать хранилище вместо добавления')
+    add_storage_arguments(fetch)
+    fetch.set_defaults(handler=command_fetch)
+
+    sync = subparsers.add_parser('sync', help='загрузить только новые вакансии с прошлой синхронизации')
+    add_fetch_arguments(sync)
+    add_storage_arguments(sync)
+    sync.set_defaults(handler=command_sync)
+
+    schedule = subparsers.add_parser('schedule', help='выполнить несколько заданий с общим пулом и бюджетом запросов')
+    schedule.add_argument('--jobs', help='JSON-файл со списком заданий '
+                                         '{"query": ..., "platforms": [...], "pages": ...}')
+    schedule.add_argument('-q', '--query', action='append', help='поисковый запрос (можно указать несколько раз)')
+    schedule.add_argument('-p', '--platforms', type=split_list, default=['hh.ru', 'superjob.ru'],
+                          help='платформы для запросов -q через запятую (по умолчанию hh.ru,superjob.ru)')
+    schedule.add_argument('--pages', type=int, default=1, help='кол-во страниц для запросов -q')
+    schedule.add_argument('--budget', type=parse_budget, action='append',
+                          help='максимальное кол-во запросов к платформе за запуск, например hh.ru=100')
+    schedule.add_argument('--restart', action='store_true', help='начать заново, не продолжая прерванный запуск')
+    add_storage_arguments(schedule)
+    schedule.set_defaults(handler=command_schedule)
+
+    query = subparsers.add_parser('query', help='вывести вакансии по фильтрам')
+    add_filter_arguments(query)
+    query.add_argument('--limit', type=int, help='максимальное кол-во вакансий')
+    query.add_argument('--json', action='store_true', help='вывести в формате JSON')
+    add_storage_arguments(query)
+    query.set_defaults(handler=command_query)
+
+    top = subparsers.add_parser('top', help='вывести топ N вакансий по зарплате')
+    top.add_argument('-n', type=int, default=10, help='кол-во вакансий (по умолчанию 10)')
+    add_filter_arguments(top)
+    top.add_argument('--json', action='store_true', help='вывести в формате JSON')
+    add_storage_arguments(top)
+    top.set_defaults(handler=command_top)
+
+    stats = subparsers.add_parser('stats', help='статистика зарплат по городам, работодателям, опыту и источникам')
+    stats.add_argument('--by', type=split_list, default=list(DIMENSIONS),
+                       help=f"поля для группировки через запятую (по умолчанию {','.join(DIMENSIONS)})")
+    stats.add_argument('--approximate', action='store_true', help='приближенные квантили без хранения всех зарплат')
+    stats.add_argument('--limit', type=int, default=10, help='кол-во выводимых групп (по умолчанию 10)')
+    add_filter_arguments(stats)
+    stats.add_argument('--json', action='store_true', help='вывести в формате JSON')
+    add_storage_arguments(stats)
+    stats.set_defaults(handler=command_stats)
+
+    delete = subparsers.add_parser('delete', help='удалить вакансии по фильтрам')
+    add_filter_arguments(delete)
+    delete.add_argument('--all', action='store_true', help='удалить все вакансии, если фильтры не заданы')
+    add_storage_arguments(delete)
+    delete.set_defaults(handler=command_delete)
+
+    migrate = subparsers.add_parser('migrate', help='перезаписать файл хранилища json в формате из settings.py')
+    add_storage_arguments(migrate)
+    migrate.set_defaults(handler=command_migrate)
+
+    for subparser in subparsers.choices.values():
+        add_instrumentation_arguments(subparser)
+
+    return parser
+
+
+def run(argv: list[str] | None = None) -> int:
+    """
+    Функция для выполнения команды из аргументов командной строки.
+    :param argv: аргументы командной строки без имени программы (по умолчанию sys.argv[1:])
+    :return: код завершения: 0 - успешно, 1 - ошибка, 2 - неверные аргументы, 130 - прервано пользователем
+    """
+    args = create_argument_parser().parse_args(argv)
+
+    if args.metrics or args.metrics_file:
+        metrics.enabled = True
+        metrics.reset()
+
+    try:
+        file_handler = create_handler(args.backend, args.file)
+
+        try:
+            with profile(args.profile) if args.profile else nullcontext():
+                return args.handler(args, file_handler)
+        finally:
+            if hasattr(file_handler, 'close'):
+                file_handler.close()
+    except KeyboardInterrupt:
+        print("Прервано пользователем.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except (ValueError, OSError, requests.RequestException) as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        close_sessions()
+        export_metrics(args)
@@ -1,4 +1,8 @@
+import heapq
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+from file_handler.filters import compile_filters
 
 
 class FileHandler(ABC):
@@ -14,6 +18,16 @@ class FileHandler(ABC):
     def filename(self):
         return self.__filename
 
+    def get_signature(self) -> tuple | None:
+        """
+        Метод для получения отпечатка хранилища, по которому индексы рядом с ним (например, индекс дублей)
+        проверяют, что хранилище не менялось с момента их построения.
+
+        Реализация по умолчанию отпечатка не дает, и такие индексы строятся заново при каждом открытии
+        :return: кортеж чисел, который меняется при каждой записи в хранилище, или None
+        """
+        return None
+
     @abstractmethod
     def add_vacancies(self, vacancies: list):
         """
@@ -23,6 +37,43 @@ class FileHandler(ABC):
         """
         pass
 
+    def add_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для добавления вакансий в файл постранично, по мере их получения.
+
+        Реализация по умолчанию собирает все страницы в список и вызывает add_vacancies,
+        наследники могут записывать каждую страницу сразу.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        vacancies = [vacancy for page in pages for vacancy in page]
+        self.add_vacancies(vacancies)
+
+        return len(vacancies)
+
+    def merge_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для постраничного добавления вакансий к уже сохраненным в файле.
+
+        Реализация по умолчанию вызывает add_vacancies_stream и подходит для хранилищ,
+        которые дописывают вакансии, а не перезаписывают файл.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во добавленных вакансий
+        """
+        return self.add_vacancies_stream(pages)
+
+    @abstractmethod
+    def replace_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для замены всех вакансий в файле вакансиями из страниц.
+
+        В отличие от add_vacancies_stream, который в дописывающих хранилищах добавляет вакансии к прежним,
+        после замены в хранилище остаются только вакансии из страниц
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        pass
+
     @abstractmethod
     def get_vacancies(self, **keywords) -> list:
         """
@@ -32,6 +83,73 @@ class FileHandler(ABC):
         """
         pass
 
+    def iter_vacancies(self, **keywords) -> Iterator:
+        """
+        Метод для последовательного перебора вакансий, удовлетворяющих критериям.
+
+        Реализация по умолчанию перебирает результат get_vacancies, наследники могут
+        читать вакансии из файла по одной.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: итератор объектов класса Vacancy
+        """
+        return iter(self.get_vacancies(**keywords))
+
+    def top_by_salary(self, n: int, **keywords) -> list:
+        """
+        Метод для получения топ N вакансий по зарплате среди удовлетворяющих критериям.
+
+        Вакансии перебираются по одной, а в памяти хранится только куча из n лучших,
+        поэтому время работы O(N log n) вместо полной сортировки.
+        :param n: кол-во вакансий
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: список объектов класса Vacancy по убыванию зарплаты
+        """
+        return heapq.nlargest(n, self.iter_vacancies(**keywords), key=lambda vacancy: vacancy.salary_key)
+
+    def search_vacancies(self, words, mode: str = 'and', prefix: bool = False, **keywords) -> list:
+        """
+        Метод для поиска вакансий по ключевым словам в названии, описании и требованиях.
+        :param words: слова для поиска (строка или список)
+        :param mode: 'and' - все слова, 'or' - хотя бы одно слово
+        :param prefix: искать ли слова как начало слов вакансии
+        :param keywords: словарь с остальными критериями для фильтрации вакансий
+        :return: список объектов класса Vacancy
+        """
+        return self.get_vacancies(text={'words': words, 'mode': mode, 'prefix': prefix}, **keywords)
+
+    @staticmethod
+    def transform_to_json(vacancies: list) -> list[dict]:
+        """
+        Преобразование списка объектов в список словарей
+        :param vacancies: список объектов класса Vacancy
+        :return: список словарей с вакансиями (общие с объектами Vacancy, изменять их нельзя)
+        """
+        return [vacancy.to_dict() for vacancy in vacancies]
+
+    @staticmethod
+    def is_match(vacancy, keywords: dict) -> bool:
+        """
+        Метод для проверки, удовлетворяет ли вакансия критериям фильтрации.
+
+        Для проверки многих вакансий лучше один раз вызвать filters.compile_filters.
+        :param vacancy: объект класса Vacancy
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: True, если вакансия удовлетворяет всем критериям, иначе False
+        """
+        return compile_filters(keywords)(vacancy)
+
+    @staticmethod
+    def is_record_match(record: dict, keywords: dict) -> bool:
+        """
+        Метод для проверки, удовлетворяет ли словарь с вакансией из файла критериям фильтрации.
+
+        Работает так же, как is_match, но без создания объекта Vacancy.
+        :param record: словарь с вакансией
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: True, если вакансия удовлетворяет всем критериям, иначе False
+        """
+        return compile_filters(keywords, for_records=True)(record)
+
     @abstractmethod
     def delete_vacancies(self, vacancies: list):
         """
@@ -40,3 +158,17 @@ class FileHandler(ABC):
         :return:
         """
         pass
+
+    def delete_where(self, **keywords) -> int:
+        """
+        Метод для удаления из файла всех вакансий, удовлетворяющих критериям.
+
+        Реализация по умолчанию находит вакансии через get_vacancies и удаляет их
+        через delete_vacancies, наследники могут удалять их за один проход по файлу.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: кол-во удаленных вакансий
+        """
+        vacancies = self.get_vacancies(**keywords)
+        self.delete_vacancies(vacancies)
+
+        return len(vacancies)
@@ -0,0 +1,138 @@
+import io
+import json
+
+from settings import JSON_CODEC, STORAGE_FORMAT
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = ('json', 'json-compact', 'msgpack')
+
+# Начало файла, разделитель записей, конец файла и пустой файл для каждого формата.
+# msgpack хранится как последовательность словарей без общего заголовка, поэтому его можно писать постранично
+FRAMING = {
+    'json': (b'[\n    ', b',\n    ', b'\n]', b'[]'),
+    'json-compact': (b'[', b',', b']', b'[]'),
+    'msgpack': (b'', b'', b'', b''),
+}
+
+
+def use_orjson(codec: str = JSON_CODEC) -> bool:
+    """
+    Функция для выбора библиотеки JSON по настройке JSON_CODEC
+    :param codec: 'auto' - orjson, если установлен, 'orjson' - только orjson, 'json' - стандартная библиотека
+    :return: True, если используется orjson
+    """
+    if codec == 'json':
+        return False
+
+    if codec == 'orjson' and orjson is None:
+        raise ValueError("Для JSON_CODEC = 'orjson' нужно установить пакет orjson")
+
+    if codec not in ('auto', 'orjson'):
+        raise ValueError(f"Неизвестная библиотека JSON: {codec}")
+
+    return orjson is not None
+
+
+def check_format(storage_format: str) -> str:
+    """
+    Функция для проверки формата хранения вакансий
+    :param storage_format: формат хранения (см. FORMATS)
+    :return: тот же формат
+    """
+    if storage_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат хранения: {storage_format}")
+
+    if storage_format == 'msgpack' and msgpack is None:
+        raise ValueError("Для формата msgpack нужно установить пакет msgpack")
+
+    return storage_format
+
+
+def dumps(obj) -> bytes:
+    """
+    Функция для сериализации объекта в компактный JSON (UTF-8 без экранирования кириллицы)
+    :param obj: объект
+    :return: байты JSON
+    """
+    if use_orjson():
+        return orjson.dumps(obj)
+
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes | str):
+    """
+    Функция для разбора JSON
+    :param data: байты или строка JSON
+    :return: объект
+    """
+    if use_orjson():
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
+def encode_record(record: dict, storage_format: str = STORAGE_FORMAT) -> bytes:
+    """
+    Функция для сериализации одной записи в формате хранения
+    :param record: словарь с вакансией
+    :param storage_format: формат хранения
+    :return: байты записи без разделителей
+    """
+    if storage_format == 'msgpack':
+        return msgpack.packb(record, use_bin_type=True)
+
+    if storage_format == 'json':
+        return json.dumps(record, ensure_ascii=False, indent=4).replace("\n", "\n    ").encode('utf-8')
+
+    return dumps(record)
+
+
+def sniff_format(data: bytes) -> str:
+    """
+    Функция для определения формата файла по первым байтам
+    :param data: содержимое файла
+    :return: формат хранения (см. FORMATS)
+    """
+    stripped = data.lstrip()
+
+    if not stripped:
+        raise ValueError("Пустой файл с вакансиями")
+
+    first = stripped[0]
+
+    if first == ord('['):
+        return 'json-compact' if stripped[1:2] in (b'{', b']') else 'json'
+
+    # Заголовок словаря msgpack: fixmap (0x80-0x8f), map16 (0xde) или map32 (0xdf)
+    if 0x80 <= first <= 0x8f or first in (0xde, 0xdf):
+        return 'msgpack'
+
+    raise ValueError("Неизвестный формат файла с вакансиями")
+
+
+def decode_records(data: bytes) -> tuple[list[dict], str | None]:
+    """
+    Функция для чтения списка записей в любом из форматов хранения (формат определяется автоматически)
+    :param data: содержимое файла
+    :return: список словарей с вакансиями и формат файла (None для пустого файла)
+    """
+    if not data.strip():
+        return [], None
+
+    storage_format = sniff_format(data)
+
+    if storage_format == 'msgpack':
+        check_format(storage_format)
+        return list(msgpack.Unpacker(io.BytesIO(data), raw=False)), storage_format
+
+    return loads(data), storage_format
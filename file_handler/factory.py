@@ -0,0 +1,32 @@
+from file_handler.base import FileHandler
+from file_handler.json_handler import JsonHandler
+from file_handler.jsonl_handler import JsonLinesHandler
+from file_handler.sqlite_handler import SqliteHandler
+
+BACKENDS = {
+    'json': JsonHandler,
+    'jsonl': JsonLinesHandler,
+    'sqlite': SqliteHandler,
+}
+
+# Имя файла данных по умолчанию для каждого хранилища
+DEFAULT_FILENAMES = {
+    'json': 'vacancies.json',
+    'jsonl': 'vacancies.jsonl',
+    'sqlite': 'vacancies.db',
+}
+
+
+def create_handler(backend: str = 'json', filename: str | None = None) -> FileHandler:
+    """
+    Функция для создания объекта для работы с хранилищем вакансий
+    :param backend: тип хранилища (json, jsonl, sqlite)
+    :param filename: имя файла в DATA_PATH (по умолчанию vacancies.json, vacancies.jsonl или vacancies.db)
+    :return: объект класса FileHandler
+    """
+    backend = backend.strip().lower()
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Неверный тип хранилища: {backend}")
+
+    return BACKENDS[backend](filename or DEFAULT_FILENAMES[backend])
@@ -0,0 +1,154 @@
+from operator import attrgetter, itemgetter
+from typing import Callable, NamedTuple
+
+from file_handler.keyword_index import match_tokens, parse_text_query, record_tokens, tokenize
+from vacancy import Vacancy
+
+# Поле вакансии (атрибут Vacancy и ключ словаря в файле) для каждого критерия
+FIELDS = {
+    'city': 'location',
+    'employer': 'employer',
+    'source': 'source',
+    'experience': 'experience',
+    'salary': 'salary',
+    'description': 'description',
+    'requirements': 'requirement',
+    'text': 'text',
+}
+
+# Стоимость проверки: сначала дешевые сравнения, потом поиск подстрок и слов
+COSTS = {'eq': 0, 'in': 1, 'range': 2, 'contains': 3, 'text': 4}
+
+
+class Condition(NamedTuple):
+    key: str
+    field: str
+    op: str
+    value: object
+    negate: bool
+
+
+def parse_filters(keywords: dict) -> list[Condition]:
+    """
+    Функция для разбора критериев фильтрации в список условий, упорядоченный от дешевых к дорогим.
+
+    Поддерживаемые значения критериев:
+    - city, employer, source, experience: строка (равенство) или список строк (одно из значений);
+    - salary: словарь {'from': мин, 'to': макс}, любая граница может отсутствовать или быть None;
+    - description, requirements: список слов, хотя бы одно из которых должно встречаться в тексте;
+    - text: поиск по ключевым словам (см. keyword_index.parse_text_query).
+    Любой критерий можно инвертировать, передав {'not': значение}.
+    :param keywords: словарь с критериями для фильтрации вакансий
+    :return: список условий
+    """
+    conditions = []
+
+    for key, value in keywords.items():
+        if key not in FIELDS:
+            raise ValueError(f"Неизвестный критерий фильтрации: {key}")
+
+        negate = isinstance(value, dict) and set(value) == {'not'}
+
+        if negate:
+            value = value['not']
+
+        if key == 'salary':
+            low, high = value.get('from'), value.get('to')
+            conditions.append(Condition(key, FIELDS[key], 'range', (low, high), negate))
+        elif key in ('description', 'requirements'):
+            words = [value] if isinstance(value, str) else value
+            conditions.append(Condition(key, FIELDS[key], 'contains', tuple(word.lower() for word in words), negate))
+        elif key == 'text':
+            conditions.append(Condition(key, FIELDS[key], 'text', parse_text_query(value), negate))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            conditions.append(Condition(key, FIELDS[key], 'in', frozenset(item.lower() for item in value), negate))
+        else:
+            conditions.append(Condition(key, FIELDS[key], 'eq', value.lower(), negate))
+
+    conditions.sort(key=lambda condition: COSTS[condition.op])
+
+    return conditions
+
+
+def build_check(condition: Condition, for_records: bool) -> Callable:
+    """
+    Функция для создания функции проверки одного условия
+    :param condition: условие
+    :param for_records: True - проверяются словари из файла, False - объекты Vacancy
+    :return: функция, которая принимает вакансию и возвращает True или False
+    """
+    op, value = condition.op, condition.value
+
+    if op == 'text':
+        words, mode, prefix = value
+
+        if for_records:
+            return lambda item: match_tokens(record_tokens(item), words, mode, prefix)
+
+        return lambda item: match_tokens(tokenize(item.title) | tokenize(item.description)
+                                         | tokenize(item.requirement), words, mode, prefix)
+
+    if op == 'range':
+        low, high = value
+
+        if for_records:
+            def get_salary(item):
+                return Vacancy.parse_salary(item['salary'])[:2]
+        else:
+            def get_salary(item):
+                return item.salary_from, item.salary_to
+
+        def check_range(item) -> bool:
+            salary_from, salary_to = get_salary(item)
+
+            return (low is None or salary_from >= low) and (high is None or salary_to <= high)
+
+        return check_range
+
+    get = itemgetter(condition.field) if for_records else attrgetter(condition.field)
+
+    if op == 'eq':
+        return lambda item: get(item).lower() == value
+
+    if op == 'in':
+        return lambda item: get(item).lower() in value
+
+    return lambda item: any(word in get(item).lower() for word in value)
+
+
+def compile_conditions(conditions: list[Condition], for_records: bool = False) -> Callable:
+    """
+    Функция для сборки условий в одну функцию-предикат
+    :param conditions: список условий
+    :param for_records: True - проверяются словари из файла, False - объекты Vacancy
+    :return: функция, которая принимает вакансию и возвращает True, если выполнены все условия
+    """
+    checks = []
+
+    for condition in conditions:
+        check = build_check(condition, for_records)
+
+        if condition.negate:
+            check = (lambda inner: lambda item: not inner(item))(check)
+
+        checks.append(check)
+
+    if not checks:
+        return lambda item: True
+
+    if len(checks) == 1:
+        return checks[0]
+
+    return lambda item: all(check(item) for check in checks)
+
+
+def compile_filters(keywords: dict, for_records: bool = False) -> Callable:
+    """
+    Функция для компиляции критериев фильтрации в функцию-предикат.
+
+    Критерии разбираются и приводятся к нижнему регистру один раз, а не для каждой вакансии.
+    :param keywords: словарь с критериями для фильтрации вакансий
+    :param for_records: True - проверяются словари из файла, False - объекты Vacancy
+    :return: функция, которая принимает вакансию и возвращает True, если выполнены все критерии
+    """
+    return compile_conditions(parse_filters(keywords), for_records)
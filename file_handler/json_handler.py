@@ -1,7 +1,15 @@
-import json
+import os
+import tempfile
+from itertools import chain
+from typing import Iterable, Iterator
 
 from file_handler.base import FileHandler
-from settings import DATA_PATH
+from file_handler.codec import FRAMING, check_format, decode_records, dumps, encode_record, loads
+from file_handler.filters import compile_filters
+from file_handler.keyword_index import KeywordIndex, parse_text_query
+from settings import DATA_PATH, STORAGE_FORMAT
+from utils.file_lock import FileLock, atomic_write
+from utils.instrumentation import metrics
 from vacancy import Vacancy
 
 
@@ -9,24 +17,192 @@ class JsonHandler(FileHandler):
 
     __file_path = str(DATA_PATH) + '/'
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, storage_format: str = STORAGE_FORMAT):
         """
         Конструктор класса JsonHandler.
+
+        Прочитанные из файла вакансии кэшируются в памяти. Кэш сбрасывается, если у файла
+        изменились время модификации или размер, а также после записи в файл этим объектом.
+        Файл, записанный в другом формате (например, vacancies.json с отступами), читается как есть,
+        а в формате storage_format записывается при следующем изменении или методом migrate.
+
+        Файл перезаписывается атомарно (временный файл и os.replace) под монопольной блокировкой
+        <filename>.lock, поэтому несколько процессов могут писать в него по очереди, а читатели
+        не ждут запись и всегда видят целую версию файла.
         :param filename: имя файла
+        :param storage_format: формат хранения: 'json', 'json-compact' или 'msgpack' (см. codec.FORMATS)
         """
         super().__init__(filename)
+        self.__storage_format = check_format(storage_format)
+        self.__file_format = None
+        self.__lock = FileLock(self.path + '.lock')
+        self.__cache_signature = None
+        self.__records = None
+        self.__vacancies = None
+        self.__positions = None
+        self.__index = None
+
+    @property
+    def path(self) -> str:
+        return self.__file_path + self.filename
+
+    @property
+    def lock(self) -> FileLock:
+        return self.__lock
+
+    @property
+    def storage_format(self) -> str:
+        return self.__storage_format
+
+    @property
+    def index_path(self) -> str:
+        return self.path + '.index.json'
 
     def __len__(self) -> int:
         """
         Метод для возвращения длины списка вакансий в файле
         :return: длину списка
         """
-        with open(self.__file_path + self.filename, "r", encoding="utf-8") as file:
-            json_data = file.read()
+        return len(self.load_records())
+
+    def get_signature(self) -> tuple[int, int]:
+        """
+        Метод для получения отпечатка файла, по которому проверяется актуальность кэша и индексов
+        :return: время модификации в наносекундах и размер файла (нули, если файла нет)
+        """
+        if not os.path.exists(self.path):
+            return 0, 0
+
+        stat = os.stat(self.path)
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def invalidate_cache(self):
+        """
+        Метод для сброса кэша прочитанных из файла вакансий.
+        :return: None
+        """
+        self.__cache_signature = None
+        self.__records = None
+        self.__vacancies = None
+        self.__positions = None
+
+    def load_records(self) -> list[dict]:
+        """
+        Метод для получения списка словарей с вакансиями из файла или из кэша, если файл не менялся
+        :return: список словарей с вакансиями
+        """
+        signature = self.get_signature()
+
+        if self.__records is None or signature != self.__cache_signature:
+            with open(self.path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                signature = stat.st_mtime_ns, stat.st_size
+                data = file.read()
+
+            records, self.__file_format = decode_records(data)
+            self.__records = records
+            self.__vacancies = None
+            self.__positions = None
+            self.__cache_signature = signature
+
+        return self.__records
+
+    def migrate(self) -> bool:
+        """
+        Метод для перезаписи файла в формате storage_format, если он записан в другом формате
+        (например, vacancies.json с отступами после выбора STORAGE_FORMAT = 'json-compact').
+
+        Файл перечитывается под монопольной блокировкой, поэтому записи других процессов не теряются
+        :return: True, если файл перезаписан, иначе False
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        with self.__lock.exclusive():
+            records = self.load_records()
+
+            if self.__file_format in (None, self.__storage_format):
+                return False
+
+            index_was_current = self.is_index_current()
+            self.write_records(records)
+            self.update_keyword_index(index_was_current)
+
+        return True
+
+    def load_vacancies(self) -> list[Vacancy]:
+        """
+        Метод для получения списка объектов Vacancy из файла или из кэша, если файл не менялся
+        :return: список объектов класса Vacancy (общий для всех вызовов, изменять его нельзя)
+        """
+        records = self.load_records()
+
+        if self.__vacancies is None:
+            self.__vacancies = [Vacancy.from_record(record) for record in records]
+
+        return self.__vacancies
+
+    def get_keyword_index(self) -> KeywordIndex:
+        """
+        Метод для получения индекса ключевых слов, соответствующего текущему содержимому файла.
+
+        Индекс читается из файла <filename>.index.json, а если он устарел - строится заново и сохраняется
+        :return: объект класса KeywordIndex
+        """
+        records = self.load_records()
+        signature = self.__cache_signature
+
+        if self.__index is None or self.__index.signature != signature:
+            index = KeywordIndex(self.index_path)
+
+            if not index.load() or index.signature != signature:
+                index.clear()
+                index.add_records(records)
+                index.signature = signature
+                index.save()
+
+            self.__index = index
+
+        return self.__index
+
+    def is_index_current(self) -> bool:
+        """
+        Метод для проверки, что индекс ключевых слов загружен и соответствует файлу
+        :return: True, если индекс можно обновлять по месту, иначе False
+        """
+        return (self.__index is not None and os.path.exists(self.path)
+                and self.__index.signature == self.get_signature())
+
+    def update_keyword_index(self, index_was_current: bool, removed_keys: Iterable[str] = ()):
+        """
+        Метод для обновления индекса ключевых слов после записи в файл этим объектом.
+        :param index_was_current: соответствовал ли индекс файлу до записи
+        :param removed_keys: ключи удаленных вакансий
+        :return: None
+        """
+        if not index_was_current:
+            self.__index = None
+            return
+
+        self.__index.remove(removed_keys)
+        self.__index.signature = self.get_signature()
+        self.__index.save()
 
-        data = json.loads(json_data)
+    def get_positions(self) -> dict[str, list[int]]:
+        """
+        Метод для получения позиций вакансий в файле по их ключам
+        :return: словарь {ключ вакансии: список позиций}
+        """
+        records = self.load_records()
 
-        return len(data)
+        if self.__positions is None:
+            self.__positions = {}
+
+            for position, record in enumerate(records):
+                self.__positions.setdefault(Vacancy.record_key(record), []).append(position)
+
+        return self.__positions
 
     def add_vacancies(self, vacancies: list):
         """
@@ -34,12 +210,134 @@ class JsonHandler(FileHandler):
         :param vacancies: список объектов класса Vacancy
         :return: None
         """
-        data = self.transform_to_json(vacancies)
+        self.__index = None
+        self.write_records(self.transform_to_json(vacancies))
+
+    def add_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для постраничной записи вакансий в файл.
+
+        Каждая страница сериализуется во временный файл сразу после получения, без блокировки,
+        поэтому в памяти держится только одна страница, а другие процессы могут читать файл
+        во время загрузки. Монопольная блокировка берется только для перезаписи файла
+        после получения всех страниц: если их получение прервется ошибкой, файл останется прежним.
+        До получения последней страницы новые вакансии в файле не видны: если их нужно видеть
+        по мере загрузки, используйте хранилище jsonl или sqlite (см. factory.create_handler).
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        with tempfile.TemporaryFile() as spool:
+            self.spool_pages(pages, spool)
+            self.__index = None
+
+            return self.write_pages(self.read_spool(spool))
+
+    def replace_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для замены всех вакансий в файле вакансиями из страниц.
+
+        Файл и так перезаписывается целиком, поэтому метод вызывает add_vacancies_stream
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        return self.add_vacancies_stream(pages)
+
+    def merge_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для постраничного добавления вакансий к уже сохраненным в файле.
+
+        Получение страниц (например, запросы к API) может занимать много времени, поэтому страницы
+        сначала сохраняются во временный файл без блокировки. Затем под монопольной блокировкой
+        файл перечитывается и перезаписывается вместе с ними, так что записи других процессов
+        за время загрузки не теряются. Если получение страниц прервется ошибкой, файл останется прежним.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во добавленных вакансий
+        """
+        with tempfile.TemporaryFile() as spool:
+            self.spool_pages(pages, spool)
+
+            with self.__lock.exclusive():
+                records = self.load_records() if os.path.exists(self.path) else []
+                index_was_current = self.is_index_current()
+                new_pages = self.read_spool(spool)
+
+                if index_was_current:
+                    new_pages = self.index_pages(new_pages)
+
+                try:
+                    count = self.write_pages(chain([records], new_pages)) - len(records)
+                except BaseException:
+                    self.__index = None
+                    raise
+
+                self.update_keyword_index(index_was_current)
+
+        return count
+
+    def spool_pages(self, pages: Iterable[list], spool):
+        """
+        Метод для сохранения страниц с вакансиями во временный файл по мере их получения.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :param spool: временный файл, открытый в двоичном режиме
+        :return: None
+        """
+        for page in pages:
+            spool.writelines(dumps(vacancy_dict) + b"\n" for vacancy_dict in self.transform_to_json(page))
+            spool.write(b"\n")
+
+        spool.seek(0)
+
+    @staticmethod
+    def read_spool(spool) -> Iterator[list[dict]]:
+        """
+        Генератор, который читает страницы, сохраненные spool_pages во временный файл.
+        :param spool: временный файл: словари по одному на строку, страницы разделены пустой строкой
+        :return: списки словарей с вакансиями
+        """
+        page = []
+
+        for line in spool:
+            if line.strip():
+                page.append(loads(line))
+            else:
+                yield page
+                page = []
+
+    def index_pages(self, pages: Iterable[list[dict]]) -> Iterator[list[dict]]:
+        """
+        Генератор, который добавляет в индекс ключевых слов каждую страницу перед ее записью.
+        :param pages: итерируемый объект со списками словарей с вакансиями
+        :return: те же списки словарей
+        """
+        for page in pages:
+            self.__index.add_records(page)
+            yield page
+
+    def write_pages(self, pages: Iterable[list[dict]]) -> int:
+        """
+        Метод для постраничной записи словарей с вакансиями в файл.
+        :param pages: итерируемый объект со списками словарей с вакансиями
+        :return: кол-во записанных вакансий
+        """
+        count = 0
+        start, separator, end, empty = FRAMING[self.__storage_format]
+        self.invalidate_cache()
+
+        with self.__lock.exclusive(), atomic_write(self.path) as file:
+            for page in pages:
+                with metrics.timer('storage.write'):
+                    for vacancy_dict in page:
+                        file.write(separator if count else start)
+                        file.write(encode_record(vacancy_dict, self.__storage_format))
+                        count += 1
+
+            file.write(end if count else empty)
 
-        json_data = json.dumps(data, ensure_ascii=False, indent=4)
+            if metrics.enabled:
+                metrics.add('storage.records_written', count)
+                metrics.add('storage.bytes_written', file.tell())
 
-        with open(self.__file_path + self.filename, "w", encoding="utf-8") as file:
-            file.write(json_data)
+        return count
 
     def get_vacancies(self, **keywords) -> list:
         """
@@ -49,91 +347,90 @@ class JsonHandler(FileHandler):
         :param keywords: словарь с критериями для фильтрации вакансий
         :return: список объектов класса Vacancy, удовлетворяющих критериям
         """
-        with open(self.__file_path + self.filename, "r", encoding="utf-8") as file:
-            json_data = file.read()
+        with metrics.timer('storage.scan'):
+            vacancies = list(self.iter_vacancies(**keywords))
 
-        data = json.loads(json_data)
-        vacancies = [Vacancy(**vacancy) for vacancy in data]
+        metrics.add('storage.records_matched', len(vacancies))
 
-        if not keywords:
-            return vacancies
-
-        filtered_vacancies = []
-
-        for vacancy in vacancies:
-            match = True
-
-            for key, value in keywords.items():
-                if key == "city":
-                    if vacancy.location.lower() != value.lower():
-                        match = False
-                        break
-                elif key == "employer":
-                    if vacancy.employer.lower() != value.lower():
-                        match = False
-                        break
-                elif key == "salary":
-                    if vacancy.salary_from < value["from"] or vacancy.salary_to > value["to"]:
-                        match = False
-                        break
-                elif key == "description":
-                    if not any(word in vacancy.description.lower() for word in value):
-                        match = False
-                        break
-                elif key == "requirements":
-                    if not any(word in vacancy.requirement.lower() for word in value):
-                        match = False
-                        break
-                elif key == "source":
-                    if vacancy.source.lower() != value.lower():
-                        match = False
-                        break
-
-            if match:
-                filtered_vacancies.append(vacancy)
-
-        return filtered_vacancies
+        return vacancies
 
-    @staticmethod
-    def transform_to_json(vacancies: list) -> list[dict]:
+    def iter_vacancies(self, **keywords) -> Iterator[Vacancy]:
         """
-        Преобразование списка объектов в список словарей
-        :param vacancies: список объектов класса Vacancy
-        :return: список словарей с вакансиями
+        Метод для перебора вакансий из кэша без копирования списка.
+
+        Критерий text (поиск по ключевым словам) выполняется по индексу ключевых слов,
+        поэтому остальные критерии проверяются только для найденных вакансий.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: итератор объектов класса Vacancy, удовлетворяющих критериям
         """
-        vacancies_dict = []
+        vacancies = self.load_vacancies()
+
+        if "text" in keywords:
+            keywords = dict(keywords)
+            words, mode, prefix = parse_text_query(keywords.pop("text"))
 
-        for vacancy in vacancies:
-            vacancy_dict = {
-                'title': vacancy.title,
-                'location': vacancy.location,
-                'link': vacancy.link,
-                'employer': vacancy.employer,
-                'salary': vacancy.get_salary(),
-                'description': vacancy.description,
-                'requirement': vacancy.requirement,
-                'experience': vacancy.experience,
-                'source': vacancy.source
-            }
+            if words:
+                keys = self.get_keyword_index().search(words, mode, prefix)
+                positions = self.get_positions()
+                vacancies = [vacancies[position]
+                             for position in sorted(position for key in keys for position in positions.get(key, ()))]
 
-            vacancies_dict.append(vacancy_dict)
+        if not keywords:
+            return iter(vacancies)
 
-        return vacancies_dict
+        return filter(compile_filters(keywords), vacancies)
 
     def delete_vacancies(self, vacancies: list):
         """
         Метод для удаления списка вакансий из файла.
+
+        Вакансии сравниваются по ключу (Vacancy.key) через множество, а не поиском по списку словарей.
         :param vacancies: список объектов класса Vacancy
         :return: None
         """
-        with open(self.__file_path + self.filename, "r", encoding="utf-8") as file:
-            json_data = file.read()
+        keys = {vacancy.key for vacancy in vacancies}
+
+        if keys:
+            with self.__lock.exclusive():
+                index_was_current = self.is_index_current()
+
+                self.write_records([record for record in self.load_records()
+                                    if Vacancy.record_key(record) not in keys])
+                self.update_keyword_index(index_was_current, keys)
+
+    def delete_where(self, **keywords) -> int:
+        """
+        Метод для удаления из файла всех вакансий, удовлетворяющих критериям, за один проход по записям.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: кол-во удаленных вакансий
+        """
+        with self.__lock.exclusive():
+            data = self.load_records()
+            index_was_current = self.is_index_current()
+            updated_data = []
+            deleted_keys = set()
+
+            is_match = compile_filters(keywords, for_records=True)
+
+            for record in data:
+                if is_match(record):
+                    deleted_keys.add(Vacancy.record_key(record))
+                else:
+                    updated_data.append(record)
+
+            deleted = len(data) - len(updated_data)
 
-        data = json.loads(json_data)
-        vacancies_dict = self.transform_to_json(vacancies)
+            if deleted:
+                self.write_records(updated_data)
+                self.update_keyword_index(index_was_current,
+                                          deleted_keys - {Vacancy.record_key(record) for record in updated_data})
 
-        updated_data = [vacancy for vacancy in data if vacancy not in vacancies_dict]
-        updated_json_data = json.dumps(updated_data, ensure_ascii=False, indent=4)
+        return deleted
 
-        with open(self.__file_path + self.filename, "w", encoding="utf-8") as file:
-            file.write(updated_json_data)
+    def write_records(self, records: list[dict]):
+        """
+        Метод для перезаписи файла списком словарей с вакансиями.
+        :param records: список словарей с вакансиями
+        :return: None
+        """
+        self.write_pages([records])
@@ -0,0 +1,485 @@
+import os
+import shutil
+import tempfile
+import zlib
+from typing import Iterable, Iterator
+
+from file_handler.base import FileHandler
+from file_handler.codec import dumps, loads
+from file_handler.filters import compile_filters
+from file_handler.keyword_index import KeywordIndex, parse_text_query
+from settings import DATA_PATH, JSONL_COMPACT_RATIO
+from utils.file_lock import FileLock, atomic_write
+from utils.instrumentation import metrics
+from vacancy import Vacancy
+
+# Сколько последних байт файла данных входит в его отпечаток (см. JsonLinesHandler.get_signature)
+TAIL_BYTES = 64
+
+
+class JsonLinesHandler(FileHandler):
+
+    __file_path = str(DATA_PATH) + '/'
+
+    def __init__(self, filename: str, compact_ratio: float = JSONL_COMPACT_RATIO):
+        """
+        Конструктор класса JsonLinesHandler.
+
+        Вакансии хранятся по одной на строку. Новые вакансии дописываются в конец файла,
+        а удаленные помечаются номерами строк в отдельном файле <filename>.deleted
+        и физически убираются при сжатии файла. Первая строка файла удаленных строк - номер inode
+        файла данных, к которому относятся номера: к сжатому (замененному) файлу они не применяются.
+
+        Запись выполняется под монопольной блокировкой <filename>.lock. Читатель под общей блокировкой
+        только открывает файл и запоминает его размер, а затем читает этот снимок без блокировки,
+        пропуская недописанную последнюю строку.
+        :param filename: имя файла
+        :param compact_ratio: доля удаленных записей, после которой файл сжимается
+        """
+        super().__init__(filename)
+        self.__compact_ratio = compact_ratio
+        self.__index = None
+        self.__lock = FileLock(self.path + '.lock')
+
+    @property
+    def path(self) -> str:
+        return self.__file_path + self.filename
+
+    @property
+    def lock(self) -> FileLock:
+        return self.__lock
+
+    @property
+    def tombstones_path(self) -> str:
+        return self.path + '.deleted'
+
+    @property
+    def index_path(self) -> str:
+        return self.path + '.index.json'
+
+    def __len__(self) -> int:
+        """
+        Метод для возвращения кол-ва вакансий в файле без учета удаленных
+        :return: кол-во вакансий
+        """
+        return self.count_lines() - len(self.get_tombstones())
+
+    def count_lines(self) -> int:
+        """
+        Метод для подсчета кол-ва строк (записей, включая удаленные) в файле без их разбора
+        :return: кол-во строк
+        """
+        if not os.path.exists(self.path):
+            return 0
+
+        count = 0
+
+        with open(self.path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                count += chunk.count(b"\n")
+
+        return count
+
+    def get_inode(self) -> int:
+        """
+        Метод для получения номера inode файла данных
+        :return: номер inode (0, если файла нет)
+        """
+        return os.stat(self.path).st_ino if os.path.exists(self.path) else 0
+
+    def read_tombstones(self) -> tuple[int | None, set[int]]:
+        """
+        Метод для чтения файла удаленных строк
+        :return: inode файла данных, к которому относятся номера строк (None, если файла нет), и номера строк
+        """
+        if not os.path.exists(self.tombstones_path):
+            return None, set()
+
+        with open(self.tombstones_path, "r", encoding="utf-8") as file:
+            lines = file.read().split()
+
+        # Файл без заголовка относится к текущему файлу данных
+        if lines and lines[0].startswith("#"):
+            return int(lines[0][1:]), {int(line) for line in lines[1:]}
+
+        return self.get_inode(), {int(line) for line in lines}
+
+    def get_tombstones(self) -> set[int]:
+        """
+        Метод для получения номеров удаленных строк текущего файла данных
+        :return: множество номеров строк
+        """
+        inode, line_numbers = self.read_tombstones()
+
+        return line_numbers if inode == self.get_inode() else set()
+
+    def get_signature(self) -> tuple[int, ...]:
+        """
+        Метод для получения отпечатка файла и файла удаленных строк, по которому проверяется актуальность индексов.
+
+        Для файла данных также учитываются номер inode и контрольная сумма последних байт:
+        по ним get_keyword_index отличает файл, в конец которого только дописывались строки, от перезаписанного
+        :return: inode, время модификации в наносекундах, размер и контрольная сумма конца файла данных,
+        время модификации и размер файла удаленных строк
+        """
+        if os.path.exists(self.path):
+            stat = os.stat(self.path)
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size, self.get_tail_checksum(stat.st_size))
+        else:
+            signature = (0, 0, 0, 0)
+
+        stat = os.stat(self.tombstones_path) if os.path.exists(self.tombstones_path) else None
+
+        return signature + ((stat.st_mtime_ns, stat.st_size) if stat else (0, 0))
+
+    def get_tail_checksum(self, size: int) -> int:
+        """
+        Метод для вычисления контрольной суммы последних TAIL_BYTES байт из первых size байт файла данных
+        :param size: размер начала файла, которое проверяется
+        :return: crc32 последних байт (0, если файла нет или он короче size)
+        """
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(max(0, size - TAIL_BYTES))
+                tail = file.read(min(size, TAIL_BYTES))
+        except FileNotFoundError:
+            return 0
+
+        return zlib.crc32(tail) if len(tail) == min(size, TAIL_BYTES) else 0
+
+    def get_appended_offset(self, old_signature: tuple | None, signature: tuple) -> int | None:
+        """
+        Метод для проверки, что после получения отпечатка old_signature в файл только дописывались строки
+        :param old_signature: отпечаток, по которому построен индекс
+        :param signature: текущий отпечаток
+        :return: позиция, с которой начинаются дописанные строки, или None, если файл перезаписывался
+        или строки удалялись
+        """
+        if old_signature is None or len(old_signature) != len(signature):
+            return None
+
+        inode, _, size, checksum, *tombstones = old_signature
+
+        if inode != signature[0] or size > signature[2] or tuple(tombstones) != signature[4:]:
+            return None
+
+        if size and checksum != self.get_tail_checksum(size):
+            return None
+
+        return size
+
+    def get_keyword_index(self) -> KeywordIndex:
+        """
+        Метод для получения индекса ключевых слов, соответствующего текущему содержимому файла.
+
+        Индекс читается из файла <filename>.index.json. Если с момента его построения в файл только
+        дописывались строки (например, другим процессом), в индекс добавляются только они,
+        иначе индекс строится заново; обновленный индекс сохраняется
+        :return: объект класса KeywordIndex
+        """
+        signature = self.get_signature()
+        index = self.__index
+
+        if index is None:
+            index = KeywordIndex(self.index_path)
+            index.load()
+
+        if index.signature != signature:
+            offset = self.get_appended_offset(index.signature, signature)
+
+            if offset is None:
+                index.clear()
+                index.add_records(record for _, record in self.iter_records())
+            else:
+                index.add_records(self.iter_appended_records(offset))
+
+            index.signature = signature
+            index.save()
+
+        self.__index = index
+
+        return index
+
+    def is_index_current(self) -> bool:
+        """
+        Метод для проверки, что индекс ключевых слов загружен и соответствует файлу
+        :return: True, если индекс можно обновлять по месту, иначе False
+        """
+        return self.__index is not None and self.__index.signature == self.get_signature()
+
+    def update_keyword_index(self, index_was_current: bool, removed_keys: Iterable[str] = ()):
+        """
+        Метод для обновления индекса ключевых слов после записи в файл этим объектом.
+        :param index_was_current: соответствовал ли индекс файлу до записи
+        :param removed_keys: ключи удаленных вакансий
+        :return: None
+        """
+        if not index_was_current:
+            self.__index = None
+            return
+
+        self.__index.remove(removed_keys)
+        self.__index.signature = self.get_signature()
+        self.__index.save()
+
+    def add_vacancies(self, vacancies: list):
+        """
+        Метод для дописывания списка вакансий в конец файла.
+        :param vacancies: список объектов класса Vacancy
+        :return: None
+        """
+        self.add_vacancies_stream([vacancies])
+
+    def add_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для постраничного дописывания вакансий в конец файла.
+
+        Блокировка берется отдельно для каждой страницы, поэтому между страницами в файл может писать
+        другой процесс. Индекс ключевых слов дополняется страницей, только если перед ее записью
+        он соответствовал файлу; иначе он сбрасывается и при следующем поиске дополняется по файлу.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        count = 0
+        index = self.__index
+
+        for page in pages:
+            with metrics.timer('storage.write'):
+                records = self.transform_to_json(page)
+                lines = [dumps(vacancy_dict) + b"\n" for vacancy_dict in records]
+
+                with self.__lock.exclusive():
+                    if index is not None and index.signature != self.get_signature():
+                        index = None
+
+                    # Файл открывается заново для каждой страницы: другой процесс мог его сжать и заменить
+                    with open(self.path, "ab") as file:
+                        file.writelines(lines)
+                        file.flush()
+                        os.fsync(file.fileno())
+
+                    if index is not None:
+                        index.add_records(records)
+                        index.signature = self.get_signature()
+
+            count += len(lines)
+
+            if metrics.enabled:
+                metrics.add('storage.records_written', len(lines))
+                metrics.add('storage.bytes_written', sum(map(len, lines)))
+
+        if index is None:
+            self.__index = None
+        elif count:
+            index.save()
+
+        return count
+
+    def replace_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для замены всех вакансий в файле вакансиями из страниц.
+
+        Страницы сначала сохраняются во временный файл без блокировки. Затем под монопольной блокировкой
+        файл данных атомарно заменяется новым, а файл удаленных строк удаляется (как в compact).
+        Если получение страниц прервется ошибкой, файл останется прежним.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        count = 0
+
+        with tempfile.TemporaryFile() as spool:
+            for page in pages:
+                records = self.transform_to_json(page)
+                spool.writelines(dumps(vacancy_dict) + b"\n" for vacancy_dict in records)
+                count += len(records)
+
+            spool.seek(0)
+
+            with metrics.timer('storage.write'), self.__lock.exclusive():
+                with atomic_write(self.path) as file:
+                    shutil.copyfileobj(spool, file)
+
+                if os.path.exists(self.tombstones_path):
+                    os.remove(self.tombstones_path)
+
+                self.__index = None
+
+            if metrics.enabled:
+                metrics.add('storage.records_written', count)
+                metrics.add('storage.bytes_written', spool.tell())
+
+        return count
+
+    def iter_records(self) -> Iterator[tuple[int, dict]]:
+        """
+        Генератор, который построчно читает файл и отдает неудаленные записи.
+        :return: пары (номер строки, словарь с вакансией)
+        """
+        with self.__lock.shared():
+            if not os.path.exists(self.path):
+                return
+
+            tombstones = self.get_tombstones()
+            file = open(self.path, "rb")
+            size = os.fstat(file.fileno()).st_size
+
+        with file:
+            position = 0
+
+            for line_number, line in enumerate(file):
+                position += len(line)
+
+                if position > size or not line.endswith(b"\n"):
+                    break
+
+                if line_number in tombstones or not line.strip():
+                    continue
+
+                yield line_number, loads(line)
+
+    def iter_appended_records(self, offset: int) -> Iterator[dict]:
+        """
+        Генератор, который читает записи, дописанные в конец файла после позиции offset.
+        :param offset: позиция, на которой заканчивается последняя уже прочитанная строка
+        :return: словари с вакансиями
+        """
+        with self.__lock.shared():
+            file = open(self.path, "rb")
+            size = os.fstat(file.fileno()).st_size
+
+        with file:
+            file.seek(offset)
+            position = offset
+
+            for line in file:
+                position += len(line)
+
+                if position > size or not line.endswith(b"\n"):
+                    break
+
+                if line.strip():
+                    yield loads(line)
+
+    def iter_vacancies(self, **keywords) -> Iterator[Vacancy]:
+        """
+        Генератор, который построчно отдает вакансии, удовлетворяющие критериям.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: объекты класса Vacancy
+        """
+        keys = None
+
+        if "text" in keywords:
+            keywords = dict(keywords)
+            words, mode, prefix = parse_text_query(keywords.pop("text"))
+
+            if words:
+                keys = self.get_keyword_index().search(words, mode, prefix)
+
+        is_match = compile_filters(keywords, for_records=True)
+
+        for _, record in self.iter_records():
+            if keys is not None and Vacancy.record_key(record) not in keys:
+                continue
+
+            if is_match(record):
+                yield Vacancy.from_record(record)
+
+    def get_vacancies(self, **keywords) -> list:
+        """
+        Метод для возвращения списка вакансий из файла по указанным критериям.
+
+        Если критерии не указаны, то возвращает список всех вакансий в файле
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: список объектов класса Vacancy, удовлетворяющих критериям
+        """
+        with metrics.timer('storage.scan'):
+            vacancies = list(self.iter_vacancies(**keywords))
+
+        metrics.add('storage.records_matched', len(vacancies))
+
+        return vacancies
+
+    def delete_vacancies(self, vacancies: list):
+        """
+        Метод для удаления списка вакансий из файла.
+
+        Строки с вакансиями не перезаписываются, а помечаются удаленными. Когда доля
+        удаленных записей превышает compact_ratio, файл сжимается.
+        :param vacancies: список объектов класса Vacancy
+        :return: None
+        """
+        keys = {vacancy.key for vacancy in vacancies}
+
+        if keys:
+            with self.__lock.exclusive():
+                self.add_tombstones([line_number for line_number, record in self.iter_records()
+                                     if Vacancy.record_key(record) in keys], keys)
+
+    def delete_where(self, **keywords) -> int:
+        """
+        Метод для удаления из файла всех вакансий, удовлетворяющих критериям, за один проход по файлу.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: кол-во удаленных вакансий
+        """
+        deleted = []
+        deleted_keys = set()
+        kept_keys = set()
+
+        is_match = compile_filters(keywords, for_records=True)
+
+        with self.__lock.exclusive():
+            for line_number, record in self.iter_records():
+                if is_match(record):
+                    deleted.append(line_number)
+                    deleted_keys.add(Vacancy.record_key(record))
+                else:
+                    kept_keys.add(Vacancy.record_key(record))
+
+            self.add_tombstones(deleted, deleted_keys - kept_keys)
+
+        return len(deleted)
+
+    def add_tombstones(self, line_numbers: list[int], removed_keys: Iterable[str] = ()):
+        """
+        Метод для пометки строк удаленными и сжатия файла при необходимости.
+        :param line_numbers: номера удаляемых строк
+        :param removed_keys: ключи вакансий, которых больше нет в файле
+        :return: None
+        """
+        if not line_numbers:
+            return
+
+        with self.__lock.exclusive():
+            index_was_current = self.is_index_current()
+            inode = self.get_inode()
+            # Номера строк прежнего (уже сжатого) файла данных заменяются, а не дополняются
+            is_current = self.read_tombstones()[0] == inode
+
+            with open(self.tombstones_path, "a" if is_current else "w", encoding="utf-8") as file:
+                if not is_current:
+                    file.write(f"#{inode}\n")
+
+                file.writelines(f"{line_number}\n" for line_number in line_numbers)
+                file.flush()
+                os.fsync(file.fileno())
+
+            if len(self.get_tombstones()) > self.__compact_ratio * self.count_lines():
+                self.compact()
+
+            self.update_keyword_index(index_was_current, removed_keys)
+
+    def compact(self):
+        """
+        Метод для сжатия файла: атомарно перезаписывает его без удаленных строк.
+
+        Файл удаленных строк удаляется после замены файла данных. Если сбой произойдет между этими шагами,
+        оставшиеся номера строк относятся к inode прежнего файла и к сжатому файлу не применяются.
+        :return: None
+        """
+        with self.__lock.exclusive():
+            with atomic_write(self.path) as file:
+                for _, record in self.iter_records():
+                    file.write(dumps(record) + b"\n")
+
+            if os.path.exists(self.tombstones_path):
+                os.remove(self.tombstones_path)
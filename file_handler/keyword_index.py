@@ -0,0 +1,256 @@
+import json
+import os
+import re
+from bisect import bisect_left
+from typing import Iterable
+
+from utils.file_lock import atomic_write
+from vacancy import Vacancy
+
+FIELDS = ('title', 'description', 'requirement')
+
+_tag = re.compile(r'<[^>]*>')
+_word = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> set[str]:
+    """
+    Функция для разбиения текста на слова в нижнем регистре без html-тегов
+    :param text: текст
+    :return: множество слов
+    """
+    if not isinstance(text, str):
+        return set()
+
+    return set(_word.findall(_tag.sub(' ', text).lower()))
+
+
+def parse_text_query(value) -> tuple[list[str], str, bool]:
+    """
+    Функция для разбора критерия поиска по ключевым словам.
+
+    Критерий может быть строкой со словами через пробел или запятую, списком слов
+    или словарем {'words': [...], 'mode': 'and' | 'or', 'prefix': True | False}
+    :param value: критерий поиска
+    :return: список слов, режим объединения (and/or) и признак поиска по началу слова
+    """
+    mode, prefix = 'and', False
+
+    if isinstance(value, dict):
+        mode = value.get('mode', mode).lower()
+        prefix = bool(value.get('prefix', prefix))
+        value = value.get('words', [])
+
+    if isinstance(value, str):
+        value = value.replace(',', ' ').split()
+
+    if mode not in ('and', 'or'):
+        raise ValueError(f"Неверный режим поиска: {mode}")
+
+    words = [word for item in value for word in tokenize(item)]
+
+    return words, mode, prefix
+
+
+def match_tokens(tokens: set[str], words: list[str], mode: str, prefix: bool) -> bool:
+    """
+    Функция для проверки набора слов одной вакансии на соответствие запросу (без индекса).
+
+    Пустой запрос поиск не ограничивает: ему соответствует любая вакансия (как и в KeywordIndex.search)
+    :param tokens: слова вакансии
+    :param words: слова запроса
+    :param mode: режим объединения слов (and/or)
+    :param prefix: искать ли слова запроса как начало слов вакансии
+    :return: True, если вакансия удовлетворяет запросу, иначе False
+    """
+    if not words:
+        return True
+
+    if prefix:
+        found = (any(token.startswith(word) for token in tokens) for word in words)
+    else:
+        found = (word in tokens for word in words)
+
+    return all(found) if mode == 'and' else any(found)
+
+
+def record_tokens(record: dict) -> set[str]:
+    """
+    Функция для получения слов из названия, описания и требований словаря с вакансией
+    :param record: словарь с вакансией
+    :return: множество слов
+    """
+    tokens = set()
+
+    for field in FIELDS:
+        tokens |= tokenize(record.get(field))
+
+    return tokens
+
+
+class KeywordIndex:
+
+    def __init__(self, path: str | None = None):
+        """
+        Конструктор класса KeywordIndex.
+
+        Инвертированный индекс: для каждого слова из названия, описания и требований
+        хранятся ключи вакансий, в которых оно встречается. Индекс сохраняется в файл
+        вместе с отпечатком файла данных, по которому он построен.
+        :param path: путь к файлу индекса (None - индекс только в памяти)
+        """
+        self.__path = path
+        self.__postings: dict[str, set[str]] = {}
+        self.__documents: dict[str, set[str]] = {}
+        self.__vocabulary: list[str] | None = None
+        self.__signature = None
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def signature(self) -> tuple | None:
+        return self.__signature
+
+    @signature.setter
+    def signature(self, value: tuple | None):
+        self.__signature = tuple(value) if value else None
+
+    def __len__(self) -> int:
+        return len(self.__documents)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__documents
+
+    def add(self, key: str, tokens: Iterable[str]):
+        """
+        Метод для добавления слов вакансии в индекс.
+        :param key: ключ вакансии
+        :param tokens: слова вакансии
+        :return: None
+        """
+        tokens = set(tokens)
+        document = self.__documents.setdefault(key, set())
+
+        for token in tokens - document:
+            self.__postings.setdefault(token, set()).add(key)
+
+            if self.__vocabulary is not None and len(self.__postings[token]) == 1:
+                self.__vocabulary = None
+
+        document |= tokens
+
+    def add_records(self, records: Iterable[dict]):
+        """
+        Метод для добавления словарей с вакансиями в индекс.
+        :param records: словари с вакансиями
+        :return: None
+        """
+        for record in records:
+            self.add(Vacancy.record_key(record), record_tokens(record))
+
+    def remove(self, keys: Iterable[str]):
+        """
+        Метод для удаления вакансий из индекса.
+        :param keys: ключи вакансий
+        :return: None
+        """
+        for key in keys:
+            for token in self.__documents.pop(key, ()):
+                postings = self.__postings[token]
+                postings.discard(key)
+
+                if not postings:
+                    del self.__postings[token]
+                    self.__vocabulary = None
+
+    def clear(self):
+        """
+        Метод для очистки индекса.
+        :return: None
+        """
+        self.__postings.clear()
+        self.__documents.clear()
+        self.__vocabulary = None
+
+    def lookup(self, word: str, prefix: bool = False) -> set[str]:
+        """
+        Метод для получения ключей вакансий, в которых встречается слово
+        :param word: слово в нижнем регистре
+        :param prefix: искать ли все слова, начинающиеся с word
+        :return: множество ключей вакансий
+        """
+        if not prefix:
+            return self.__postings.get(word, set())
+
+        if self.__vocabulary is None:
+            self.__vocabulary = sorted(self.__postings)
+
+        keys = set()
+        position = bisect_left(self.__vocabulary, word)
+
+        while position < len(self.__vocabulary) and self.__vocabulary[position].startswith(word):
+            keys |= self.__postings[self.__vocabulary[position]]
+            position += 1
+
+        return keys
+
+    def search(self, words: list[str], mode: str = 'and', prefix: bool = False) -> set[str]:
+        """
+        Метод для поиска вакансий по ключевым словам.
+
+        Пустой запрос поиск не ограничивает и возвращает все вакансии индекса (как и match_tokens)
+        :param words: слова запроса в нижнем регистре
+        :param mode: 'and' - все слова, 'or' - хотя бы одно слово
+        :param prefix: искать ли слова запроса как начало слов вакансии
+        :return: множество ключей вакансий
+        """
+        if not words:
+            return set(self.__documents)
+
+        postings = [self.lookup(word, prefix) for word in words]
+
+        if mode == 'or':
+            return set().union(*postings)
+
+        postings.sort(key=len)
+
+        return set(postings[0]).intersection(*postings[1:])
+
+    def load(self) -> bool:
+        """
+        Метод для загрузки индекса из файла.
+        :return: True, если индекс загружен, иначе False
+        """
+        if self.__path is None or not os.path.exists(self.__path):
+            return False
+
+        try:
+            with open(self.__path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        self.clear()
+
+        for key, tokens in data['documents'].items():
+            self.add(key, tokens)
+
+        self.signature = data.get('signature')
+
+        return True
+
+    def save(self):
+        """
+        Метод для сохранения индекса в файл.
+        :return: None
+        """
+        if self.__path is None:
+            return
+
+        data = {'signature': self.__signature,
+                'documents': {key: sorted(tokens) for key, tokens in self.__documents.items()}}
+
+        with atomic_write(self.__path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
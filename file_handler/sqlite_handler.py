@@ -0,0 +1,408 @@
+import os
+import sqlite3
+import tempfile
+from typing import Iterable, Iterator
+
+from file_handler.base import FileHandler
+from file_handler.codec import dumps, loads
+from file_handler.filters import parse_filters
+from file_handler.keyword_index import FIELDS, record_tokens
+from settings import DATA_PATH, SQLITE_TIMEOUT
+from utils.instrumentation import metrics
+from vacancy import Vacancy
+
+COLUMNS = ('title', 'location', 'link', 'employer', 'salary', 'original_salary', 'description', 'requirement',
+           'experience', 'source')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancies (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    location TEXT NOT NULL,
+    link TEXT NOT NULL,
+    employer TEXT NOT NULL,
+    salary TEXT NOT NULL,
+    original_salary TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL,
+    requirement TEXT NOT NULL,
+    experience TEXT NOT NULL,
+    source TEXT NOT NULL,
+    location_lc TEXT NOT NULL,
+    employer_lc TEXT NOT NULL,
+    source_lc TEXT NOT NULL,
+    description_lc TEXT NOT NULL,
+    requirement_lc TEXT NOT NULL,
+    salary_from REAL NOT NULL,
+    salary_to REAL NOT NULL,
+    salary_key REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_vacancies_location ON vacancies (location_lc);
+CREATE INDEX IF NOT EXISTS idx_vacancies_employer ON vacancies (employer_lc);
+CREATE INDEX IF NOT EXISTS idx_vacancies_source ON vacancies (source_lc);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_from ON vacancies (salary_from);
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_to ON vacancies (salary_to);
+CREATE INDEX IF NOT EXISTS idx_vacancies_link ON vacancies (link);
+"""
+
+MIGRATIONS = {
+    'salary_key': """
+ALTER TABLE vacancies ADD COLUMN salary_key REAL NOT NULL DEFAULT 0;
+UPDATE vacancies SET salary_key = CASE WHEN salary_from > 0 AND salary_to > 0
+    THEN (salary_from + salary_to) / 2 ELSE max(salary_from, salary_to) END;
+""",
+    'original_salary': """
+ALTER TABLE vacancies ADD COLUMN original_salary TEXT NOT NULL DEFAULT '';
+UPDATE vacancies SET original_salary = salary || ' RUB';
+""",
+}
+
+# Колонки, по которым проверяются критерии фильтрации (см. filters.parse_filters)
+SQL_COLUMNS = {
+    'city': 'location_lc',
+    'employer': 'employer_lc',
+    'source': 'source_lc',
+    'experience': 'py_lower(experience)',
+    'description': 'description_lc',
+    'requirements': 'requirement_lc',
+}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_key ON vacancies (salary_key);
+"""
+
+# Слова из названия, описания и требований (см. keyword_index.record_tokens) для поиска по критерию text.
+# Слова удаленной вакансии удаляются триггером
+TOKENS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vacancy_tokens (
+    token TEXT NOT NULL,
+    vacancy_id INTEGER NOT NULL,
+    PRIMARY KEY (token, vacancy_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_vacancy_tokens_vacancy ON vacancy_tokens (vacancy_id);
+CREATE TRIGGER IF NOT EXISTS vacancies_delete_tokens AFTER DELETE ON vacancies BEGIN
+    DELETE FROM vacancy_tokens WHERE vacancy_id = old.id;
+END;
+"""
+
+INSERT = (f"INSERT INTO vacancies ({', '.join(COLUMNS)}, location_lc, employer_lc, source_lc, description_lc, "
+          f"requirement_lc, salary_from, salary_to, salary_key) VALUES ({', '.join('?' * (len(COLUMNS) + 8))})")
+
+# Верхняя граница для поиска слов по началу: все слова, начинающиеся с prefix, меньше prefix + MAX_CHAR
+MAX_CHAR = chr(0x10FFFF)
+
+
+class SqliteHandler(FileHandler):
+
+    __file_path = str(DATA_PATH) + '/'
+
+    def __init__(self, filename: str):
+        """
+        Конструктор класса SqliteHandler.
+
+        Вакансии хранятся в таблице SQLite с индексами по городу, работодателю, источнику
+        и границам зарплаты, а слова вакансий для поиска по ключевым словам - в таблице vacancy_tokens,
+        поэтому фильтрация и поиск выполняются запросом к базе.
+        База работает в режиме WAL: читатели из других процессов не блокируют запись и не ждут ее,
+        а одновременные записи выполняются по очереди (с ожиданием до SQLITE_TIMEOUT секунд).
+        :param filename: имя файла базы данных
+        """
+        super().__init__(filename)
+        self.__connection = None
+
+    @property
+    def path(self) -> str:
+        return self.__file_path + self.filename
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.create_function('py_lower', 1, str.lower, deterministic=True)
+            self.__connection.executescript(SCHEMA)
+            self.migrate()
+
+        return self.__connection
+
+    def migrate(self):
+        """
+        Метод для добавления колонок и таблиц, которых нет в базах, созданных предыдущими версиями программы.
+        :return: None
+        """
+        columns = {row[1] for row in self.__connection.execute("PRAGMA table_info(vacancies)")}
+
+        for column, script in MIGRATIONS.items():
+            if column not in columns:
+                self.__connection.executescript(script)
+
+        self.__connection.executescript(INDEXES)
+
+        tables = {row[0] for row in self.__connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+        if 'vacancy_tokens' not in tables:
+            self.__connection.executescript(TOKENS_SCHEMA)
+            rows = self.__connection.execute(f"SELECT id, {', '.join(FIELDS)} FROM vacancies").fetchall()
+
+            with self.__connection:
+                self.__connection.executemany("INSERT OR IGNORE INTO vacancy_tokens (token, vacancy_id) VALUES (?, ?)",
+                                              ((token, row[0]) for row in rows
+                                               for token in record_tokens(dict(zip(FIELDS, row[1:])))))
+
+    def get_signature(self) -> tuple[int, ...]:
+        """
+        Метод для получения отпечатка базы, по которому индексы рядом с ней проверяют свою актуальность.
+
+        В режиме WAL изменения сначала попадают в файл <filename>-wal, поэтому учитываются оба файла
+        :return: время модификации в наносекундах и размер файла базы и файла WAL
+        """
+        signature = ()
+
+        for path in (self.path, self.path + '-wal'):
+            stat = os.stat(path) if os.path.exists(path) else None
+            signature += (stat.st_mtime_ns, stat.st_size) if stat else (0, 0)
+
+        return signature
+
+    def close(self):
+        """
+        Метод для закрытия соединения с базой данных.
+        :return: None
+        """
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __len__(self) -> int:
+        """
+        Метод для возвращения кол-ва вакансий в базе
+        :return: кол-во вакансий
+        """
+        return self.connection.execute("SELECT COUNT(*) FROM vacancies").fetchone()[0]
+
+    @staticmethod
+    def to_row(vacancy_dict: dict, vacancy: Vacancy) -> tuple:
+        """
+        Преобразование вакансии в строку таблицы вместе с индексируемыми колонками
+        :param vacancy_dict: словарь с вакансией
+        :param vacancy: объект класса Vacancy
+        :return: кортеж значений колонок
+        """
+        return (*(vacancy_dict[column] for column in COLUMNS),
+                vacancy.location.lower(), vacancy.employer.lower(), vacancy.source.lower(),
+                vacancy.description.lower(), vacancy.requirement.lower(),
+                vacancy.salary_from, vacancy.salary_to, vacancy.salary_key)
+
+    def add_vacancies(self, vacancies: list):
+        """
+        Метод для добавления списка вакансий в базу.
+        :param vacancies: список объектов класса Vacancy
+        :return: None
+        """
+        self.add_vacancies_stream([vacancies])
+
+    def add_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для постраничного добавления вакансий в базу: каждая страница - одна транзакция.
+
+        Вместе с вакансией в таблицу vacancy_tokens записываются ее слова для поиска по ключевым словам.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        count = 0
+
+        for page in pages:
+            with metrics.timer('storage.write'):
+                rows = self.prepare_page(page)
+
+                with self.connection:
+                    self.insert_rows(rows)
+
+            count += len(rows)
+            metrics.add('storage.records_written', len(rows))
+
+        return count
+
+    def replace_vacancies_stream(self, pages: Iterable[list]) -> int:
+        """
+        Метод для замены всех вакансий в базе вакансиями из страниц.
+
+        Страницы сначала сохраняются во временный файл, поэтому во время их получения база не заблокирована
+        для записи. Затем удаление прежних вакансий и вставка новых выполняются одной транзакцией:
+        другие подключения видят либо прежние вакансии, либо новые. Если получение страниц прервется ошибкой,
+        база останется прежней.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: кол-во записанных вакансий
+        """
+        count = 0
+
+        with tempfile.TemporaryFile() as spool:
+            for page in pages:
+                rows = self.prepare_page(page)
+                spool.writelines(dumps([row, sorted(tokens)]) + b"\n" for row, tokens in rows)
+                count += len(rows)
+
+            spool.seek(0)
+
+            with metrics.timer('storage.write'), self.connection:
+                self.connection.execute("DELETE FROM vacancy_tokens")
+                self.connection.execute("DELETE FROM vacancies")
+                self.insert_rows(loads(line) for line in spool)
+
+        metrics.add('storage.records_written', count)
+
+        return count
+
+    def prepare_page(self, page: list) -> list[tuple[tuple, set[str]]]:
+        """
+        Преобразование страницы вакансий в строки таблицы vacancies вместе со словами для поиска
+        :param page: список объектов класса Vacancy
+        :return: список пар (строка таблицы, слова вакансии)
+        """
+        return [(self.to_row(vacancy_dict, vacancy), record_tokens(vacancy_dict))
+                for vacancy_dict, vacancy in zip(self.transform_to_json(page), page)]
+
+    def insert_rows(self, rows: Iterable):
+        """
+        Метод для вставки строк в таблицу vacancies и их слов в таблицу vacancy_tokens.
+
+        Транзакцию открывает вызывающий код
+        :param rows: пары (строка таблицы, слова вакансии), см. prepare_page
+        :return: None
+        """
+        for row, tokens in rows:
+            vacancy_id = self.connection.execute(INSERT, row).lastrowid
+            self.connection.executemany("INSERT INTO vacancy_tokens (token, vacancy_id) VALUES (?, ?)",
+                                        ((token, vacancy_id) for token in tokens))
+
+    @staticmethod
+    def build_where(keywords: dict) -> tuple[str, list]:
+        """
+        Преобразование критериев фильтрации (см. filters.parse_filters) в условие WHERE.
+
+        Критерий text (поиск по ключевым словам) проверяется подзапросами к таблице vacancy_tokens
+        по ее первичному ключу: для каждого слова отбираются вакансии с этим словом (или со словами,
+        которые с него начинаются), а результаты пересекаются (and) или объединяются (or).
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: текст условия и список параметров запроса
+        """
+        conditions = []
+        params = []
+
+        for condition in parse_filters(keywords):
+            op, value = condition.op, condition.value
+            column = SQL_COLUMNS.get(condition.key)
+
+            if op == 'text':
+                words, mode, prefix = value
+                term = ("SELECT vacancy_id FROM vacancy_tokens WHERE "
+                        + ("token >= ? AND token < ?" if prefix else "token = ?"))
+                sql = f"id IN ({(' INTERSECT ' if mode == 'and' else ' UNION ').join([term] * len(words))})" \
+                    if words else "1"
+
+                for word in words:
+                    params.extend((word, word + MAX_CHAR) if prefix else (word,))
+            elif op == 'eq':
+                sql = f"{column} = ?"
+                params.append(value)
+            elif op == 'in':
+                sql = f"{column} IN ({', '.join('?' * len(value))})" if value else "0"
+                params.extend(sorted(value))
+            elif op == 'range':
+                low, high = value
+                parts = []
+
+                if low is not None:
+                    parts.append("salary_from >= ?")
+                    params.append(low)
+
+                if high is not None:
+                    parts.append("salary_to <= ?")
+                    params.append(high)
+
+                sql = " AND ".join(parts) or "1"
+            else:
+                sql = " OR ".join(f"instr({column}, ?) > 0" for _ in value) or "0"
+                params.extend(value)
+
+            conditions.append(f"NOT ({sql})" if condition.negate else f"({sql})")
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        return where, params
+
+    def iter_vacancies(self, **keywords) -> Iterator[Vacancy]:
+        """
+        Генератор, который отдает вакансии из базы, удовлетворяющие критериям.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: объекты класса Vacancy
+        """
+        where, params = self.build_where(keywords)
+        cursor = self.connection.execute(f"SELECT {', '.join(COLUMNS)} FROM vacancies{where} ORDER BY id", params)
+
+        for row in cursor:
+            yield Vacancy.from_record(dict(zip(COLUMNS, row)))
+
+    def top_by_salary(self, n: int, **keywords) -> list:
+        """
+        Метод для получения топ N вакансий по зарплате запросом ORDER BY ... LIMIT по индексу.
+        :param n: кол-во вакансий
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: список объектов класса Vacancy по убыванию зарплаты
+        """
+        where, params = self.build_where(keywords)
+        cursor = self.connection.execute(f"SELECT {', '.join(COLUMNS)} FROM vacancies{where} "
+                                         f"ORDER BY salary_key DESC, id LIMIT ?", [*params, n])
+
+        return [Vacancy.from_record(dict(zip(COLUMNS, row))) for row in cursor]
+
+    def get_vacancies(self, **keywords) -> list:
+        """
+        Метод для возвращения списка вакансий из базы по указанным критериям.
+
+        Если критерии не указаны, то возвращает список всех вакансий в базе
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: список объектов класса Vacancy, удовлетворяющих критериям
+        """
+        with metrics.timer('storage.scan'):
+            vacancies = list(self.iter_vacancies(**keywords))
+
+        metrics.add('storage.records_matched', len(vacancies))
+
+        return vacancies
+
+    def delete_vacancies(self, vacancies: list):
+        """
+        Метод для удаления списка вакансий из базы.
+
+        Вакансии сравниваются по ключу (Vacancy.key), как в хранилищах json и jsonl: по ссылке
+        (через индекс idx_vacancies_link), а без ссылки - по источнику, названию, работодателю и городу.
+        :param vacancies: список объектов класса Vacancy
+        :return: None
+        """
+        links = []
+        identities = []
+
+        for vacancy in vacancies:
+            if vacancy.key == vacancy.link:
+                links.append((vacancy.link,))
+            else:
+                identities.append((vacancy.source, vacancy.title, vacancy.employer, vacancy.location))
+
+        with self.connection:
+            self.connection.executemany("DELETE FROM vacancies WHERE link = ?", links)
+            self.connection.executemany("DELETE FROM vacancies WHERE source = ? AND title = ? AND employer = ? "
+                                        "AND location = ? AND substr(link, 1, 4) != 'http'", identities)
+
+    def delete_where(self, **keywords) -> int:
+        """
+        Метод для удаления из базы всех вакансий, удовлетворяющих критериям, одним запросом DELETE.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: кол-во удаленных вакансий
+        """
+        where, params = self.build_where(keywords)
+
+        with self.connection:
+            cursor = self.connection.execute(f"DELETE FROM vacancies{where}", params)
+
+        return cursor.rowcount
@@ -1,7 +1,14 @@
+import sys
+
+from cli import run
+from utils.instrumentation import metrics
 from utils.user_interface import interact
 
 
 def main():
+    if len(sys.argv) > 1:
+        sys.exit(run(sys.argv[1:]))
+
     status = interact()
 
     if status:
@@ -10,3 +17,6 @@ def main():
 
 if __name__ == '__main__':
     main()
+
+    if metrics.enabled:
+        print(metrics.format_summary(), file=sys.stderr)
@@ -1,8 +1,17 @@
 from abc import ABC, abstractmethod
 
+import requests
+
+from settings import HTTP_TIMEOUT
+from utils.http_session import get_session
+from utils.instrumentation import metrics
+from utils.replay import fixture_store
+
 
 class Parser(ABC):
 
+    platform: str = ''
+
     def __init__(self, url: str, headers: dict, params: dict):
         """
         Конструктор класса Parser.
@@ -26,6 +35,27 @@ class Parser(ABC):
     def params(self):
         return self.__params
 
+    @property
+    def session(self) -> requests.Session:
+        return get_session(self.__url)
+
+    def get_response(self) -> requests.Response:
+        """
+        Метод для отправки запроса к API через общую для хоста HTTP-сессию.
+
+        В локальном режиме (USE_LOCAL_DATA) ответ берется из записанных файлов, см. replay.FixtureStore
+        :return: ответ API
+        """
+        with metrics.timer('http.request'):
+            response = fixture_store.get(self.__url, self.__params, lambda: self.session.get(
+                self.__url, headers=self.__headers, params=self.__params, timeout=HTTP_TIMEOUT))
+
+        if metrics.enabled:
+            metrics.add('http.requests')
+            metrics.add('http.bytes', len(response.content))
+
+        return response
+
     @abstractmethod
     def get_data(self) -> dict:
         """
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from parser.base import Parser
+from parser.hh import HhParser
+from parser.sj import SjParser
+
+PLATFORMS = {
+    'hh.ru': HhParser,
+    'hh': HhParser,
+    'superjob.ru': SjParser,
+    'superjob': SjParser,
+    'sj': SjParser,
+}
+
+
+def normalize_platform(platform: str) -> str:
+    """
+    Функция для приведения названия платформы к виду, который используется в вакансиях (hh.ru, superjob.ru)
+    :param platform: название платформы, введенное пользователем
+    :return: название платформы
+    """
+    platform = platform.strip().lower()
+
+    if platform not in PLATFORMS:
+        raise ValueError(f"Неверная платформа: {platform}")
+
+    return PLATFORMS[platform].platform
+
+
+def create_parser(platform: str, query: str, page: int, date_from: datetime | None = None) -> Parser:
+    """
+    Функция для создания парсера страницы выбранной платформы
+    :param platform: название платформы (hh.ru, hh, superjob.ru, superjob, sj)
+    :param query: поисковый запрос
+    :param page: номер страницы
+    :param date_from: запрашивать только вакансии, опубликованные после этой даты
+    :return: объект класса Parser
+    """
+    return PLATFORMS[normalize_platform(platform)](query, page, date_from=date_from)
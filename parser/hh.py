@@ -1,28 +1,38 @@
-import requests
+from datetime import datetime
 
 from parser.base import Parser
 from settings import API_URL_HH
-from utils.exchange_rates_api import get_currency_rate
+from utils.exchange_rates_api import normalize_currency, normalize_salaries
+from utils.instrumentation import metrics
 from vacancy import Vacancy
 
 
 class HhParser(Parser):
 
-    def __init__(self, query: str, page: int):
+    platform: str = 'hh.ru'
+
+    def __init__(self, query: str, page: int, url: str = API_URL_HH, date_from: datetime | None = None):
         """
         Конструктор класса HhParser.
         :param query: поисковый запрос
         :param page: кол-во страниц для обработки
+        :param url: адрес API (по умолчанию API_URL_HH)
+        :param date_from: запрашивать только вакансии, опубликованные после этой даты (от новых к старым)
         """
-        super().__init__(url=API_URL_HH, headers={"User-Agent": "HH-User-Agent"},
-                         params={"text": query, 'page': page, 'per_page': 50})
+        params = {"text": query, 'page': page, 'per_page': 50}
+
+        if date_from is not None:
+            params['date_from'] = date_from.isoformat(timespec='seconds')
+            params['order_by'] = 'publication_time'
+
+        super().__init__(url=url, headers={"User-Agent": "HH-User-Agent"}, params=params)
 
     def get_data(self) -> dict:
         """
         Метод для получения данных с API HH в виде словаря.
         :return: данные с API в виде словаря
         """
-        response = requests.get(self.url, headers=self.headers, params=self.params)
+        response = self.get_response()
 
         if response.status_code == 200:
             data = response.json()
@@ -37,35 +47,38 @@ class HhParser(Parser):
     def parse_data(self) -> list:
         """
         Метод для создания списка объектов класса Vacancy из данных с API HH.
-        Здесь мы унифицируем данные и валидируем их.
+        Здесь мы унифицируем данные и валидируем их при создании вакансий (Vacancy.from_row),
+        а зарплаты всей страницы переводим в рубли заранее.
         :return: список объектов класса Vacancy
         """
-        data = self.get_data()
-        vacancies = []
-        rates = {'USD': get_currency_rate('USD'), 'EUR': get_currency_rate('EUR')}
-
-        for item in data["items"]:
-            data_reduced = {}
-
-            data_reduced['title'] = item.get('name', '...')
-            data_reduced['location'] = item['area'].get('name', '...')
-            data_reduced['link'] = item.get('alternate_url', '...')
-
-            if not item['salary'] is None:
-                data_reduced['salary'] = {'from': item['salary'].get('from', 0), 'to': item['salary'].get('to', 0),
-                                          'currency': item['salary'].get('currency', 'RUB').upper()}
-            else:
-                data_reduced['salary'] = item['salary']
-
-            data_reduced['employer'] = item['employer'].get('name', '...')
-            data_reduced['description'] = item["snippet"].get('responsibility', '...')
-            data_reduced['requirement'] = item['snippet'].get('requirement', '...')
-            data_reduced['experience'] = item['experience'].get('name', '...')
-            data_reduced['source'] = "hh.ru"
-
-            vacancy = Vacancy(**data_reduced)
-            vacancy.validate(rates)
-            vacancies.append(vacancy)
+        with metrics.timer('parser.get_data'):
+            data = self.get_data()
+
+        with metrics.timer('parser.parse_items'):
+            vacancies = []
+            salaries = [None if item['salary'] is None else
+                        {'from': item['salary'].get('from', 0), 'to': item['salary'].get('to', 0),
+                         'currency': normalize_currency(item['salary'].get('currency'))}
+                        for item in data["items"]]
+
+            for item, salary, original_salary in zip(data["items"], normalize_salaries(salaries), salaries):
+                salary_from, salary_to, _ = Vacancy.parse_salary(salary)
+
+                vacancies.append(Vacancy.from_row(
+                    title=item.get('name', '...'),
+                    location=item['area'].get('name', '...'),
+                    link=item.get('alternate_url', '...'),
+                    employer=item['employer'].get('name', '...'),
+                    salary_from=salary_from,
+                    salary_to=salary_to,
+                    description=item["snippet"].get('responsibility', '...'),
+                    requirement=item['snippet'].get('requirement', '...'),
+                    experience=item['experience'].get('name', '...'),
+                    source="hh.ru",
+                    original_salary=original_salary and Vacancy.parse_salary(original_salary),
+                ))
+
+        metrics.add('parser.records', len(vacancies))
 
         return vacancies
 
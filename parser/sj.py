@@ -1,32 +1,41 @@
 import os
-
-import requests
+from datetime import datetime
 
 from parser.base import Parser
 from settings import API_URL_SJ
-from utils.exchange_rates_api import get_currency_rate
+from utils.exchange_rates_api import normalize_currency, normalize_salaries
+from utils.instrumentation import metrics
 from vacancy import Vacancy
 
 
 class SjParser(Parser):
 
+    platform: str = 'superjob.ru'
     __SJ_API_TOKEN: str = os.getenv('SJ_API_TOKEN')
 
-    def __init__(self, query: str, page: int):
+    def __init__(self, query: str, page: int, url: str = API_URL_SJ, date_from: datetime | None = None):
         """
         Конструктор класса SjParser.
         :param query: поисковый запрос
         :param page: кол-во страниц для обработки
+        :param url: адрес API (по умолчанию API_URL_SJ)
+        :param date_from: запрашивать только вакансии, опубликованные после этой даты (от новых к старым)
         """
-        super().__init__(url=API_URL_SJ, headers={"X-Api-App-Id": self.__SJ_API_TOKEN},
-                         params={"keyword": query, "count": 50, 'page': page})
+        params = {"keyword": query, "count": 50, 'page': page}
+
+        if date_from is not None:
+            params['date_published_from'] = int(date_from.timestamp())
+            params['order_field'] = 'date'
+            params['order_direction'] = 'desc'
+
+        super().__init__(url=url, headers={"X-Api-App-Id": self.__SJ_API_TOKEN}, params=params)
 
     def get_data(self) -> dict:
         """
         Метод для получения данных с API SJ в виде словаря.
         :return: данные с API в виде словаря
         """
-        response = requests.get(self.url, headers=self.headers, params=self.params)
+        response = self.get_response()
 
         if response.status_code == 200:
             data = response.json()
@@ -41,30 +50,36 @@ class SjParser(Parser):
     def parse_data(self) -> list:
         """
         Метод для создания списка объектов класса Vacancy из данных с API SJ.
-        Здесь мы унифицируем данные и валидируем их.
+        Здесь мы унифицируем данные и валидируем их при создании вакансий (Vacancy.from_row),
+        а зарплаты всей страницы переводим в рубли заранее.
         :return: список объектов класса Vacancy
         """
-        data = self.get_data()
-        vacancies = []
-        rates = {'USD': get_currency_rate('USD'), 'EUR': get_currency_rate('EUR')}
-
-        for item in data["objects"]:
-            data_reduced = {}
-
-            data_reduced['title'] = item.get('profession', '...')
-            data_reduced['location'] = item['town'].get('title', '...')
-            data_reduced['link'] = item.get('link', '...')
-            data_reduced['employer'] = item.get('firm_name', '...')
-            data_reduced['salary'] = {'from': item.get('payment_from', 0), 'to': item.get('payment_to', 0),
-                                      'currency': item.get('currency', 'RUB').upper()}
-            data_reduced['description'] = item.get('candidat', '...')
-            data_reduced['requirement'] = '...'
-            data_reduced['experience'] = item['experience'].get('title', '...')
-            data_reduced['source'] = "superjob.ru"
-
-            vacancy = Vacancy(**data_reduced)
-            vacancy.validate(rates)
-            vacancies.append(vacancy)
+        with metrics.timer('parser.get_data'):
+            data = self.get_data()
+
+        with metrics.timer('parser.parse_items'):
+            vacancies = []
+            salaries = [{'from': item.get('payment_from', 0), 'to': item.get('payment_to', 0),
+                         'currency': normalize_currency(item.get('currency'))} for item in data["objects"]]
+
+            for item, salary, original_salary in zip(data["objects"], normalize_salaries(salaries), salaries):
+                salary_from, salary_to, _ = Vacancy.parse_salary(salary)
+
+                vacancies.append(Vacancy.from_row(
+                    title=item.get('profession', '...'),
+                    location=item['town'].get('title', '...'),
+                    link=item.get('link', '...'),
+                    employer=item.get('firm_name', '...'),
+                    salary_from=salary_from,
+                    salary_to=salary_to,
+                    description=item.get('candidat', '...'),
+                    requirement='...',
+                    experience=item['experience'].get('title', '...'),
+                    source="superjob.ru",
+                    original_salary=Vacancy.parse_salary(original_salary),
+                ))
+
+        metrics.add('parser.records', len(vacancies))
 
         return vacancies
 
@@ -4,7 +4,58 @@ API_URL_HH = 'https://api.hh.ru/vacancies'
 API_URL_SJ = 'https://api.superjob.ru/2.0/vacancies/'
 API_URL_EXCH_RATES = 'https://api.apilayer.com/exchangerates_data/latest'
 
-USE_LOCAL_DATA = True
 ROOT_PATH = Path().resolve()
 DATA_PATH = Path.joinpath(ROOT_PATH, 'data_json')
 
+# Локальный режим: ответы API читаются из сжатых файлов в REPLAY_PATH, а отсутствующие запрашиваются
+# и записываются туда же (REPLAY_STRICT = True - вместо запроса выбрасывается ошибка, сеть не используется).
+# По умолчанию выключен: прежнее значение True ни на что не влияло, а теперь включало бы чтение записанных ответов
+USE_LOCAL_DATA = False
+REPLAY_PATH = Path.joinpath(DATA_PATH, 'fixtures')
+REPLAY_STRICT = False
+
+# Максимальное кол-во одновременных запросов к API платформ
+FETCH_MAX_WORKERS = 8
+# Ограничение частоты запросов к каждой платформе (запросов в секунду)
+FETCH_RATE_LIMITS = {'hh.ru': 5.0, 'superjob.ru': 2.0}
+
+# Файл с курсами валют и время его актуальности (в секундах)
+EXCH_RATES_CACHE_PATH = Path.joinpath(DATA_PATH, 'exchange_rates.json')
+EXCH_RATES_CACHE_TTL = 12 * 60 * 60
+
+# Параметры HTTP-сессий: размер пула соединений, таймауты (соединение, чтение) и повторы при 429/5xx
+HTTP_POOL_SIZE = FETCH_MAX_WORKERS
+HTTP_TIMEOUT = (5, 30)
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Доля удаленных записей в JSON Lines файле, после которой он перезаписывается без них
+JSONL_COMPACT_RATIO = 0.3
+
+# Учитывать ли при удалении дублей одинаковые вакансии с разных платформ (то же название, работодатель и город,
+# но другая ссылка). Выключено по умолчанию: разные вакансии с совпадающими полями тоже будут пропущены
+DEDUP_FINGERPRINTS = False
+
+# Инкрементальная синхронизация (состояние хранится рядом с файлом данных: <файл>.sync.json):
+# запас по времени (в секундах) и сколько последних ключей вакансий помнить для каждого запроса и платформы
+SYNC_OVERLAP = 60 * 60
+SYNC_SEEN_LIMIT = 5000
+
+# Сколько секунд ждать, пока другой процесс закончит запись в базу SQLite
+SQLITE_TIMEOUT = 30
+
+# Формат файла с вакансиями: 'json' (с отступами), 'json-compact' или 'msgpack' (нужен пакет msgpack).
+# Файл в другом формате читается как есть; перевести его в этот формат: python main.py migrate
+STORAGE_FORMAT = 'json-compact'
+# Библиотека JSON: 'auto' - orjson, если он установлен, 'orjson' или 'json' (стандартная библиотека)
+JSON_CODEC = 'auto'
+
+# Планировщик нескольких запросов: файл с отметками обработанных страниц, сколько страниц
+# записывать в хранилище за один раз и сколько запросов к платформе можно отправить за запуск
+SCHEDULER_CHECKPOINT_PATH = Path.joinpath(DATA_PATH, 'scheduler_checkpoint.json')
+SCHEDULER_BATCH_PAGES = 4 * FETCH_MAX_WORKERS
+SCHEDULER_BUDGETS = {'hh.ru': None, 'superjob.ru': None}
+
+# Сбор метрик (время этапов загрузки и хранения, объем данных, попадания в кэш), см. utils/instrumentation.py.
+# В командной строке включается флагами --metrics и --metrics-file
+INSTRUMENTATION = False
@@ -0,0 +1,51 @@
+import pytest
+
+from file_handler.factory import BACKENDS, DEFAULT_FILENAMES
+from vacancy import Vacancy
+
+
+def make_vacancy(number: int = 0, **fields) -> Vacancy:
+    """
+    Функция для создания вакансии с уникальной ссылкой и данными по умолчанию
+    :param number: номер вакансии (входит в ссылку)
+    :param fields: поля, которые нужно заменить
+    :return: объект класса Vacancy
+    """
+    data = {
+        'title': f'Python-разработчик {number}',
+        'location': 'Москва',
+        'link': f'https://hh.ru/vacancy/{number}',
+        'employer': 'Компания',
+        'salary': {'from': 100000 + number * 1000, 'to': 150000 + number * 1000, 'currency': 'RUB'},
+        'description': 'Разработка сервисов на python и django',
+        'requirement': 'Опыт работы с sql',
+        'experience': 'От 1 года до 3 лет',
+        'source': 'hh.ru',
+    }
+    data.update(fields)
+
+    return Vacancy(**data)
+
+
+@pytest.fixture
+def make_handler(tmp_path):
+    """Фабрика хранилищ, файлы которых находятся во временном каталоге теста, а не в DATA_PATH"""
+    handlers = []
+
+    def make(backend: str = 'json', filename: str | None = None, **kwargs):
+        class TmpHandler(BACKENDS[backend]):
+
+            @property
+            def path(self) -> str:
+                return str(tmp_path / self.filename)
+
+        handler = TmpHandler(filename or DEFAULT_FILENAMES[backend], **kwargs)
+        handlers.append(handler)
+
+        return handler
+
+    yield make
+
+    for handler in handlers:
+        if hasattr(handler, 'close'):
+            handler.close()
@@ -0,0 +1,28 @@
+import json
+
+from benchmarks import run
+from utils.replay import fixture_store
+
+
+def test_small_run_writes_results_and_flags_regressions(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    argv = ['--sizes', '60', '--backends', 'json,jsonl', '--repeat', '1', '--no-memory', '--output', str(output)]
+
+    assert run.main(argv) == 0
+    assert not fixture_store.enabled
+
+    with open(output, encoding='utf-8') as file:
+        report = json.load(file)
+
+    names = {result['name'] for result in report['results']}
+    assert {'json.top_by_salary', 'jsonl.delete_vacancies'} <= names
+    assert all(result['size'] == 60 for result in report['results'])
+
+    for result in report['results']:
+        result['seconds'] /= 10
+
+    with open(tmp_path / 'faster.json', 'w', encoding='utf-8') as file:
+        json.dump(report, file)
+
+    assert run.main(argv + ['--compare', str(tmp_path / 'faster.json')]) == 1
+    assert 'РЕГРЕССИЯ' in capsys.readouterr().out
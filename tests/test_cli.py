@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import cli
+from tests.conftest import make_vacancy
+
+
+@pytest.fixture
+def store(make_handler, monkeypatch):
+    handlers = {}
+
+    def create_handler(backend: str = 'json', filename: str | None = None):
+        if backend not in handlers:
+            handlers[backend] = make_handler(backend, filename)
+            handlers[backend].add_vacancies([make_vacancy(0), make_vacancy(1, location='Казань'), make_vacancy(2)])
+
+        return handlers[backend]
+
+    monkeypatch.setattr(cli, 'create_handler', create_handler)
+
+    return create_handler
+
+
+def test_query_prints_filtered_vacancies_as_json(store, capsys):
+    assert cli.run(['query', '--city', 'Москва', '--limit', '1', '--json']) == cli.EXIT_OK
+
+    assert [record['link'] for record in json.loads(capsys.readouterr().out)] == [make_vacancy(0).link]
+
+
+def test_top_and_delete_use_filters(store, capsys):
+    assert cli.run(['top', '-n', '1', '--city', 'Москва', '--json', '--backend', 'jsonl']) == cli.EXIT_OK
+    assert json.loads(capsys.readouterr().out)[0]['link'] == make_vacancy(2).link
+
+    assert cli.run(['delete', '--backend', 'jsonl']) == cli.EXIT_ERROR
+    assert cli.run(['delete', '--city', 'Казань', '--backend', 'jsonl']) == cli.EXIT_OK
+    assert len(store('jsonl')) == 2
+
+
+def test_errors_become_exit_codes(store, capsys):
+    with pytest.raises(SystemExit) as error:
+        cli.run(['fetch'])
+
+    assert error.value.code == 2
+    assert cli.run(['stats', '--by', 'title']) == cli.EXIT_ERROR
+    assert cli.run(['migrate', '--backend', 'sqlite']) == cli.EXIT_ERROR
+    assert 'Ошибка' in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('backend', ('json', 'jsonl', 'sqlite'))
+def test_fetch_replace_rewrites_store(store, monkeypatch, backend):
+    monkeypatch.setattr(cli, 'stream_vacancies', lambda platforms, query, pages, engine: iter([[make_vacancy(3)]]))
+
+    for _ in range(2):
+        assert cli.run(['fetch', '-q', 'python', '--replace', '--backend', backend]) == cli.EXIT_OK
+
+    assert [vacancy.link for vacancy in store(backend).get_vacancies()] == [make_vacancy(3).link]
@@ -0,0 +1,32 @@
+import pytest
+
+from file_handler import codec
+from file_handler.codec import FORMATS, FRAMING, decode_records, encode_record
+
+RECORDS = [{'title': 'Python-разработчик', 'salary': {'from': 1000, 'to': None}}, {'title': 'Аналитик'}]
+
+
+@pytest.mark.parametrize('storage_format', FORMATS)
+def test_records_survive_every_format(storage_format):
+    if storage_format == 'msgpack' and codec.msgpack is None:
+        pytest.skip('msgpack не установлен')
+
+    start, separator, end, _ = FRAMING[storage_format]
+    data = start + separator.join(encode_record(record, storage_format) for record in RECORDS) + end
+
+    assert decode_records(data) == (RECORDS, storage_format)
+
+
+def test_empty_and_unknown_data():
+    assert decode_records(b' \n') == ([], None)
+    assert decode_records(FRAMING['json-compact'][3]) == ([], 'json-compact')
+
+    with pytest.raises(ValueError):
+        decode_records(b'title,link')
+
+
+def test_unknown_codec_is_rejected():
+    assert not codec.use_orjson('json')
+
+    with pytest.raises(ValueError):
+        codec.use_orjson('ujson')
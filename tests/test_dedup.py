@@ -0,0 +1,80 @@
+import pytest
+
+from tests.conftest import make_vacancy
+from utils.dedup import DedupIndex, ingest_vacancies, open_index
+
+BACKENDS = ('json', 'jsonl', 'sqlite')
+
+
+def failing_pages(pages: list[list]):
+    yield from pages
+    raise RuntimeError("обрыв загрузки")
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_only_new_vacancies_are_ingested(make_handler, backend):
+    handler = make_handler(backend)
+
+    assert ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(1)], [make_vacancy(1)]]) == 2
+    assert ingest_vacancies(handler, [[make_vacancy(1), make_vacancy(2)]]) == 1
+    assert len(handler.get_vacancies()) == 3
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_deleted_vacancies_can_be_ingested_again(make_handler, backend):
+    handler = make_handler(backend)
+    ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(1)]])
+
+    assert handler.delete_where(city='Москва') == 2
+    assert ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(1)]]) == 2
+
+    handler.delete_vacancies([make_vacancy(0)])
+    assert ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(1)]]) == 1
+
+
+def test_replaced_store_rebuilds_index(make_handler):
+    handler = make_handler('json')
+    ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(1)]])
+
+    handler.add_vacancies_stream([[make_vacancy(2)]])
+
+    assert ingest_vacancies(handler, [[make_vacancy(0), make_vacancy(2)]]) == 1
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_external_writes_are_seen_by_index(make_handler, backend):
+    handler = make_handler(backend)
+    ingest_vacancies(handler, [[make_vacancy(0)]])
+
+    make_handler(backend).add_vacancies_stream([[make_vacancy(1)]] if backend != 'json' else
+                                               [[make_vacancy(0), make_vacancy(1)]])
+
+    assert ingest_vacancies(handler, [[make_vacancy(1), make_vacancy(2)]]) == 1
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_failed_ingest_does_not_remember_unsaved_vacancies(make_handler, backend):
+    handler = make_handler(backend)
+    ingest_vacancies(handler, [[make_vacancy(0)]])
+
+    with pytest.raises(RuntimeError):
+        ingest_vacancies(handler, failing_pages([[make_vacancy(1)]]))
+
+    assert open_index(handler).signature == handler.get_signature()
+    assert ingest_vacancies(handler, [[make_vacancy(1)]]) == (0 if backend != 'json' else 1)
+    assert len(handler.get_vacancies()) == 2
+
+
+def test_fingerprints_catch_same_vacancy_on_other_platform(tmp_path):
+    index = DedupIndex(tmp_path / 'dedup.json', use_fingerprints=True)
+    copy = make_vacancy(0, link='https://superjob.ru/vakansii/0.html', title='PYTHON-разработчик 0!',
+                        source='superjob.ru')
+    same_fields = make_vacancy(0, link='https://hh.ru/vacancy/100')
+
+    assert [vacancy.link for vacancy in index.filter([make_vacancy(0), copy, same_fields, make_vacancy(1)])] == [
+        make_vacancy(0).link, same_fields.link, make_vacancy(1).link]
+    assert index.skipped == 1
+
+    index.save()
+    assert DedupIndex(tmp_path / 'dedup.json', use_fingerprints=True).is_duplicate(copy)
+    assert len(DedupIndex().filter([make_vacancy(0), copy])) == 2
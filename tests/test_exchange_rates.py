@@ -0,0 +1,82 @@
+import pytest
+import requests
+
+from utils import exchange_rates_api
+from utils.exchange_rates_api import RateProvider, normalize_currency, normalize_salaries
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    calls = []
+
+    def fetch_rates(currencies):
+        calls.append(list(currencies))
+        return {currency: 100.0 for currency in currencies}
+
+    monkeypatch.setattr(RateProvider, 'fetch_rates', staticmethod(fetch_rates))
+
+    return calls
+
+
+def test_missing_currencies_are_fetched_in_one_request(fetched):
+    provider = RateProvider(cache_path=None)
+
+    assert provider.get_rates(['usd', 'EUR', 'RUR', None]) == {'USD': 100.0, 'EUR': 100.0}
+    assert fetched == [['EUR', 'USD']]
+
+
+def test_rates_are_reused_from_memory_and_disk(fetched, tmp_path):
+    cache_path = tmp_path / 'rates.json'
+
+    RateProvider(cache_path=cache_path).get_rates(['USD'])
+    provider = RateProvider(cache_path=cache_path)
+    provider.get_rates(['USD'])
+    provider.get_rates(['USD'])
+
+    assert fetched == [['USD']]
+    assert cache_path.exists()
+
+
+def test_expired_rates_are_fetched_again(fetched, tmp_path):
+    provider = RateProvider(cache_path=tmp_path / 'rates.json', ttl=0)
+
+    provider.get_rates(['USD'])
+    provider.get_rates(['USD'])
+
+    assert fetched == [['USD'], ['USD']]
+
+
+def test_last_known_rates_are_used_when_api_fails(monkeypatch, fetched):
+    provider = RateProvider(cache_path=None, ttl=0)
+    provider.get_rates(['USD'])
+
+    def fail(currencies):
+        raise requests.ConnectionError()
+
+    monkeypatch.setattr(RateProvider, 'fetch_rates', staticmethod(fail))
+
+    assert provider.get_rates(['USD']) == {'USD': 100.0}
+
+
+def test_salaries_with_unknown_rate_become_zero():
+    salaries = [{'from': 1000, 'to': None, 'currency': 'USD'}, {'from': 50000, 'to': 70000, 'currency': 'RUR'}, None]
+
+    assert normalize_salaries(salaries, rates={'USD': 90.0}) == [
+        {'from': 90000, 'to': 0, 'currency': 'RUB'},
+        {'from': 50000, 'to': 70000, 'currency': 'RUB'},
+        None,
+    ]
+    assert normalize_salaries(salaries[:1], rates={})[0]['from'] == 0
+    assert normalize_currency('byr') == 'BYN'
+
+
+def test_page_rates_are_requested_once(monkeypatch):
+    requested = []
+    monkeypatch.setattr(exchange_rates_api, 'get_currency_rates',
+                        lambda currencies: requested.append(set(currencies)) or {'USD': 90.0, 'EUR': 100.0})
+
+    salaries = [{'from': 1, 'to': 2, 'currency': 'USD'}, {'from': 3, 'to': None, 'currency': 'eur'},
+                {'from': 4, 'to': 5, 'currency': 'USD'}]
+
+    assert [salary['from'] for salary in normalize_salaries(salaries)] == [90, 300, 360]
+    assert requested == [{'USD', 'EUR'}]
@@ -0,0 +1,159 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, sleep
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from parser.hh import HhParser
+from utils.fetch_engine import FetchEngine, RateLimiter
+
+
+class StubApi:
+    """Заглушка API hh.ru: отдает по одной вакансии на страницу и запоминает, как приходили запросы"""
+
+    def __init__(self, delay: float = 0.0, failures: dict | None = None, statuses: dict | None = None):
+        """
+        :param delay: задержка ответа в секундах
+        :param failures: {страница: сколько первых запросов завершить ответом 503}
+        :param statuses: {страница: код ответа для всех запросов}
+        """
+        self.delay = delay
+        self.failures = dict(failures or {})
+        self.statuses = statuses or {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def handle(self, page: int) -> tuple[int, dict]:
+        with self.lock:
+            self.requests.append((page, monotonic()))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        try:
+            sleep(self.delay)
+
+            with self.lock:
+                if self.failures.get(page):
+                    self.failures[page] -= 1
+                    return 503, {}
+
+            if page in self.statuses:
+                return self.statuses[page], {}
+
+            return 200, {'items': [{
+                'name': f'Вакансия {page}', 'area': {'name': 'Москва'},
+                'alternate_url': f'https://hh.ru/vacancy/{page}', 'employer': {'name': 'Компания'},
+                'salary': None, 'experience': {'name': 'Нет опыта'},
+                'snippet': {'responsibility': 'python', 'requirement': 'sql'},
+            }]}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(api: StubApi) -> str:
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                page = int(parse_qs(urlsplit(self.path).query)['page'][0])
+                status, data = api.handle(page)
+                body = json.dumps(data).encode('utf-8')
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return f'http://127.0.0.1:{server.server_address[1]}/vacancies'
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_parsers(url: str, pages: int) -> list[HhParser]:
+    return [HhParser('python', page, url=url) for page in range(pages)]
+
+
+def test_pages_are_fetched_concurrently_and_returned_in_order(serve):
+    api = StubApi(delay=0.2)
+    url = serve(api)
+    engine = FetchEngine(max_workers=4, rate_limits={})
+
+    start = monotonic()
+    pages = engine.run(make_parsers(url, 8))
+    elapsed = monotonic() - start
+
+    assert [page[0].link for page in pages] == [f'https://hh.ru/vacancy/{page}' for page in range(8)]
+    assert 2 <= api.max_active <= 4
+    assert elapsed < 8 * 0.2
+
+
+def test_failed_status_is_retried_by_session(serve):
+    api = StubApi(failures={1: 1})
+    url = serve(api)
+
+    pages = FetchEngine(max_workers=2, rate_limits={}).run(make_parsers(url, 3))
+
+    assert [len(page) for page in pages] == [1, 1, 1]
+    assert [page for page, _ in api.requests].count(1) == 2
+
+
+def test_rate_limit_spaces_requests_to_platform(serve):
+    api = StubApi()
+    url = serve(api)
+    rate = 20.0
+
+    FetchEngine(max_workers=4, rate_limits={'hh.ru': rate}).run(make_parsers(url, 6))
+
+    times = sorted(time for _, time in api.requests)
+    assert times[-1] - times[0] >= 5 / rate * 0.9
+
+
+def test_failing_page_stops_iteration_after_previous_pages(serve):
+    api = StubApi(statuses={2: 404})
+    url = serve(api)
+    received = []
+
+    with pytest.raises(ValueError, match="Нет данных"):
+        for page in FetchEngine(max_workers=2, rate_limits={}).iter_pages(make_parsers(url, 5)):
+            received.append(page)
+
+    assert len(received) == 2
+
+
+def test_rate_limiter_without_rate_does_not_wait():
+    limiter = RateLimiter(None)
+
+    assert limiter.interval == 0.0
+
+    start = monotonic()
+    for _ in range(100):
+        limiter.wait()
+
+    assert monotonic() - start < 0.1
+
+
+def test_engine_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        FetchEngine(max_workers=0)
@@ -0,0 +1,34 @@
+import pytest
+
+from file_handler.filters import compile_filters, parse_filters
+from tests.conftest import make_vacancy
+
+
+def test_conditions_are_ordered_from_cheap_to_expensive():
+    conditions = parse_filters({'text': 'python', 'description': 'django', 'salary': {'from': 1000},
+                                'city': ['Москва', 'Казань'], 'employer': 'Компания'})
+
+    assert [condition.op for condition in conditions] == ['eq', 'in', 'range', 'contains', 'text']
+    assert conditions[1].value == frozenset({'москва', 'казань'})
+
+
+def test_unknown_criterion_is_rejected():
+    with pytest.raises(ValueError):
+        parse_filters({'town': 'Москва'})
+
+
+@pytest.mark.parametrize('for_records', (False, True))
+def test_vacancies_and_records_are_checked_alike(for_records):
+    vacancies = [make_vacancy(0), make_vacancy(1, location='Казань', description='java'), make_vacancy(2)]
+    items = [vacancy.to_dict() for vacancy in vacancies] if for_records else vacancies
+
+    def matched(**keywords) -> list[int]:
+        check = compile_filters(keywords, for_records)
+        return [n for n, item in enumerate(items) if check(item)]
+
+    assert matched() == [0, 1, 2]
+    assert matched(city='москва') == [0, 2]
+    assert matched(city={'not': ['Москва']}) == [1]
+    assert matched(salary={'from': 101000, 'to': None}) == [1, 2]
+    assert matched(description=['Django', 'spring']) == [0, 2]
+    assert matched(text='python django', city={'not': 'Казань'}, salary={'to': 150000}) == [0]
@@ -0,0 +1,27 @@
+from utils import http_session
+from utils.http_session import RETRY_STATUSES, close_sessions, create_session, get_session
+
+
+def test_one_session_is_shared_per_host():
+    close_sessions()
+
+    try:
+        first = get_session('https://api.hh.ru/vacancies?page=1')
+
+        assert get_session('https://api.hh.ru/vacancies/123') is first
+        assert get_session('https://api.superjob.ru/2.0/vacancies/') is not first
+    finally:
+        close_sessions()
+
+    assert not http_session._sessions
+
+
+def test_session_has_sized_pool_and_retries():
+    session = create_session(pool_size=3, retries=2, backoff_factor=0.1)
+    adapter = session.get_adapter('https://api.hh.ru/')
+
+    assert adapter._pool_maxsize == 3
+    assert adapter.max_retries.total == 2
+    assert adapter.max_retries.backoff_factor == 0.1
+    assert set(adapter.max_retries.status_forcelist) == set(RETRY_STATUSES)
+    assert session.headers['Connection'] == 'keep-alive'
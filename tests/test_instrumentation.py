@@ -0,0 +1,47 @@
+import json
+
+from tests.conftest import make_vacancy
+from utils.instrumentation import Metrics, metrics
+
+
+def test_disabled_metrics_record_nothing():
+    collector = Metrics(enabled=False)
+
+    with collector.timer('storage.write'):
+        collector.add('storage.records_written', 10)
+
+    assert collector.summary()['timers'] == {} and collector.summary()['counters'] == {}
+
+
+def test_summary_has_throughput_and_hit_ratio(tmp_path):
+    collector = Metrics(enabled=True)
+    collector.record('storage.write', 0.5)
+    collector.record('storage.write', 1.5)
+    collector.add('storage.records_written', 100)
+    collector.add('rates.hits', 3)
+    collector.add('rates.misses')
+    collector.add('replay.hits', 0)
+
+    summary = collector.summary()
+
+    assert summary['timers']['storage.write'] == {'count': 2, 'total_s': 2.0, 'mean_ms': 1000.0, 'max_ms': 1500.0}
+    assert summary['throughput'] == {'storage.records_written_per_second': 50.0}
+    assert summary['cache'] == {'rates.hit_ratio': 0.75, 'replay.hit_ratio': None}
+    assert 'rates.hit_ratio: 0.75' in collector.format_summary()
+
+    collector.save(tmp_path / 'metrics.json')
+
+    with open(tmp_path / 'metrics.json', encoding='utf-8') as file:
+        assert json.load(file)['counters']['storage.records_written'] == 100
+
+
+def test_storage_reports_written_records(make_handler, monkeypatch):
+    monkeypatch.setattr(metrics, 'enabled', True)
+    handler = make_handler('jsonl')
+
+    handler.add_vacancies([make_vacancy(0), make_vacancy(1)])
+    handler.get_vacancies(city='Москва')
+
+    counters = metrics.summary()['counters']
+    assert counters['storage.records_written'] == 2 and counters['storage.records_matched'] == 2
+    assert metrics.summary()['timers']['storage.write']['count'] == 1
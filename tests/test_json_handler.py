@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from tests.conftest import make_vacancy
+
+
+def failing_pages(pages: list[list]):
+    yield from pages
+    raise RuntimeError("обрыв загрузки")
+
+
+def test_stream_writes_all_pages(make_handler):
+    handler = make_handler('json')
+
+    count = handler.add_vacancies_stream([[make_vacancy(0), make_vacancy(1)], [], [make_vacancy(2)]])
+
+    assert count == 3
+    assert [vacancy.link for vacancy in handler.get_vacancies()] == [make_vacancy(n).link for n in range(3)]
+
+
+def test_failed_stream_keeps_previous_file(make_handler, tmp_path):
+    handler = make_handler('json')
+    handler.add_vacancies([make_vacancy(0)])
+
+    with pytest.raises(RuntimeError):
+        handler.add_vacancies_stream(failing_pages([[make_vacancy(1)], [make_vacancy(2)]]))
+
+    assert [vacancy.link for vacancy in handler.get_vacancies()] == [make_vacancy(0).link]
+    assert sorted(os.listdir(tmp_path)) == ['vacancies.json', 'vacancies.json.lock']
+
+
+def test_failed_merge_keeps_previous_file(make_handler):
+    handler = make_handler('json')
+    handler.add_vacancies([make_vacancy(0)])
+
+    with pytest.raises(RuntimeError):
+        handler.merge_vacancies_stream(failing_pages([[make_vacancy(1)]]))
+
+    assert len(handler) == 1
+    assert handler.merge_vacancies_stream([[make_vacancy(1)], [make_vacancy(2)]]) == 2
+    assert len(handler) == 3
+
+
+def test_parsed_vacancies_are_cached_until_file_changes(make_handler):
+    handler = make_handler('json')
+    handler.add_vacancies([make_vacancy(0)])
+
+    vacancies = handler.load_vacancies()
+    assert handler.load_vacancies() is vacancies
+
+    other = make_handler('json')
+    other.add_vacancies([make_vacancy(0), make_vacancy(1)])
+
+    assert handler.load_vacancies() is not vacancies
+    assert len(handler.load_vacancies()) == 2
+
+
+def test_other_format_is_read_as_is_until_migrated(make_handler):
+    make_handler('json', storage_format='json').add_vacancies([make_vacancy(0), make_vacancy(1)])
+    handler = make_handler('json', storage_format='json-compact')
+
+    with open(handler.path, 'rb') as file:
+        indented = file.read()
+
+    assert len(handler.get_vacancies()) == 2 and handler.search_vacancies('python')
+
+    with open(handler.path, 'rb') as file:
+        assert file.read() == indented
+
+    assert handler.migrate()
+    assert not handler.migrate()
+
+    with open(handler.path, 'rb') as file:
+        assert file.read().startswith(b'[{')
+
+    assert [vacancy.link for vacancy in handler.search_vacancies('python')] == [make_vacancy(n).link for n in (0, 1)]
+
+
+def test_merge_does_not_hold_lock_while_pages_are_fetched(make_handler):
+    handler = make_handler('json')
+    handler.add_vacancies([make_vacancy(0)])
+
+    def pages():
+        yield [make_vacancy(1)]
+        assert handler.lock.mode is None
+        make_handler('json').add_vacancies([make_vacancy(0), make_vacancy(2)])
+        yield [make_vacancy(3)]
+
+    assert handler.merge_vacancies_stream(pages()) == 2
+    assert [vacancy.link for vacancy in handler.get_vacancies()] == [make_vacancy(n).link for n in (0, 2, 1, 3)]
+
+
+def test_stream_does_not_hold_lock_while_pages_are_fetched(make_handler):
+    handler = make_handler('json')
+    handler.add_vacancies([make_vacancy(0)])
+
+    def pages():
+        yield [make_vacancy(1)]
+        assert handler.lock.mode is None
+        assert len(make_handler('json').get_vacancies()) == 1
+        yield [make_vacancy(2)]
+
+    assert handler.add_vacancies_stream(pages()) == 2
+    assert [vacancy.link for vacancy in handler.get_vacancies()] == [make_vacancy(n).link for n in (1, 2)]
@@ -0,0 +1,57 @@
+import os
+
+from tests.conftest import make_vacancy
+
+
+def links(vacancies) -> list[str]:
+    return [vacancy.link for vacancy in vacancies]
+
+
+def test_pages_are_appended_to_the_end(make_handler):
+    handler = make_handler('jsonl')
+
+    assert handler.add_vacancies_stream([[make_vacancy(0)], [make_vacancy(1), make_vacancy(2)]]) == 3
+    handler.add_vacancies([make_vacancy(3)])
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in range(4))
+    assert handler.count_lines() == 4
+
+
+def test_deleted_lines_are_tombstoned_until_compaction(make_handler):
+    handler = make_handler('jsonl', compact_ratio=0.5)
+    handler.add_vacancies([make_vacancy(n, location='Казань' if n > 1 else 'Москва') for n in range(4)])
+
+    handler.delete_vacancies([make_vacancy(1)])
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in (0, 2, 3))
+    assert handler.get_tombstones() == {1}
+    assert handler.count_lines() == 4
+    assert len(handler) == 3
+
+    assert handler.delete_where(city='Казань') == 2
+
+    assert links(handler.get_vacancies()) == [make_vacancy(0).link]
+    assert handler.count_lines() == 1
+    assert not os.path.exists(handler.tombstones_path)
+
+
+def test_tombstones_left_by_interrupted_compaction_are_ignored(make_handler):
+    handler = make_handler('jsonl', compact_ratio=1)
+    handler.add_vacancies([make_vacancy(n) for n in range(4)])
+    handler.delete_vacancies([make_vacancy(0), make_vacancy(1)])
+
+    with open(handler.tombstones_path, 'rb') as file:
+        tombstones = file.read()
+
+    handler.compact()
+
+    # Сбой после замены файла данных, но до удаления файла удаленных строк
+    with open(handler.tombstones_path, 'wb') as file:
+        file.write(tombstones)
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in (2, 3))
+
+    handler.delete_vacancies([make_vacancy(3)])
+
+    assert handler.get_tombstones() == {1}
+    assert links(handler.get_vacancies()) == [make_vacancy(2).link]
@@ -0,0 +1,114 @@
+import pytest
+
+from file_handler.keyword_index import KeywordIndex, match_tokens, parse_text_query
+from tests.conftest import make_vacancy
+
+BACKENDS = ('json', 'jsonl', 'sqlite')
+
+
+def make_store(make_handler, backend: str):
+    handler = make_handler(backend)
+    handler.add_vacancies([
+        make_vacancy(0, description='Backend на python и django'),
+        make_vacancy(1, title='Java developer', description='Spring и postgresql', requirement='Знание java'),
+        make_vacancy(2, title='Аналитик данных', description='python и pandas', requirement='Знание sql'),
+    ])
+
+    return handler
+
+
+def links(vacancies) -> list[str]:
+    return [vacancy.link for vacancy in vacancies]
+
+
+def test_search_modes_and_prefix():
+    index = KeywordIndex()
+    index.add('a', {'python', 'django'})
+    index.add('b', {'java', 'spring'})
+    index.add('c', {'python', 'pandas'})
+
+    assert index.search(['python', 'django']) == {'a'}
+    assert index.search(['django', 'java'], mode='or') == {'a', 'b'}
+    assert index.search(['pan', 'py'], prefix=True) == {'c'}
+
+    index.remove(['c'])
+    assert index.search(['python']) == {'a'}
+
+
+def test_empty_query_does_not_filter():
+    index = KeywordIndex()
+    index.add('a', {'python'})
+    index.add('b', {'java'})
+
+    for mode in ('and', 'or'):
+        assert index.search([], mode) == {'a', 'b'}
+        assert match_tokens({'python'}, [], mode, False)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backends_agree_on_text_search(make_handler, backend):
+    handler = make_store(make_handler, backend)
+
+    assert links(handler.search_vacancies('python')) == links(make_vacancy(n) for n in (0, 2))
+    assert links(handler.search_vacancies('Java, pandas', mode='or')) == links(make_vacancy(n) for n in (1, 2))
+    assert links(handler.search_vacancies(['postgre'], prefix=True)) == [make_vacancy(1).link]
+    assert len(handler.search_vacancies('')) == 3
+    assert len(handler.search_vacancies([], mode='or')) == 3
+    assert len(handler.get_vacancies(text={'words': ' , '})) == 3
+
+
+@pytest.mark.parametrize('backend', ('json', 'jsonl'))
+def test_index_is_saved_and_rebuilt_when_stale(make_handler, backend):
+    handler = make_store(make_handler, backend)
+    handler.search_vacancies('python')
+
+    index = KeywordIndex(handler.index_path)
+    assert index.load() and index.signature == handler.get_signature()
+
+    make_handler(backend).delete_where(city='Москва')
+    make_handler(backend).add_vacancies([make_vacancy(3, description='python')])
+
+    assert links(handler.search_vacancies('python')) == [make_vacancy(3).link]
+
+
+def test_jsonl_index_takes_only_appended_lines(make_handler, monkeypatch):
+    handler = make_store(make_handler, 'jsonl')
+    handler.search_vacancies('python')
+
+    added = []
+    add_records = KeywordIndex.add_records
+
+    def spy(index, records):
+        records = list(records)
+        added.extend(records)
+        add_records(index, records)
+
+    monkeypatch.setattr(KeywordIndex, 'add_records', spy)
+    make_handler('jsonl').add_vacancies([make_vacancy(3, description='python и fastapi')])
+
+    assert links(handler.search_vacancies('fastapi')) == [make_vacancy(3).link]
+    assert links(make_handler('jsonl').search_vacancies('python')) == links(make_vacancy(n) for n in (0, 2, 3))
+    assert [record['link'] for record in added] == [make_vacancy(3).link]
+
+
+def test_jsonl_index_keeps_lines_appended_between_pages(make_handler):
+    handler = make_store(make_handler, 'jsonl')
+    handler.search_vacancies('python')
+
+    def pages():
+        yield [make_vacancy(3)]
+        make_handler('jsonl').add_vacancies([make_vacancy(4, description='fastapi')])
+        yield [make_vacancy(5)]
+
+    handler.add_vacancies_stream(pages())
+
+    assert links(handler.search_vacancies('fastapi')) == [make_vacancy(4).link]
+    assert links(make_handler('jsonl').search_vacancies('fastapi')) == [make_vacancy(4).link]
+
+
+def test_text_query_forms():
+    assert parse_text_query('Python, <b>Django</b>') == (['python', 'django'], 'and', False)
+    assert parse_text_query({'words': ['sql'], 'mode': 'OR', 'prefix': 1}) == (['sql'], 'or', True)
+
+    with pytest.raises(ValueError):
+        parse_text_query({'words': 'sql', 'mode': 'xor'})
@@ -0,0 +1,43 @@
+import pytest
+
+from benchmarks.payloads import record_pages
+from utils.replay import FixtureStore, ReplayResponse, fixture_store
+
+
+def test_successful_responses_are_recorded_and_replayed(tmp_path):
+    store = FixtureStore(tmp_path, enabled=True)
+    fetched = []
+
+    def fetch(status_code: int = 200):
+        fetched.append(status_code)
+        return ReplayResponse(status_code, 'https://api.hh.ru/vacancies', '{"items": ["вакансия"]}')
+
+    store.get('https://api.hh.ru/vacancies', {'page': 1}, lambda: fetch(503))
+    response = store.get('https://api.hh.ru/vacancies', {'page': 1}, fetch)
+    replayed = store.get('https://api.hh.ru/vacancies', {'page': '1'}, fetch)
+
+    assert fetched == [503, 200]
+    assert (replayed.status_code, replayed.json()) == (200, response.json())
+    assert replayed.content == '{"items": ["вакансия"]}'.encode('utf-8')
+
+
+def test_strict_and_disabled_modes(tmp_path):
+    store = FixtureStore(tmp_path, enabled=True, strict=True)
+
+    with pytest.raises(ValueError):
+        store.get('https://api.hh.ru/vacancies', {}, lambda: pytest.fail('запрос в строгом режиме'))
+
+    store.enabled = False
+    assert store.get('https://api.hh.ru/vacancies', {}, lambda: 'из сети') == 'из сети'
+
+
+@pytest.mark.parametrize('platform', ('hh.ru', 'superjob.ru'))
+def test_parsers_read_recorded_pages_offline(tmp_path, monkeypatch, platform):
+    for name, value in (('path', tmp_path), ('enabled', True), ('strict', True)):
+        monkeypatch.setattr(fixture_store, name, value)
+
+    parsers = record_pages(fixture_store, platform, 'python', 120)
+
+    key = 'items' if platform == 'hh.ru' else 'objects'
+
+    assert [len(parser.get_data()[key]) for parser in parsers] == [50, 50, 20]
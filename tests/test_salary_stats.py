@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from tests.conftest import make_vacancy
+from utils.salary_stats import P2Quantile, SalaryStats, exact_quantile, salary_report
+
+
+def test_exact_quantile_interpolates():
+    assert exact_quantile([10, 20, 30, 40], 0.5) == 25
+    assert exact_quantile([10, 20, 30, 40], 0.25) == 17.5
+    assert exact_quantile([7], 0.75) == 7
+
+
+def test_p2_estimate_is_close_to_exact_quantile():
+    generator = random.Random(7)
+    values = [generator.lognormvariate(11, 0.5) for _ in range(5000)]
+    sketch = P2Quantile(0.75)
+
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.value == pytest.approx(exact_quantile(sorted(values), 0.75), rel=0.02)
+
+
+def test_small_groups_are_exact_in_both_modes():
+    for approximate in (False, True):
+        stats = SalaryStats(approximate)
+
+        for value in (300, 100, 200):
+            stats.add(value)
+
+        assert stats.summary() == {'count': 3, 'mean': 200, 'min': 100, 'p25': 150, 'median': 200, 'p75': 250,
+                                   'max': 300}
+
+
+def test_report_groups_by_dimension_and_skips_empty_salaries():
+    vacancies = [make_vacancy(0, salary={'from': 100000, 'to': 0}), make_vacancy(1, salary=None),
+                 make_vacancy(2, location='Казань', salary={'from': 50000, 'to': 70000}),
+                 make_vacancy(3, salary={'from': 0, 'to': 200000})]
+
+    report = salary_report(vacancies, ['location'])
+
+    assert list(report['location']) == ['Москва', 'Казань']
+    assert report['location']['Москва']['count'] == 2 and report['location']['Москва']['median'] == 150000
+    assert report['location']['Казань']['mean'] == 60000
+
+    with pytest.raises(ValueError):
+        salary_report(vacancies, ['title'])
@@ -0,0 +1,76 @@
+import pytest
+
+from tests.conftest import make_vacancy
+from utils.scheduler import Checkpoint, Job, JobScheduler
+
+QUERIES = ('python', 'java')
+
+
+class FakeEngine:
+    """Вместо запросов к API отдает по странице на каждый парсер и запоминает запрошенные страницы"""
+
+    def __init__(self, empty_from: dict | None = None, fail_on: tuple | None = None):
+        self.empty_from = empty_from or {}
+        self.fail_on = fail_on
+        self.requested = []
+
+    def iter_pages(self, parsers):
+        for parser in parsers:
+            task = (parser.params['text'], parser.params['page'])
+
+            if task == self.fail_on:
+                raise ConnectionError("сеть недоступна")
+
+            self.requested.append(task)
+            query, page = task
+
+            yield [] if page >= self.empty_from.get(query, 99) else [
+                make_vacancy(100 * QUERIES.index(query) + 10 * page + n) for n in range(2)]
+
+
+def make_jobs(pages: int = 3) -> list[Job]:
+    return [Job(query, ('hh',), pages) for query in QUERIES]
+
+
+def test_pages_are_interleaved_and_budget_is_deferred(make_handler, tmp_path):
+    handler = make_handler('jsonl')
+    engine = FakeEngine()
+    scheduler = JobScheduler(handler, engine, Checkpoint(tmp_path / 'checkpoint.json'), {'hh': 4}, batch_pages=2)
+
+    assert scheduler.run(make_jobs()) == {'hh.ru|python': 4, 'hh.ru|java': 4}
+    assert engine.requested == [('python', 0), ('java', 0), ('python', 1), ('java', 1)]
+    assert scheduler.deferred == {'hh.ru': 2}
+
+    engine = FakeEngine()
+    scheduler = JobScheduler(handler, engine, Checkpoint(tmp_path / 'checkpoint.json'), {'hh': 4}, batch_pages=2)
+
+    assert scheduler.run(make_jobs()) == {'hh.ru|python': 2, 'hh.ru|java': 2}
+    assert engine.requested == [('python', 2), ('java', 2)]
+    assert not (tmp_path / 'checkpoint.json').exists()
+    assert len(handler) == 12
+
+
+def test_empty_page_stops_query(make_handler):
+    engine = FakeEngine(empty_from={'python': 1})
+    scheduler = JobScheduler(make_handler('json'), engine, Checkpoint(None), {}, batch_pages=1)
+
+    scheduler.run(make_jobs())
+
+    assert ('python', 2) not in engine.requested
+    assert engine.requested.count(('java', 2)) == 1
+
+
+def test_interrupted_run_resumes_after_last_saved_batch(make_handler, tmp_path):
+    handler = make_handler('json')
+    engine = FakeEngine(fail_on=('python', 1))
+
+    with pytest.raises(ConnectionError):
+        JobScheduler(handler, engine, Checkpoint(tmp_path / 'checkpoint.json'), {}, batch_pages=2).run(make_jobs(2))
+
+    engine = FakeEngine()
+    scheduler = JobScheduler(handler, engine, Checkpoint(tmp_path / 'checkpoint.json'), {}, batch_pages=2)
+    result = scheduler.run(make_jobs(2))
+
+    assert engine.requested == [('python', 1), ('java', 1)]
+    assert result == {'hh.ru|python': 2, 'hh.ru|java': 2}
+    assert len(handler) == 8
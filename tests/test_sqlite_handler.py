@@ -0,0 +1,55 @@
+from tests.conftest import make_vacancy
+
+
+def links(vacancies) -> list[str]:
+    return [vacancy.link for vacancy in vacancies]
+
+
+def test_filters_run_as_indexed_queries(make_handler):
+    handler = make_handler('sqlite')
+    handler.add_vacancies_stream([[make_vacancy(0), make_vacancy(1, location='Казань')], [make_vacancy(2)]])
+
+    assert len(handler) == 3
+    assert links(handler.get_vacancies(city='москва')) == links(make_vacancy(n) for n in (0, 2))
+    assert links(handler.get_vacancies(salary={'from': 101000})) == links(make_vacancy(n) for n in (1, 2))
+    assert links(handler.get_vacancies(city={'not': 'Москва'})) == [make_vacancy(1).link]
+
+    where, params = handler.build_where({'city': 'Москва'})
+    plan = handler.connection.execute(f"EXPLAIN QUERY PLAN SELECT * FROM vacancies{where}", params).fetchall()
+    assert 'idx_vacancies_location' in str(plan)
+
+
+def test_delete_by_vacancies_and_by_filters(make_handler):
+    handler = make_handler('sqlite')
+    handler.add_vacancies([make_vacancy(n, source='superjob.ru' if n % 2 else 'hh.ru') for n in range(5)])
+
+    handler.delete_vacancies([make_vacancy(0)])
+    assert handler.delete_where(source='superjob.ru') == 2
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in (2, 4))
+
+
+def test_text_search_runs_on_token_table(make_handler):
+    handler = make_handler('sqlite')
+    handler.add_vacancies([make_vacancy(0, description='python и django'),
+                           make_vacancy(1, title='Java-разработчик', description='java'),
+                           make_vacancy(2, description='python и pandas')])
+
+    assert links(handler.get_vacancies(text='python', city={'not': 'Казань'})) == links(make_vacancy(n) for n in (0, 2))
+    assert links(handler.get_vacancies(text={'not': 'python'})) == [make_vacancy(1).link]
+    assert handler.top_by_salary(1, text={'words': 'pan', 'prefix': True}) == [make_vacancy(2)]
+
+    where, params = handler.build_where({'text': 'python django'})
+    plan = handler.connection.execute(f"EXPLAIN QUERY PLAN SELECT * FROM vacancies{where}", params).fetchall()
+    assert 'vacancy_tokens' in str(plan) and 'SCAN vacancy_tokens' not in str(plan)
+
+    assert handler.delete_where(text='django') == 1
+    assert handler.connection.execute("SELECT count(*) FROM vacancy_tokens WHERE token = 'django'").fetchone() == (0,)
+
+
+def test_token_table_is_filled_for_existing_database(make_handler):
+    handler = make_handler('sqlite')
+    handler.add_vacancies([make_vacancy(0, description='python'), make_vacancy(1, title='Java', description='java')])
+    handler.connection.executescript("DROP TABLE vacancy_tokens")
+
+    assert links(make_handler('sqlite').search_vacancies('java')) == [make_vacancy(1).link]
@@ -0,0 +1,69 @@
+import pytest
+
+from tests.conftest import make_vacancy
+
+BACKENDS = ('json', 'jsonl', 'sqlite')
+
+
+def links(vacancies) -> list[str]:
+    return [vacancy.link for vacancy in vacancies]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_top_by_salary_returns_best_paid_first(make_handler, backend):
+    handler = make_handler(backend)
+    salaries = [(50000, 70000), (0, 300000), (120000, 0), (200000, 260000), (0, 0)]
+    handler.add_vacancies([make_vacancy(n, salary={'from': low, 'to': high}, location='Казань' if n == 1 else 'Москва')
+                           for n, (low, high) in enumerate(salaries)])
+
+    assert links(handler.top_by_salary(3)) == links(make_vacancy(n) for n in (1, 3, 2))
+    assert links(handler.top_by_salary(2, city='Москва')) == links(make_vacancy(n) for n in (3, 2))
+    assert handler.top_by_salary(0) == []
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_delete_where_removes_matching_records(make_handler, backend):
+    handler = make_handler(backend)
+    handler.add_vacancies([make_vacancy(n, employer='Банк' if n % 2 else 'Компания') for n in range(6)])
+
+    assert handler.delete_where(employer='банк', salary={'from': 102000}) == 2
+    assert handler.delete_where(city='Казань') == 0
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in (0, 1, 2, 4))
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_delete_vacancies_by_key(make_handler, backend):
+    handler = make_handler(backend)
+    handler.add_vacancies([make_vacancy(0), make_vacancy(1), make_vacancy(2, link='')])
+
+    handler.delete_vacancies([make_vacancy(0, title='Другое название'), make_vacancy(2, link='')])
+
+    assert links(handler.get_vacancies()) == [make_vacancy(1).link]
+
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_replace_keeps_only_new_vacancies(make_handler, backend):
+    handler = make_handler(backend)
+    handler.add_vacancies([make_vacancy(n) for n in range(3)])
+    handler.delete_vacancies([make_vacancy(1)])
+
+    def failing_pages():
+        yield [make_vacancy(5)]
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        handler.replace_vacancies_stream(failing_pages())
+
+    assert links(handler.get_vacancies()) == links(make_vacancy(n) for n in (0, 2))
+
+    for _ in range(2):
+        assert handler.replace_vacancies_stream([[make_vacancy(3)], [make_vacancy(0, description='fastapi')]]) == 2
+
+    assert links(make_handler(backend).get_vacancies()) == links(make_vacancy(n) for n in (3, 0))
+    assert links(handler.search_vacancies('fastapi')) == [make_vacancy(0).link]
+
+def test_key_is_link_or_identity_fields():
+    assert make_vacancy(0).key == 'https://hh.ru/vacancy/0'
+    assert make_vacancy(0, link='').key == 'hh.ru|Python-разработчик 0|Компания|Москва'
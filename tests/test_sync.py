@@ -0,0 +1,63 @@
+import os
+from datetime import datetime, timezone
+
+from tests.conftest import make_vacancy
+from utils.sync import SyncState, sync_vacancies
+
+
+class FakeEngine:
+    """Вместо запросов к API отдает заранее заданные страницы и запоминает параметры запросов"""
+
+    def __init__(self, pages: list[list]):
+        self.pages = pages
+        self.params = []
+
+    def fetch(self, parser) -> list:
+        self.params.append(parser.params)
+        page = parser.params['page']
+
+        return self.pages[page] if page < len(self.pages) else []
+
+
+def test_second_sync_fetches_only_newer_vacancies(make_handler, tmp_path):
+    handler = make_handler('jsonl')
+    state = SyncState(tmp_path / 'sync_state.json')
+    first = FakeEngine([[make_vacancy(0), make_vacancy(1)], [make_vacancy(2)]])
+
+    assert sync_vacancies(handler, ['hh'], 'Python', 5, state=state, engine=first) == {'hh.ru': 3}
+    assert [params['page'] for params in first.params] == [0, 1, 2]
+    assert 'date_from' not in first.params[0]
+
+    state = SyncState(tmp_path / 'sync_state.json')
+    second = FakeEngine([[make_vacancy(3), make_vacancy(0)], [make_vacancy(1)]])
+
+    assert sync_vacancies(handler, ['hh'], 'python ', 5, state=state, engine=second) == {'hh.ru': 1}
+    assert [params['page'] for params in second.params] == [0]
+    assert second.params[0]['order_by'] == 'publication_time'
+    assert state.get_seen('python', 'hh.ru') == {make_vacancy(n).key for n in range(4)}
+    assert len(handler) == 4
+
+
+def test_seen_keys_are_limited_to_newest():
+    state = SyncState(None, seen_limit=2)
+    synced_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    state.update('python', 'hh', synced_at, ['a', 'b'])
+    state.update('python', 'hh', synced_at, ['c'])
+
+    assert state.get_seen('Python', 'hh.ru') == {'c', 'a'}
+    assert state.get_last_sync('python', 'sj') is None
+
+
+def test_sync_state_belongs_to_its_store(make_handler):
+    first = make_handler('jsonl')
+    other = make_handler('json')
+    pages = [[make_vacancy(0), make_vacancy(1)]]
+
+    assert sync_vacancies(first, ['hh'], 'python', 5, engine=FakeEngine(pages)) == {'hh.ru': 2}
+
+    engine = FakeEngine(pages)
+
+    assert sync_vacancies(other, ['hh'], 'python', 5, engine=engine) == {'hh.ru': 2}
+    assert 'date_from' not in engine.params[0]
+    assert os.path.exists(first.path + '.sync.json') and os.path.exists(other.path + '.sync.json')
@@ -0,0 +1,36 @@
+from tests.conftest import make_vacancy
+from vacancy import Vacancy
+
+
+def test_salary_is_parsed_to_numbers():
+    assert Vacancy.parse_salary({'from': '1000', 'to': None, 'currency': 'USD'}) == (1000, 0, 'USD')
+    assert Vacancy.parse_salary('1500.5 -> 2000 EUR') == (1500.5, 2000, 'EUR')
+    assert Vacancy.parse_salary('100000 -> 0') == (100000, 0, 'RUB')
+    assert Vacancy.parse_salary(None) == (0, 0, 'RUB')
+    assert Vacancy.to_number(2000.0) == 2000 and isinstance(Vacancy.to_number(2000.0), int)
+
+
+def test_salary_key_is_middle_of_range_or_single_bound():
+    assert make_vacancy(salary={'from': 100000, 'to': 200000}).salary_key == 150000
+    assert make_vacancy(salary={'from': 0, 'to': 90000}).salary_key == 90000
+    assert make_vacancy(salary=None).salary_key == 0
+
+
+def test_salary_survives_round_trip_through_record():
+    vacancy = make_vacancy(salary={'from': 1000, 'to': 2000, 'currency': 'USD'})
+    vacancy.validate({'USD': 90.0})
+
+    restored = Vacancy.from_record(dict(vacancy.to_dict()))
+
+    assert (restored.salary_from, restored.salary_to, restored.currency) == (90000, 180000, 'RUB')
+    assert restored.original_salary == (1000, 2000, 'USD')
+
+
+def test_record_is_not_shared_with_caller():
+    record = make_vacancy(salary={'from': 1000, 'to': 2000, 'currency': 'USD'}).to_dict()
+    record['original_salary'] = '1000 -> 2000 USD'
+
+    restored = Vacancy.from_record(record)
+    record['title'] = 'Изменено'
+
+    assert restored.to_dict()['title'] == restored.title != 'Изменено'
@@ -0,0 +1,64 @@
+import pytest
+
+from tests.conftest import make_vacancy
+
+np = pytest.importorskip('numpy')
+from vacancy_table import VacancyTable  # noqa: E402
+
+
+def make_table() -> VacancyTable:
+    return VacancyTable.from_vacancies([
+        make_vacancy(0, location='Казань', salary={'from': 100000, 'to': 0}),
+        make_vacancy(1, description='java', salary={'from': 300000, 'to': 0}),
+        make_vacancy(2, salary=None),
+        make_vacancy(3, location='Казань', salary={'from': 200000, 'to': 0}),
+    ])
+
+
+def links(table: VacancyTable) -> list[str]:
+    return list(table['link'])
+
+
+def test_table_filters_like_storage():
+    table = make_table()
+
+    assert links(table.filter(city='КАЗАНЬ')) == links(table.take(np.array([0, 3])))
+    assert links(table.filter(city={'not': 'казань'}, description='python')) == [make_vacancy(2).link]
+    assert len(table.filter(salary={'from': 150000})) == 2
+    assert len(table.filter()) == 4
+
+
+def test_sort_and_top_by_salary():
+    table = make_table()
+
+    assert links(table.sort_by('salary_key', reverse=True)) == [make_vacancy(n).link for n in (1, 3, 0, 2)]
+    assert links(table.top_by_salary(2)) == [make_vacancy(n).link for n in (1, 3)]
+    assert list(table.sort_by('location')['location']) == ['Казань', 'Казань', 'Москва', 'Москва']
+
+    with pytest.raises(ValueError):
+        table.sort_by('title')
+
+
+def test_group_by_skips_empty_salaries():
+    groups = make_table().group_by('location')
+
+    assert groups['Казань']['count'] == 2 and groups['Казань']['median'] == 150000
+    assert groups['Москва'] == {'count': 1, 'mean': 300000, 'min': 300000, 'p25': 300000, 'median': 300000,
+                                'p75': 300000, 'max': 300000}
+
+
+def test_round_trip_to_vacancies():
+    vacancies = make_table().to_vacancies()
+
+    assert [vacancy.link for vacancy in vacancies] == [make_vacancy(n).link for n in range(4)]
+    assert (vacancies[3].location, vacancies[3].salary_from) == ('Казань', 200000)
+
+
+def test_original_salary_is_kept():
+    vacancy = make_vacancy(0, salary={'from': 1000, 'to': 2000, 'currency': 'USD'})
+    vacancy.validate({'USD': 90.0})
+
+    restored = VacancyTable.from_vacancies([vacancy]).filter(salary={'from': 50000}).to_vacancies()[0]
+
+    assert restored.original_salary == (1000, 2000, 'USD')
+    assert restored.to_dict() == vacancy.to_dict()
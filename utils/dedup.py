@@ -0,0 +1,222 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from file_handler.base import FileHandler
+from settings import DEDUP_FINGERPRINTS
+from utils.file_lock import atomic_write
+from vacancy import Vacancy
+
+
+class DedupIndex:
+
+    __non_word = re.compile(r'[\W_]+')
+
+    def __init__(self, path: Path | str | None = None, use_fingerprints: bool = DEDUP_FINGERPRINTS):
+        """
+        Конструктор класса DedupIndex.
+
+        Индекс хранит ключи уже полученных вакансий (ссылка на вакансию) и, при необходимости,
+        отпечатки из нормализованных названия, работодателя и города с платформами, на которых они
+        встречались. По отпечатку дублем считается только вакансия с другой платформы: разные вакансии
+        одной платформы с одинаковыми названием, работодателем и городом различаются ссылками.
+        Вместе с индексом сохраняется отпечаток хранилища (FileHandler.get_signature), по которому он построен.
+        :param path: путь к файлу индекса (None - индекс только в памяти)
+        :param use_fingerprints: учитывать ли одинаковые вакансии с разных платформ
+        """
+        self.__path = Path(path) if path is not None else None
+        self.__use_fingerprints = use_fingerprints
+        self.__keys = set()
+        self.__fingerprints = {}
+        self.__skipped = 0
+        self.__signature = None
+        self.load()
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def skipped(self) -> int:
+        return self.__skipped
+
+    @property
+    def signature(self) -> tuple | None:
+        return self.__signature
+
+    @signature.setter
+    def signature(self, value: tuple | None):
+        self.__signature = tuple(value) if value else None
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    @classmethod
+    def fingerprint(cls, vacancy: Vacancy) -> str:
+        """
+        Метод для вычисления отпечатка вакансии из нормализованных названия, работодателя и города
+        :param vacancy: объект класса Vacancy
+        :return: отпечаток вакансии
+        """
+        parts = (vacancy.title, vacancy.employer, vacancy.location)
+
+        return '|'.join(cls.__non_word.sub(' ', part.lower()).strip() for part in parts)
+
+    def is_duplicate(self, vacancy: Vacancy) -> bool:
+        """
+        Метод для проверки, есть ли вакансия в индексе
+        :param vacancy: объект класса Vacancy
+        :return: True, если такая вакансия уже встречалась, иначе False
+        """
+        if vacancy.key in self.__keys:
+            return True
+
+        if not self.__use_fingerprints:
+            return False
+
+        sources = self.__fingerprints.get(self.fingerprint(vacancy), ())
+
+        return any(source != vacancy.source for source in sources)
+
+    def add(self, vacancy: Vacancy):
+        """
+        Метод для добавления вакансии в индекс.
+        :param vacancy: объект класса Vacancy
+        :return: None
+        """
+        self.__keys.add(vacancy.key)
+
+        if self.__use_fingerprints:
+            self.__fingerprints.setdefault(self.fingerprint(vacancy), set()).add(vacancy.source)
+
+    def filter(self, vacancies: Iterable[Vacancy]) -> list[Vacancy]:
+        """
+        Метод для отбора вакансий, которых еще нет в индексе. Отобранные вакансии добавляются в индекс.
+        :param vacancies: итерируемый объект с объектами класса Vacancy
+        :return: список новых вакансий
+        """
+        result = []
+
+        for vacancy in vacancies:
+            if self.is_duplicate(vacancy):
+                self.__skipped += 1
+                continue
+
+            self.add(vacancy)
+            result.append(vacancy)
+
+        return result
+
+    def filter_pages(self, pages: Iterable[list]) -> Iterator[list]:
+        """
+        Генератор, который убирает дубли из каждой страницы по мере ее получения.
+        :param pages: итерируемый объект со списками объектов класса Vacancy
+        :return: списки новых вакансий по одной странице
+        """
+        for page in pages:
+            yield self.filter(page)
+
+    def rebuild(self, vacancies: Iterable[Vacancy]):
+        """
+        Метод для заполнения индекса заново по вакансиям из хранилища.
+        :param vacancies: итерируемый объект с объектами класса Vacancy
+        :return: None
+        """
+        self.__keys.clear()
+        self.__fingerprints.clear()
+
+        for vacancy in vacancies:
+            self.add(vacancy)
+
+    def load(self):
+        """
+        Метод для загрузки индекса из файла.
+        :return: None
+        """
+        if self.__path is None or not self.__path.exists():
+            return
+
+        with open(self.__path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        self.__keys.update(data.get('keys', []))
+        fingerprints = data.get('fingerprints', {})
+
+        # Отпечатки без платформ (список) нельзя проверить, поэтому такой индекс строится заново
+        if isinstance(fingerprints, list):
+            return
+
+        self.__fingerprints.update((fingerprint, set(sources)) for fingerprint, sources in fingerprints.items())
+        self.signature = data.get('signature')
+
+    def save(self):
+        """
+        Метод для сохранения индекса в файл.
+        :return: None
+        """
+        if self.__path is None:
+            return
+
+        data = {'keys': sorted(self.__keys),
+                'fingerprints': {fingerprint: sorted(sources) for fingerprint, sources in self.__fingerprints.items()},
+                'signature': self.__signature}
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+        with atomic_write(self.__path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+
+
+def open_index(file_handler: FileHandler) -> DedupIndex:
+    """
+    Функция для открытия индекса дублей, который хранится рядом с файлом данных.
+
+    Если файла индекса еще нет или хранилище менялось после его построения (вакансии удалены,
+    хранилище перезаписано или дописано без этого индекса), индекс заполняется заново вакансиями из хранилища
+    :param file_handler: объект для работы с файлом данных
+    :return: объект класса DedupIndex
+    """
+    index = DedupIndex(file_handler.path + '.dedup.json')
+    signature = file_handler.get_signature()
+
+    if signature is None or index.signature != signature:
+        index.rebuild(file_handler.iter_vacancies() if os.path.exists(file_handler.path) else ())
+        index.signature = signature
+
+    return index
+
+
+def save_index(index: DedupIndex, file_handler: FileHandler, is_complete: bool = True):
+    """
+    Функция для сохранения индекса дублей после записи новых вакансий в хранилище.
+    :param index: индекс дублей
+    :param file_handler: объект для работы с файлом данных
+    :param is_complete: False - запись прервалась, и при следующем открытии индекс строится заново
+    :return: None
+    """
+    index.signature = file_handler.get_signature() if is_complete else None
+    index.save()
+
+
+def ingest_vacancies(file_handler: FileHandler, pages: Iterable[list], index: DedupIndex | None = None) -> int:
+    """
+    Функция для добавления в хранилище только тех вакансий, которых в нем еще нет
+    :param file_handler: объект для работы с файлом данных
+    :param pages: итерируемый объект со списками объектов класса Vacancy
+    :param index: индекс дублей (по умолчанию открывается индекс хранилища)
+    :return: кол-во добавленных вакансий
+    """
+    if index is None:
+        index = open_index(file_handler)
+
+    try:
+        count = file_handler.merge_vacancies_stream(index.filter_pages(pages))
+    except BaseException:
+        save_index(index, file_handler, is_complete=False)
+        raise
+
+    save_index(index, file_handler)
+
+    return count
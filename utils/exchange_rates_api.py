@@ -1,19 +1,195 @@
 import json
 import os
+import threading
+from pathlib import Path
+from time import time
 
 import requests
 
-from settings import API_URL_EXCH_RATES
+from settings import API_URL_EXCH_RATES, EXCH_RATES_CACHE_PATH, EXCH_RATES_CACHE_TTL, HTTP_TIMEOUT
+from utils.file_lock import atomic_write
+from utils.http_session import get_session
+from utils.instrumentation import metrics
+from utils.replay import fixture_store
+from vacancy import Vacancy
 
 API_KEY: str = os.getenv('EXCHANGE_RATES_API_KEY')
+BASE_CURRENCY = 'RUB'
+BASE_ALIASES = ('RUB', 'RUR')
+# Устаревшие коды валют, которые до сих пор отдают API (hh.ru: RUR - рубль, BYR - белорусский рубль после деноминации)
+CURRENCY_ALIASES = {'RUR': 'RUB', 'BYR': 'BYN'}
+
+
+def normalize_currency(currency: str | None) -> str:
+    """
+    Функция для приведения кода валюты к актуальному коду ISO 4217
+    :param currency: код валюты (None - рубли)
+    :return: код валюты в верхнем регистре
+    """
+    currency = (currency or BASE_CURRENCY).upper()
+
+    return CURRENCY_ALIASES.get(currency, currency)
+
+
+class RateProvider:
+
+    def __init__(self, cache_path: Path | None = EXCH_RATES_CACHE_PATH, ttl: float = EXCH_RATES_CACHE_TTL):
+        """
+        Конструктор класса RateProvider.
+
+        Курсы хранятся в памяти процесса и в файле на диске, чтобы не запрашивать их
+        заново для каждой страницы и при каждом запуске программы.
+        :param cache_path: путь к файлу с курсами (None - без кэша на диске)
+        :param ttl: время актуальности курсов в секундах
+        """
+        self.__cache_path = cache_path
+        self.__ttl = ttl
+        self.__rates = {}
+        self.__lock = threading.Lock()
+        self.__load_cache()
+
+    @property
+    def cache_path(self):
+        return self.__cache_path
+
+    @property
+    def ttl(self):
+        return self.__ttl
+
+    def __load_cache(self):
+        """
+        Метод для загрузки курсов из файла на диске.
+        :return: None
+        """
+        if self.__cache_path is None or not self.__cache_path.exists():
+            return
+
+        try:
+            with open(self.__cache_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        for currency, entry in data.items():
+            self.__rates[currency] = (float(entry['rate']), float(entry['timestamp']))
+
+    def __save_cache(self):
+        """
+        Метод для сохранения курсов в файл на диске.
+        :return: None
+        """
+        if self.__cache_path is None:
+            return
+
+        data = {currency: {'rate': rate, 'timestamp': timestamp}
+                for currency, (rate, timestamp) in self.__rates.items()}
+
+        try:
+            self.__cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with atomic_write(self.__cache_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, indent=4)
+        except OSError:
+            pass
+
+    def __is_fresh(self, currency: str, now: float) -> bool:
+        return currency in self.__rates and now - self.__rates[currency][1] < self.__ttl
+
+    @staticmethod
+    def fetch_rates(currencies: list[str]) -> dict[str, float]:
+        """
+        Метод для получения курсов нескольких валют от API одним запросом (в локальном режиме - из записанного ответа).
+        :param currencies: список кодов валют
+        :return: словарь {валюта: стоимость в рублях}
+        """
+        params = {'base': BASE_CURRENCY, 'symbols': ','.join(currencies)}
+        response = fixture_store.get(API_URL_EXCH_RATES, params, lambda: get_session(API_URL_EXCH_RATES).get(
+            API_URL_EXCH_RATES, headers={'apikey': API_KEY}, params=params, timeout=HTTP_TIMEOUT))
+        response_data = json.loads(response.text)
+
+        return {currency: 1 / rate for currency, rate in response_data["rates"].items()
+                if currency in currencies and rate}
+
+    def get_rates(self, currencies) -> dict[str, float]:
+        """
+        Метод для получения курсов валют к рублю.
+
+        Недостающие или устаревшие курсы запрашиваются одним запросом. Если API недоступен,
+        используются последние известные курсы.
+        :param currencies: коды валют
+        :return: словарь {валюта: стоимость в рублях}
+        """
+        currencies = {normalize_currency(currency) for currency in currencies if currency} - set(BASE_ALIASES)
+
+        with self.__lock:
+            now = time()
+            missing = sorted(currency for currency in currencies if not self.__is_fresh(currency, now))
+            metrics.add('rates.hits', len(currencies) - len(missing))
+
+            if missing:
+                metrics.add('rates.misses', len(missing))
+
+                try:
+                    with metrics.timer('rates.fetch'):
+                        fetched = self.fetch_rates(missing)
+                except (requests.RequestException, ValueError, KeyError, TypeError):
+                    fetched = {}
+
+                if fetched:
+                    for currency, rate in fetched.items():
+                        self.__rates[currency] = (rate, now)
+
+                    self.__save_cache()
+
+            return {currency: self.__rates[currency][0] for currency in currencies if currency in self.__rates}
+
+
+rate_provider = RateProvider()
+
+
+def get_currency_rates(currencies) -> dict[str, float]:
+    """Получает курсы нескольких валют и возвращает их в виде словаря {валюта: курс}"""
+
+    return rate_provider.get_rates(currencies)
 
 
 def get_currency_rate(currency: str) -> float:
     """Получает курс валюты от API и возвращает его в виде float"""
 
-    url = API_URL_EXCH_RATES
-    response = requests.get(url, headers={'apikey': API_KEY}, params={'base': currency})
-    response_data = json.loads(response.text)
-    rate = response_data["rates"]["RUB"]
+    currency = normalize_currency(currency)
+
+    if currency in BASE_ALIASES:
+        return 1.0
+
+    return get_currency_rates([currency])[currency]
+
+
+def normalize_salaries(salaries: list[dict | None], rates: dict[str, float] | None = None) -> list[dict | None]:
+    """
+    Функция для перевода в рубли зарплат всей страницы вакансий по одной таблице курсов.
+
+    Курсы всех валют страницы запрашиваются один раз. Если курс валюты неизвестен, зарплата
+    в рублях считается неуказанной (0), чтобы она не сравнивалась с рублевыми как есть
+    :param salaries: список зарплат {'from', 'to', 'currency'} или None
+    :param rates: таблица курсов {валюта: стоимость в рублях} (по умолчанию запрашивается у rate_provider)
+    :return: список зарплат в рублях {'from', 'to', 'currency': 'RUB'} или None в том же порядке
+    """
+    currencies = [normalize_currency(salary.get('currency')) if salary else BASE_CURRENCY for salary in salaries]
+
+    if rates is None:
+        rates = get_currency_rates(set(currencies))
+
+    rates = {**rates, BASE_CURRENCY: 1.0}
+    normalized = []
+
+    for salary, currency in zip(salaries, currencies):
+        if salary is None:
+            normalized.append(None)
+            continue
+
+        rate = rates.get(currency, 0)
+        normalized.append({'from': Vacancy.to_number(Vacancy.to_number(salary.get('from')) * rate),
+                           'to': Vacancy.to_number(Vacancy.to_number(salary.get('to')) * rate),
+                           'currency': BASE_CURRENCY})
 
-    return rate
+    return normalized
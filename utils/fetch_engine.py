@@ -0,0 +1,125 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from typing import Iterator
+
+from parser.base import Parser
+from settings import FETCH_MAX_WORKERS, FETCH_RATE_LIMITS
+
+
+class RateLimiter:
+
+    def __init__(self, rate: float | None):
+        """
+        Конструктор класса RateLimiter.
+        :param rate: допустимое кол-во запросов в секунду (None или 0 - без ограничений)
+        """
+        self.__interval = 1 / rate if rate else 0.0
+        self.__next_time = 0.0
+        self.__lock = threading.Lock()
+
+    @property
+    def interval(self):
+        return self.__interval
+
+    def wait(self):
+        """
+        Метод для ожидания, пока не станет можно отправить следующий запрос.
+        Потокобезопасен: каждый вызов резервирует себе отдельный временной слот.
+        :return: None
+        """
+        if not self.__interval:
+            return
+
+        with self.__lock:
+            now = monotonic()
+            start = max(now, self.__next_time)
+            self.__next_time = start + self.__interval
+
+        delay = start - now
+
+        if delay > 0:
+            sleep(delay)
+
+
+class FetchEngine:
+
+    def __init__(self, max_workers: int = FETCH_MAX_WORKERS, rate_limits: dict | None = None):
+        """
+        Конструктор класса FetchEngine.
+        :param max_workers: максимальное кол-во одновременных запросов
+        :param rate_limits: словарь {платформа: запросов в секунду}
+        """
+        if max_workers < 1:
+            raise ValueError(f"Неверное кол-во потоков: {max_workers}")
+
+        self.__max_workers = max_workers
+        self.__rate_limits = FETCH_RATE_LIMITS if rate_limits is None else rate_limits
+        self.__limiters = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def max_workers(self):
+        return self.__max_workers
+
+    def get_limiter(self, platform: str) -> RateLimiter:
+        """
+        Метод для возвращения ограничителя частоты запросов для платформы.
+        :param platform: название платформы
+        :return: объект класса RateLimiter
+        """
+        with self.__lock:
+            if platform not in self.__limiters:
+                self.__limiters[platform] = RateLimiter(self.__rate_limits.get(platform))
+
+            return self.__limiters[platform]
+
+    def fetch(self, parser: Parser) -> list:
+        """
+        Метод для обработки одной страницы с учетом ограничения частоты запросов платформы.
+        :param parser: объект класса Parser для одной страницы
+        :return: список объектов класса Vacancy
+        """
+        self.get_limiter(parser.platform).wait()
+
+        return parser.parse_data()
+
+    def iter_pages(self, parsers: list[Parser]) -> Iterator[list]:
+        """
+        Генератор, который одновременно обрабатывает страницы и отдает их в порядке parsers.
+
+        Одновременно в работе находится не больше max_workers страниц, поэтому в памяти
+        хранятся только они, а не весь результат.
+        :param parsers: список объектов класса Parser
+        :return: списки вакансий по одной странице
+        """
+        if not parsers:
+            return
+
+        workers = min(self.__max_workers, len(parsers))
+        parsers = iter(parsers)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(self.fetch, parser) for _, parser in zip(range(workers), parsers))
+
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    parser = next(parsers, None)
+
+                    if parser is not None:
+                        pending.append(executor.submit(self.fetch, parser))
+
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def run(self, parsers: list[Parser]) -> list[list]:
+        """
+        Метод для одновременной обработки страниц.
+        :param parsers: список объектов класса Parser
+        :return: списки вакансий в том же порядке, что и parsers
+        """
+        return list(self.iter_pages(parsers))
@@ -0,0 +1,165 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def fsync_directory(directory: str):
+    """
+    Функция для сброса на диск записи каталога (нужно, чтобы переименование файла пережило сбой питания).
+    :param directory: путь к каталогу
+    :return: None
+    """
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def atomic_write(path: str | os.PathLike, mode: str = "wb", encoding: str | None = None) -> Iterator:
+    """
+    Контекстный менеджер для атомарной записи файла.
+
+    Данные пишутся во временный файл в том же каталоге, сбрасываются на диск и только после этого
+    заменяют исходный файл через os.replace. Если запись прервется ошибкой или сбоем, исходный файл
+    останется прежним, а читатели, уже открывшие файл, дочитают его старую версию.
+    :param path: путь к файлу
+    :param mode: режим записи ("wb" или "w")
+    :param encoding: кодировка для текстового режима
+    :return: файловый объект временного файла
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+
+    try:
+        os.chmod(temp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+
+        with os.fdopen(descriptor, mode, encoding=encoding) as file:
+            yield file
+
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+        raise
+
+    fsync_directory(directory)
+
+
+class FileLock:
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        Конструктор класса FileLock.
+
+        Рекомендательная блокировка через flock на отдельном файле <файл данных>.lock: общая (shared)
+        для чтения и монопольная (exclusive) для записи. Блокировка повторно входима в пределах объекта,
+        а монопольная внутри общей временно повышает ее. Без fcntl (Windows) блокировки между процессами
+        не выполняются, остается только блокировка между потоками.
+        :param path: путь к файлу блокировки
+        """
+        self.__path = os.fspath(path)
+        self.__thread_lock = threading.RLock()
+        self.__file = None
+        self.__mode = None
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def mode(self) -> str | None:
+        return self.__mode
+
+    def acquire(self, exclusive: bool) -> str | None:
+        """
+        Метод для захвата блокировки.
+        :param exclusive: True - монопольная, False - общая
+        :return: режим блокировки до захвата (передается в release)
+        """
+        self.__thread_lock.acquire()
+        previous = self.__mode
+
+        try:
+            if previous is None or (exclusive and previous == 'shared'):
+                if self.__file is None:
+                    self.__file = open(self.__path, "a+b")
+
+                if fcntl is not None:
+                    fcntl.flock(self.__file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+                self.__mode = 'exclusive' if exclusive else 'shared'
+        except BaseException:
+            self.release(previous)
+            raise
+
+        return previous
+
+    def release(self, previous: str | None):
+        """
+        Метод для освобождения блокировки или возврата к режиму, который был до захвата.
+        :param previous: режим блокировки до захвата (результат acquire)
+        :return: None
+        """
+        try:
+            if previous is None and self.__file is not None:
+                if fcntl is not None:
+                    fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+
+                self.__file.close()
+                self.__file = None
+                self.__mode = None
+            elif previous is not None and previous != self.__mode:
+                if fcntl is not None:
+                    fcntl.flock(self.__file.fileno(), fcntl.LOCK_SH)
+
+                self.__mode = previous
+        finally:
+            self.__thread_lock.release()
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """
+        Контекстный менеджер общей блокировки (для чтения).
+        :return: None
+        """
+        previous = self.acquire(exclusive=False)
+
+        try:
+            yield
+        finally:
+            self.release(previous)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """
+        Контекстный менеджер монопольной блокировки (для записи).
+        :return: None
+        """
+        previous = self.acquire(exclusive=True)
+
+        try:
+            yield
+        finally:
+            self.release(previous)
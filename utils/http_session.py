@@ -0,0 +1,66 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from settings import HTTP_BACKOFF_FACTOR, HTTP_POOL_SIZE, HTTP_RETRIES
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions: dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE, retries: int = HTTP_RETRIES,
+                   backoff_factor: float = HTTP_BACKOFF_FACTOR) -> requests.Session:
+    """
+    Функция для создания HTTP-сессии с пулом соединений и повторами запросов.
+    :param pool_size: кол-во соединений, которые держатся открытыми для одного хоста
+    :param retries: кол-во повторов при ошибках 429/5xx и обрывах соединения
+    :param backoff_factor: множитель экспоненциальной задержки между повторами
+    :return: объект requests.Session
+    """
+    retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=frozenset(['GET']), respect_retry_after_header=True,
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """
+    Функция для получения общей HTTP-сессии для хоста из url.
+
+    Сессия создается один раз и переиспользуется всеми запросами к этому хосту,
+    поэтому TCP- и TLS-соединения не устанавливаются заново для каждой страницы.
+    :param url: адрес, к которому будет отправлен запрос
+    :return: объект requests.Session
+    """
+    parts = urlsplit(url)
+    host = f'{parts.scheme}://{parts.netloc}'
+
+    with _lock:
+        if host not in _sessions:
+            _sessions[host] = create_session()
+
+        return _sessions[host]
+
+
+def close_sessions():
+    """
+    Функция для закрытия всех открытых HTTP-сессий.
+    :return: None
+    """
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+
+        _sessions.clear()
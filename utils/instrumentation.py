@@ -0,0 +1,203 @@
+import cProfile
+import json
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from typing import TextIO
+
+from settings import INSTRUMENTATION
+from utils.file_lock import atomic_write
+
+# Счетчики, для которых в сводке считается скорость по времени таймера: {счетчик: таймер}
+THROUGHPUT = {
+    'http.bytes': 'http.request',
+    'parser.records': 'parser.parse_items',
+    'storage.records_written': 'storage.write',
+    'storage.bytes_written': 'storage.write',
+    'storage.records_matched': 'storage.scan',
+}
+
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+
+    __slots__ = ('__metrics', '__name', '__start')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.__metrics = metrics
+        self.__name = name
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.__metrics.record(self.__name, perf_counter() - self.__start)
+
+
+class Metrics:
+
+    def __init__(self, enabled: bool = INSTRUMENTATION):
+        """
+        Конструктор класса Metrics.
+
+        Хранит таймеры (кол-во замеров, суммарное и максимальное время) и счетчики этапов загрузки
+        и хранения вакансий. Пока сбор выключен, timer возвращает общий пустой контекстный менеджер,
+        а add сразу возвращается, поэтому точки замера почти ничего не стоят.
+        Потокобезопасен: страницы разбираются в потоках FetchEngine.
+        :param enabled: включен ли сбор метрик
+        """
+        self.__enabled = enabled
+        self.__timers = {}
+        self.__counters = Counter()
+        self.__lock = threading.Lock()
+        self.__started = perf_counter()
+
+    @property
+    def enabled(self):
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        if value and not self.__enabled:
+            self.reset()
+
+        self.__enabled = value
+
+    def timer(self, name: str):
+        """
+        Метод для замера времени блока with
+        :param name: название таймера (например, http.request)
+        :return: контекстный менеджер
+        """
+        return _Timer(self, name) if self.__enabled else _NULL_TIMER
+
+    def record(self, name: str, seconds: float):
+        """
+        Метод для добавления замера времени в таймер.
+        :param name: название таймера
+        :param seconds: время в секундах
+        :return: None
+        """
+        with self.__lock:
+            stats = self.__timers.get(name)
+
+            if stats is None:
+                self.__timers[name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def add(self, name: str, value: int = 1):
+        """
+        Метод для увеличения счетчика.
+        :param name: название счетчика (например, http.bytes)
+        :param value: на сколько увеличить
+        :return: None
+        """
+        if not self.__enabled:
+            return
+
+        with self.__lock:
+            self.__counters[name] += value
+
+    def reset(self):
+        """
+        Метод для сброса всех таймеров и счетчиков.
+        :return: None
+        """
+        with self.__lock:
+            self.__timers.clear()
+            self.__counters.clear()
+            self.__started = perf_counter()
+
+    def summary(self) -> dict:
+        """
+        Метод для получения сводки: таймеры, счетчики, скорость обработки и доля попаданий в кэш.
+        :return: словарь со сводкой
+        """
+        with self.__lock:
+            timers = {name: {'count': count, 'total_s': total, 'mean_ms': total / count * 1000, 'max_ms': peak * 1000}
+                      for name, (count, total, peak) in sorted(self.__timers.items())}
+            counters = dict(sorted(self.__counters.items()))
+            elapsed = perf_counter() - self.__started
+
+        throughput = {f'{counter}_per_second': counters[counter] / timers[timer]['total_s']
+                      for counter, timer in THROUGHPUT.items()
+                      if counter in counters and timer in timers and timers[timer]['total_s']}
+
+        hit_ratios = {}
+
+        for name, hits in counters.items():
+            if name.endswith('.hits'):
+                prefix = name[:-len('.hits')]
+                total = hits + counters.get(f'{prefix}.misses', 0)
+                hit_ratios[f'{prefix}.hit_ratio'] = hits / total if total else None
+
+        return {'elapsed_s': elapsed, 'timers': timers, 'counters': counters, 'throughput': throughput,
+                'cache': hit_ratios}
+
+    def format_summary(self) -> str:
+        """
+        Метод для получения сводки в виде текста для вывода в журнал
+        :return: строки сводки
+        """
+        summary = self.summary()
+        lines = [f"Метрики за {summary['elapsed_s']:.2f} с:"]
+
+        for name, stats in summary['timers'].items():
+            lines.append(f"  {name}: {stats['count']} раз, всего {stats['total_s']:.3f} с, "
+                         f"среднее {stats['mean_ms']:.2f} мс, макс {stats['max_ms']:.2f} мс")
+
+        for name, value in summary['counters'].items():
+            lines.append(f"  {name}: {value}")
+
+        for name, value in {**summary['throughput'], **summary['cache']}.items():
+            lines.append(f"  {name}: {'-' if value is None else f'{value:.2f}'}")
+
+        return '\n'.join(lines)
+
+    def save(self, path: Path | str):
+        """
+        Метод для сохранения сводки в JSON-файл.
+        :param path: путь к файлу
+        :return: None
+        """
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=4)
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def profile(path: Path | str | None = None, limit: int = 25, stream: TextIO = sys.stderr):
+    """
+    Контекстный менеджер для профилирования блока with через cProfile.
+
+    Профилируется только текущий поток: разбор страниц в потоках FetchEngine в профиль не попадает,
+    его время видно в таймерах metrics
+    :param path: файл для статистики в формате pstats (None - не сохранять)
+    :param limit: сколько самых затратных по суммарному времени функций вывести
+    :param stream: куда вывести статистику
+    :return: объект cProfile.Profile
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+        if path is not None:
+            profiler.dump_stats(str(path))
+
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
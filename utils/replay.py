@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlencode
+
+import requests
+
+from settings import REPLAY_PATH, REPLAY_STRICT, USE_LOCAL_DATA
+from utils.file_lock import atomic_write
+from utils.instrumentation import metrics
+
+
+class ReplayResponse:
+
+    def __init__(self, status_code: int, url: str, body: str):
+        """
+        Конструктор класса ReplayResponse.
+
+        Записанный ответ API с теми же атрибутами и методами, что у requests.Response,
+        которые используют парсеры и RateProvider: status_code, url, text, content и json()
+        :param status_code: код ответа
+        :param url: адрес запроса
+        :param body: тело ответа
+        """
+        self.__status_code = status_code
+        self.__url = url
+        self.__text = body
+
+    @property
+    def status_code(self) -> int:
+        return self.__status_code
+
+    @property
+    def url(self) -> str:
+        return self.__url
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    @property
+    def content(self) -> bytes:
+        return self.__text.encode('utf-8')
+
+    def json(self):
+        """
+        Метод для разбора тела ответа как JSON
+        :return: данные ответа
+        """
+        return json.loads(self.__text)
+
+
+class FixtureStore:
+
+    def __init__(self, path: Path = REPLAY_PATH, enabled: bool = USE_LOCAL_DATA, strict: bool = REPLAY_STRICT):
+        """
+        Конструктор класса FixtureStore.
+
+        В локальном режиме ответы API хранятся в сжатых файлах <sha256 от адреса и параметров>.json.gz.
+        Если ответ уже записан, он отдается из файла без обращения к сети, иначе запрашивается
+        и записывается (в строгом режиме вместо запроса выбрасывается ошибка). Заголовки запроса
+        в ключ не входят, поэтому ключи API в файлы не попадают.
+        :param path: каталог с записанными ответами
+        :param enabled: включен ли локальный режим (False - все запросы отправляются в сеть)
+        :param strict: True - не обращаться к сети, если ответ не записан
+        """
+        self.__path = Path(path)
+        self.__enabled = enabled
+        self.__strict = strict
+
+    @property
+    def path(self):
+        return self.__path
+
+    @path.setter
+    def path(self, value: Path | str):
+        self.__path = Path(value)
+
+    @property
+    def enabled(self):
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self.__enabled = value
+
+    @property
+    def strict(self):
+        return self.__strict
+
+    @strict.setter
+    def strict(self, value: bool):
+        self.__strict = value
+
+    @staticmethod
+    def make_key(url: str, params: dict | None) -> str:
+        """
+        Метод для вычисления ключа ответа по адресу и параметрам запроса (порядок параметров не важен)
+        :param url: адрес запроса
+        :param params: параметры запроса
+        :return: шестнадцатеричная строка sha256
+        """
+        query = urlencode(sorted((key, str(value)) for key, value in (params or {}).items()))
+
+        return hashlib.sha256(f'{url}?{query}'.encode('utf-8')).hexdigest()
+
+    def get_fixture_path(self, url: str, params: dict | None) -> Path:
+        return self.__path / f'{self.make_key(url, params)}.json.gz'
+
+    def load(self, url: str, params: dict | None) -> ReplayResponse | None:
+        """
+        Метод для чтения записанного ответа.
+        :param url: адрес запроса
+        :param params: параметры запроса
+        :return: объект класса ReplayResponse или None, если ответ не записан
+        """
+        path = self.get_fixture_path(url, params)
+
+        if not path.exists():
+            return None
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            fixture = json.load(file)
+
+        return ReplayResponse(fixture['status_code'], fixture['url'], fixture['body'])
+
+    def save(self, url: str, params: dict | None, response: requests.Response | ReplayResponse):
+        """
+        Метод для записи ответа в сжатый файл.
+        :param url: адрес запроса
+        :param params: параметры запроса
+        :param response: ответ API (нужны status_code и text)
+        :return: None
+        """
+        fixture = {'url': url, 'params': params, 'status_code': response.status_code, 'body': response.text}
+
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+        with atomic_write(self.get_fixture_path(url, params)) as file:
+            file.write(gzip.compress(json.dumps(fixture, ensure_ascii=False).encode('utf-8')))
+
+    def get(self, url: str, params: dict | None,
+            fetch: Callable[[], requests.Response]) -> requests.Response | ReplayResponse:
+        """
+        Метод для получения ответа API: из файла в локальном режиме, иначе запросом.
+
+        Записываются только успешные ответы (200), чтобы временная ошибка API не сохранилась навсегда
+        :param url: адрес запроса
+        :param params: параметры запроса
+        :param fetch: функция, которая отправляет запрос
+        :return: объект requests.Response или ReplayResponse (записанный ответ)
+        """
+        if not self.__enabled:
+            return fetch()
+
+        response = self.load(url, params)
+
+        if response is not None:
+            metrics.add('replay.hits')
+            return response
+
+        metrics.add('replay.misses')
+
+        if self.__strict:
+            raise ValueError(f"Нет записанного ответа для {url} с параметрами {params}")
+
+        response = fetch()
+
+        if response.status_code == 200:
+            self.save(url, params, response)
+
+        return response
+
+
+fixture_store = FixtureStore()
@@ -0,0 +1,195 @@
+import math
+from typing import Iterable
+
+from vacancy import Vacancy
+
+DIMENSIONS = ('location', 'employer', 'experience', 'source')
+QUANTILES = {'p25': 0.25, 'median': 0.5, 'p75': 0.75}
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    """
+    Функция для вычисления квантиля отсортированного списка с линейной интерполяцией
+    :param values: отсортированный список значений
+    :param q: уровень квантиля от 0 до 1
+    :return: значение квантиля
+    """
+    position = (len(values) - 1) * q
+    low, high = math.floor(position), math.ceil(position)
+
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+class P2Quantile:
+
+    def __init__(self, q: float):
+        """
+        Конструктор класса P2Quantile.
+
+        Приближенная оценка квантиля алгоритмом P² (Jain, Chlamtac): хранит только пять
+        маркеров, поэтому занимает O(1) памяти независимо от кол-ва значений.
+        :param q: уровень квантиля от 0 до 1
+        """
+        self.__q = q
+        self.__heights = []
+        self.__positions = [0, 1, 2, 3, 4]
+        self.__desired = [0, 2 * q, 4 * q, 2 + 2 * q, 4]
+        self.__increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, value: float):
+        """
+        Метод для учета очередного значения.
+        :param value: значение
+        :return: None
+        """
+        heights = self.__heights
+
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        for i in range(cell + 1, 5):
+            self.__positions[i] += 1
+
+        for i in range(5):
+            self.__desired[i] += self.__increments[i]
+
+        for i in range(1, 4):
+            self.adjust(i)
+
+    def adjust(self, i: int):
+        """
+        Метод для сдвига маркера i к его желаемой позиции.
+        :param i: номер маркера
+        :return: None
+        """
+        heights, positions = self.__heights, self.__positions
+        delta = self.__desired[i] - positions[i]
+
+        if not ((delta >= 1 and positions[i + 1] - positions[i] > 1)
+                or (delta <= -1 and positions[i - 1] - positions[i] < -1)):
+            return
+
+        step = 1 if delta > 0 else -1
+        left, right = positions[i] - positions[i - 1], positions[i + 1] - positions[i]
+        height = heights[i] + step / (left + right) * (
+            (left + step) * (heights[i + 1] - heights[i]) / right
+            + (right - step) * (heights[i] - heights[i - 1]) / left
+        )
+
+        if not heights[i - 1] < height < heights[i + 1]:
+            height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+
+        heights[i] = height
+        positions[i] += step
+
+    @property
+    def value(self) -> float:
+        if len(self.__heights) < 5:
+            return exact_quantile(sorted(self.__heights), self.__q) if self.__heights else 0.0
+
+        return self.__heights[2]
+
+
+class SalaryStats:
+
+    def __init__(self, approximate: bool = False):
+        """
+        Конструктор класса SalaryStats.
+
+        Накопитель статистики зарплат одной группы: кол-во, среднее, минимум, максимум и квантили.
+        :param approximate: True - квантили оцениваются алгоритмом P² без хранения значений
+        """
+        self.__count = 0
+        self.__total = 0.0
+        self.__min = math.inf
+        self.__max = -math.inf
+        self.__values = None if approximate else []
+        self.__sketches = {name: P2Quantile(q) for name, q in QUANTILES.items()} if approximate else None
+
+    def add(self, value: float):
+        """
+        Метод для учета зарплаты.
+        :param value: зарплата
+        :return: None
+        """
+        self.__count += 1
+        self.__total += value
+        self.__min = min(self.__min, value)
+        self.__max = max(self.__max, value)
+
+        if self.__values is not None:
+            self.__values.append(value)
+        else:
+            for sketch in self.__sketches.values():
+                sketch.add(value)
+
+    def summary(self) -> dict:
+        """
+        Метод для получения итоговой статистики группы
+        :return: словарь {'count', 'mean', 'min', 'p25', 'median', 'p75', 'max'}
+        """
+        result = {'count': self.__count, 'mean': self.__total / self.__count, 'min': self.__min}
+
+        if self.__values is not None:
+            values = sorted(self.__values)
+            result.update({name: exact_quantile(values, q) for name, q in QUANTILES.items()})
+        else:
+            result.update({name: sketch.value for name, sketch in self.__sketches.items()})
+
+        result['max'] = self.__max
+
+        return result
+
+
+def salary_report(vacancies: Iterable[Vacancy], dimensions: Iterable[str] = DIMENSIONS,
+                  approximate: bool = False) -> dict[str, dict[str, dict]]:
+    """
+    Функция для расчета статистики зарплат по группам за один проход по вакансиям.
+
+    Учитываются только вакансии с указанной зарплатой; зарплата вакансии - середина вилки (Vacancy.salary_key)
+    :param vacancies: итерируемый объект с объектами класса Vacancy (например, FileHandler.iter_vacancies())
+    :param dimensions: поля для группировки (location, employer, experience, source)
+    :param approximate: True - приближенные квантили без хранения всех зарплат (для больших наборов)
+    :return: словарь {поле: {значение поля: статистика}}, группы упорядочены по убыванию кол-ва вакансий
+    """
+    dimensions = tuple(dimensions)
+
+    for dimension in dimensions:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Неверное поле для группировки: {dimension}")
+
+    groups = {dimension: {} for dimension in dimensions}
+
+    for vacancy in vacancies:
+        salary = vacancy.salary_key
+
+        if not salary:
+            continue
+
+        for dimension in dimensions:
+            group = getattr(vacancy, dimension)
+            stats = groups[dimension].get(group)
+
+            if stats is None:
+                stats = groups[dimension][group] = SalaryStats(approximate)
+
+            stats.add(salary)
+
+    report = {}
+
+    for dimension, dimension_groups in groups.items():
+        summaries = {group: stats.summary() for group, stats in dimension_groups.items()}
+        report[dimension] = dict(sorted(summaries.items(), key=lambda item: item[1]['count'], reverse=True))
+
+    return report
@@ -0,0 +1,262 @@
+import json
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from file_handler.base import FileHandler
+from parser.factory import create_parser, normalize_platform
+from settings import SCHEDULER_BATCH_PAGES, SCHEDULER_BUDGETS, SCHEDULER_CHECKPOINT_PATH
+from utils.dedup import DedupIndex, open_index, save_index
+from utils.fetch_engine import FetchEngine
+from utils.file_lock import atomic_write
+from utils.sync import SyncState
+
+
+class Job(NamedTuple):
+    query: str
+    platforms: tuple[str, ...]
+    pages: int
+
+
+class Task(NamedTuple):
+    query: str
+    platform: str
+    page: int
+
+
+def load_jobs(path: Path | str) -> list[Job]:
+    """
+    Функция для чтения списка заданий из JSON-файла вида [{"query": ..., "platforms": [...], "pages": ...}]
+    :param path: путь к файлу с заданиями
+    :return: список объектов класса Job
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    if not isinstance(data, list):
+        raise ValueError(f"Файл заданий {path} должен содержать список")
+
+    jobs = []
+
+    for item in data:
+        if not isinstance(item, dict) or not item.get('query'):
+            raise ValueError(f"Неверное задание: {item}")
+
+        platforms = item.get('platforms', ['hh.ru', 'superjob.ru'])
+
+        if isinstance(platforms, str):
+            platforms = platforms.split(',')
+
+        jobs.append(Job(item['query'], tuple(platforms), int(item.get('pages', 1))))
+
+    return jobs
+
+
+class Checkpoint:
+
+    def __init__(self, path: Path | None = SCHEDULER_CHECKPOINT_PATH):
+        """
+        Конструктор класса Checkpoint.
+
+        Для каждой пары (запрос, платформа) хранятся номера страниц, которые уже записаны в хранилище,
+        и признак того, что у запроса на платформе закончились вакансии.
+        :param path: путь к файлу с отметками (None - отметки только в памяти)
+        """
+        self.__path = path
+        self.__entries = {}
+
+        if self.__path is not None and self.__path.exists():
+            with open(self.__path, "r", encoding="utf-8") as file:
+                self.__entries = json.load(file)
+
+    @property
+    def path(self):
+        return self.__path
+
+    def __bool__(self) -> bool:
+        return bool(self.__entries)
+
+    def is_done(self, task: Task) -> bool:
+        """
+        Метод для проверки, нужно ли пропустить страницу
+        :param task: объект класса Task
+        :return: True, если страница уже записана или вакансии по запросу закончились раньше
+        """
+        entry = self.__entries.get(SyncState.make_id(task.query, task.platform))
+
+        if entry is None:
+            return False
+
+        return task.page in entry['done'] or entry['last_page'] is not None and task.page > entry['last_page']
+
+    def mark_done(self, task: Task, is_empty: bool):
+        """
+        Метод для отметки записанной страницы.
+        :param task: объект класса Task
+        :param is_empty: True, если на странице не было вакансий (следующие страницы тоже будут пустыми)
+        :return: None
+        """
+        entry = self.__entries.setdefault(SyncState.make_id(task.query, task.platform),
+                                          {'done': [], 'last_page': None})
+        entry['done'].append(task.page)
+
+        if is_empty and (entry['last_page'] is None or task.page < entry['last_page']):
+            entry['last_page'] = task.page
+
+    def save(self):
+        """
+        Метод для сохранения отметок в файл.
+        :return: None
+        """
+        if self.__path is None:
+            return
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+        with atomic_write(self.__path, "w", encoding="utf-8") as file:
+            json.dump(self.__entries, file, ensure_ascii=False, indent=4)
+
+    def clear(self):
+        """
+        Метод для удаления всех отметок и файла с ними.
+        :return: None
+        """
+        self.__entries = {}
+
+        if self.__path is not None and self.__path.exists():
+            self.__path.unlink()
+
+
+class JobScheduler:
+
+    def __init__(self, file_handler: FileHandler, engine: FetchEngine | None = None,
+                 checkpoint: Checkpoint | None = None, budgets: dict | None = None,
+                 batch_pages: int = SCHEDULER_BATCH_PAGES):
+        """
+        Конструктор класса JobScheduler.
+
+        Страницы всех заданий перемешиваются (первые страницы всех запросов и платформ, затем вторые и т.д.)
+        и загружаются одним пулом FetchEngine, поэтому ограничения частоты запросов общие для всех заданий.
+        Страницы записываются в хранилище пачками по batch_pages без дублей, после каждой пачки
+        сохраняются отметки, и прерванный запуск продолжается со следующей незаписанной страницы.
+        :param file_handler: объект для работы с хранилищем
+        :param engine: объект класса FetchEngine (по умолчанию создается новый)
+        :param checkpoint: отметки обработанных страниц (по умолчанию читаются из SCHEDULER_CHECKPOINT_PATH)
+        :param budgets: словарь {платформа: максимальное кол-во запросов за запуск} (None - без ограничений)
+        :param batch_pages: кол-во страниц, которые записываются в хранилище за один раз
+        """
+        if batch_pages < 1:
+            raise ValueError(f"Неверный размер пачки страниц: {batch_pages}")
+
+        self.__file_handler = file_handler
+        self.__engine = engine if engine is not None else FetchEngine()
+        self.__checkpoint = checkpoint if checkpoint is not None else Checkpoint()
+        self.__budgets = {normalize_platform(platform): limit
+                          for platform, limit in (SCHEDULER_BUDGETS if budgets is None else budgets).items()}
+        self.__batch_pages = batch_pages
+        self.__requests = Counter()
+        self.__deferred = Counter()
+
+    @property
+    def checkpoint(self):
+        return self.__checkpoint
+
+    @property
+    def requests(self) -> dict[str, int]:
+        return dict(self.__requests)
+
+    @property
+    def deferred(self) -> dict[str, int]:
+        return dict(self.__deferred)
+
+    def iter_tasks(self, jobs: list[Job]) -> Iterator[Task]:
+        """
+        Генератор, который отдает страницы всех заданий вперемешку, пропуская уже записанные страницы
+        и страницы сверх бюджета платформы.
+
+        Отметки проверяются в момент выдачи страницы, поэтому после пустой страницы запроса
+        его следующие страницы в новые пачки не попадают
+        :param jobs: список объектов класса Job
+        :return: объекты класса Task
+        """
+        jobs = [job._replace(platforms=tuple(dict.fromkeys(map(normalize_platform, job.platforms))))
+                for job in jobs]
+        seen = set()
+
+        for page in range(max((job.pages for job in jobs), default=0)):
+            for job in jobs:
+                if page >= job.pages:
+                    continue
+
+                for platform in job.platforms:
+                    task = Task(job.query.strip(), platform, page)
+                    task_id = (SyncState.make_id(task.query, platform), page)
+
+                    if task_id in seen or self.__checkpoint.is_done(task):
+                        continue
+
+                    seen.add(task_id)
+                    limit = self.__budgets.get(platform)
+
+                    if limit is not None and self.__requests[platform] >= limit:
+                        self.__deferred[platform] += 1
+                        continue
+
+                    self.__requests[platform] += 1
+                    yield task
+
+    def run_batch(self, tasks: list[Task], index: DedupIndex, result: Counter):
+        """
+        Метод для загрузки пачки страниц и записи новых вакансий в хранилище.
+        :param tasks: список объектов класса Task
+        :param index: индекс дублей хранилища
+        :param result: счетчик добавленных вакансий по парам (запрос, платформа)
+        :return: None
+        """
+        pages = self.__engine.iter_pages([create_parser(task.platform, task.query, task.page) for task in tasks])
+        fetched = []
+
+        def filter_pages() -> Iterator[list]:
+            for task, page in zip(tasks, pages):
+                new = index.filter(page)
+                result[SyncState.make_id(task.query, task.platform)] += len(new)
+                fetched.append((task, not page))
+
+                yield new
+
+        self.__file_handler.merge_vacancies_stream(filter_pages())
+
+        for task, is_empty in fetched:
+            self.__checkpoint.mark_done(task, is_empty)
+
+    def run(self, jobs: list[Job]) -> dict[str, int]:
+        """
+        Метод для выполнения заданий.
+
+        Если загрузка прервалась, индекс дублей сохраняется без отпечатка хранилища (при следующем запуске
+        он строится заново по хранилищу), а отметки остаются на последней записанной пачке. Когда все страницы записаны,
+        отметки удаляются; если часть страниц отложена из-за бюджета, они остаются до следующего запуска
+        :param jobs: список объектов класса Job
+        :return: словарь {'платформа|запрос': кол-во добавленных вакансий}
+        """
+        self.__requests.clear()
+        self.__deferred.clear()
+
+        index = open_index(self.__file_handler)
+        tasks = self.iter_tasks(jobs)
+        result = Counter()
+
+        try:
+            while batch := list(islice(tasks, self.__batch_pages)):
+                self.run_batch(batch, index, result)
+                save_index(index, self.__file_handler)
+                self.__checkpoint.save()
+        except BaseException:
+            save_index(index, self.__file_handler, is_complete=False)
+            raise
+
+        if not self.__deferred:
+            self.__checkpoint.clear()
+
+        return dict(result)
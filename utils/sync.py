@@ -0,0 +1,161 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+from file_handler.base import FileHandler
+from parser.factory import create_parser, normalize_platform
+from settings import SYNC_OVERLAP, SYNC_SEEN_LIMIT
+from utils.dedup import DedupIndex, ingest_vacancies
+from utils.fetch_engine import FetchEngine
+from utils.file_lock import atomic_write
+
+
+class SyncState:
+
+    def __init__(self, path: Path | None = None, seen_limit: int = SYNC_SEEN_LIMIT):
+        """
+        Конструктор класса SyncState.
+
+        Для каждой пары (запрос, платформа) хранится время последней синхронизации
+        и ключи последних полученных вакансий. Состояние относится к одному хранилищу (см. open_state):
+        вакансии, записанные в другое хранилище, в этом не пропускаются.
+        :param path: путь к файлу состояния (None - состояние только в памяти)
+        :param seen_limit: сколько последних ключей вакансий хранить для каждой пары
+        """
+        self.__path = path
+        self.__seen_limit = seen_limit
+        self.__entries = {}
+
+        if self.__path is not None and self.__path.exists():
+            with open(self.__path, "r", encoding="utf-8") as file:
+                self.__entries = json.load(file)
+
+    @staticmethod
+    def make_id(query: str, platform: str) -> str:
+        return f'{normalize_platform(platform)}|{query.strip().lower()}'
+
+    def get_last_sync(self, query: str, platform: str) -> datetime | None:
+        """
+        Метод для получения времени последней синхронизации
+        :param query: поисковый запрос
+        :param platform: название платформы
+        :return: время последней синхронизации или None, если ее еще не было
+        """
+        entry = self.__entries.get(self.make_id(query, platform))
+
+        return datetime.fromisoformat(entry['last_sync']) if entry else None
+
+    def get_seen(self, query: str, platform: str) -> set[str]:
+        """
+        Метод для получения ключей уже полученных вакансий
+        :param query: поисковый запрос
+        :param platform: название платформы
+        :return: множество ключей вакансий
+        """
+        entry = self.__entries.get(self.make_id(query, platform))
+
+        return set(entry['seen']) if entry else set()
+
+    def update(self, query: str, platform: str, synced_at: datetime, new_keys: list[str]):
+        """
+        Метод для сохранения результата синхронизации пары (запрос, платформа).
+        :param query: поисковый запрос
+        :param platform: название платформы
+        :param synced_at: время начала синхронизации
+        :param new_keys: ключи новых вакансий от новых к старым
+        :return: None
+        """
+        entry_id = self.make_id(query, platform)
+        seen = self.__entries.get(entry_id, {}).get('seen', [])
+        seen = list(dict.fromkeys(new_keys + seen))[:self.__seen_limit]
+
+        self.__entries[entry_id] = {'last_sync': synced_at.isoformat(), 'seen': seen}
+
+    def save(self):
+        """
+        Метод для сохранения состояния в файл.
+        :return: None
+        """
+        if self.__path is None:
+            return
+
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+        with atomic_write(self.__path, "w", encoding="utf-8") as file:
+            json.dump(self.__entries, file, ensure_ascii=False, indent=4)
+
+
+def open_state(file_handler: FileHandler) -> SyncState:
+    """
+    Функция для открытия состояния синхронизации, которое хранится рядом с файлом данных
+    :param file_handler: объект для работы с файлом данных
+    :return: объект класса SyncState
+    """
+    return SyncState(Path(file_handler.path + '.sync.json'))
+
+
+def iter_new_pages(platform: str, query: str, max_pages: int, date_from: datetime | None, seen: set[str],
+                   engine: FetchEngine, new_keys: list[str]) -> Iterator[list]:
+    """
+    Генератор, который запрашивает страницы от новых вакансий к старым и останавливается,
+    как только встречает уже известные вакансии или пустую страницу.
+    :param platform: название платформы
+    :param query: поисковый запрос
+    :param max_pages: максимальное кол-во страниц
+    :param date_from: запрашивать только вакансии, опубликованные после этой даты
+    :param seen: ключи уже полученных вакансий
+    :param engine: объект класса FetchEngine (ограничивает частоту запросов)
+    :param new_keys: список, в который дописываются ключи новых вакансий
+    :return: списки новых вакансий по одной странице
+    """
+    for page in range(max_pages):
+        vacancies = engine.fetch(create_parser(platform, query, page, date_from=date_from))
+        new = [vacancy for vacancy in vacancies if vacancy.key not in seen]
+
+        new_keys.extend(vacancy.key for vacancy in new)
+
+        if new:
+            yield new
+
+        if len(new) < len(vacancies) or not vacancies:
+            break
+
+
+def sync_vacancies(file_handler: FileHandler, platforms: list, query: str, max_pages: int,
+                   state: SyncState | None = None, engine: FetchEngine | None = None,
+                   index: DedupIndex | None = None) -> dict[str, int]:
+    """
+    Функция для инкрементальной синхронизации: запрашивает только вакансии, опубликованные
+    после прошлой синхронизации, и добавляет в хранилище только новые
+    :param file_handler: объект для работы с файлом данных
+    :param platforms: список платформ
+    :param query: поисковый запрос
+    :param max_pages: максимальное кол-во страниц для каждой платформы
+    :param state: состояние синхронизации (по умолчанию <файл данных>.sync.json, см. open_state)
+    :param engine: объект класса FetchEngine (по умолчанию создается новый)
+    :param index: индекс дублей (по умолчанию открывается индекс хранилища)
+    :return: словарь {платформа: кол-во добавленных вакансий}
+    """
+    if state is None:
+        state = open_state(file_handler)
+
+    if engine is None:
+        engine = FetchEngine()
+
+    result = {}
+
+    for platform in platforms:
+        started = datetime.now(timezone.utc)
+        last_sync = state.get_last_sync(query, platform)
+        date_from = last_sync - timedelta(seconds=SYNC_OVERLAP) if last_sync else None
+        new_keys = []
+
+        pages = iter_new_pages(platform, query, max_pages, date_from, state.get_seen(query, platform), engine,
+                               new_keys)
+        result[normalize_platform(platform)] = ingest_vacancies(file_handler, pages, index)
+
+        state.update(query, platform, started, new_keys)
+        state.save()
+
+    return result
@@ -1,8 +1,11 @@
 from time import sleep
+from typing import Iterable, Iterator
 
 from file_handler.json_handler import JsonHandler
-from parser.hh import HhParser
-from parser.sj import SjParser
+from parser.factory import create_parser
+from utils.dedup import DedupIndex
+from utils.fetch_engine import FetchEngine
+from utils.salary_stats import salary_report
 
 
 def greet_user():
@@ -40,37 +43,72 @@ def get_pages() -> int:
     return vacancy_amount // 50
 
 
-def get_vacancies(platforms: list, query: str, pages: int) -> list:
+def get_parsers(platforms: list, query: str, pages: int) -> list:
     """
-    Функция для получения списка вакансий с выбранных платформ
+    Функция для создания парсеров по одному на каждую страницу каждой платформы
     :param pages: кол-во страниц для обработки
     :param platforms: список выбранных платформ
     :param query: поисковой запрос пользователя
-    :return: список вакансий
+    :return: список объектов класса Parser в порядке страниц
     """
     parsers = []
 
     for page in range(pages):
         for platform in platforms:
-            if platform in ("hh.ru", 'hh'):
-                parser = HhParser(query, page)
-                parsers.append(parser)
-            elif platform in ("superjob.ru", 'sj', 'superjob'):
-                parser = SjParser(query, page)
-                parsers.append(parser)
-            else:
+            try:
+                parsers.append(create_parser(platform, query, page))
+            except ValueError:
                 sleep(2)
                 print(f"Неверная платформа: {platform}.\n")
-                raise ValueError
+                raise
+
+    return parsers
+
+
+def get_vacancies(platforms: list, query: str, pages: int, engine: FetchEngine | None = None) -> list:
+    """
+    Функция для получения списка вакансий с выбранных платформ.
+
+    Страницы запрашиваются одновременно, но вакансии возвращаются в порядке страниц
+    :param pages: кол-во страниц для обработки
+    :param platforms: список выбранных платформ
+    :param query: поисковой запрос пользователя
+    :param engine: объект класса FetchEngine (по умолчанию создается новый)
+    :return: список вакансий
+    """
+    parsers = get_parsers(platforms, query, pages)
+
+    if engine is None:
+        engine = FetchEngine()
 
     vacancies = []
 
-    for parser in parsers:
-        vacancies.extend(parser.parse_data())
+    for page in engine.run(parsers):
+        vacancies.extend(page)
 
     return vacancies
 
 
+def stream_vacancies(platforms: list, query: str, pages: int, engine: FetchEngine | None = None) -> Iterator[list]:
+    """
+    Функция для постраничного получения вакансий с выбранных платформ.
+
+    Парсеры создаются сразу (ошибка в названии платформы выбрасывается до начала загрузки),
+    а страницы отдаются по мере получения в порядке страниц
+    :param pages: кол-во страниц для обработки
+    :param platforms: список выбранных платформ
+    :param query: поисковой запрос пользователя
+    :param engine: объект класса FetchEngine (по умолчанию создается новый)
+    :return: генератор списков вакансий по одной странице
+    """
+    parsers = get_parsers(platforms, query, pages)
+
+    if engine is None:
+        engine = FetchEngine()
+
+    return engine.iter_pages(parsers)
+
+
 def save_vacancies(vacancies: list) -> JsonHandler:
     """
     Функция для сохранения списка вакансий в файл
@@ -85,6 +123,20 @@ def save_vacancies(vacancies: list) -> JsonHandler:
     return file_handler
 
 
+def save_vacancies_stream(pages: Iterable[list]) -> JsonHandler:
+    """
+    Функция для постраничного сохранения вакансий в файл по мере их получения
+    :param pages: итерируемый объект со списками объектов класса Vacancy
+    :return: объект класса JsonHandler
+    """
+    file_handler = JsonHandler("vacancies.json")
+    count = file_handler.add_vacancies_stream(pages)
+
+    print(f"В файл {file_handler.filename} сохранено {count} вакансий.\n")
+
+    return file_handler
+
+
 def show_options():
     """
     Функция для вывода списка возможных действий с данными
@@ -95,7 +147,8 @@ def show_options():
     print("2. Получить вакансии в отсортированном виде")
     print("3. Получить вакансии, в описании которых есть определенные ключевые слова")
     print("4. Удалить вакансии по какому-то критерию")
-    print("5. Выйти из программы")
+    print("5. Получить статистику по зарплатам")
+    print("6. Выйти из программы")
 
 
 def get_action() -> str:
@@ -105,7 +158,7 @@ def get_action() -> str:
     """
     action = input("Введите номер действия: ")
 
-    if action not in ('1', '2', '3', '4', '5'):
+    if action not in ('1', '2', '3', '4', '5', '6'):
         sleep(2)
         print(f'Неверно указан номер действия: {action}.\n')
         raise ValueError
@@ -120,7 +173,7 @@ def get_top_salary_vacancies(n: int, file_handler: JsonHandler):
     :param n: кол-во вакансий
     :return: None
     """
-    top_vacancies = sorted(file_handler.get_vacancies(), key=lambda el: el.get_salary(), reverse=True)[:n]
+    top_vacancies = file_handler.top_by_salary(n)
     print(f"\nТоп {n} вакансий по зарплате:")
 
     for vacancy in top_vacancies:
@@ -242,7 +295,7 @@ def get_keywords() -> dict:
     :return: словарь ключевых слов
     """
     keywords = {}
-    filters = ["city", "employer", "salary", "description", "requirements", "source"]
+    filters = ["city", "employer", "salary", "description", "requirements", "source", "text"]
 
     print("\nВыберите какие фильтры вы хотите задать:")
 
@@ -300,6 +353,11 @@ def get_keywords() -> dict:
                 source = source.lower()
                 keywords["source"] = source
 
+            elif filter_ == "text":
+                words = input("Введите ключевые слова для поиска по названию, описанию и требованиям через запятую: ")
+                mode = input("Вакансия должна содержать все слова или хотя бы одно? (all/any): ").strip().lower()
+                keywords["text"] = {"words": words, "mode": "or" if mode == "any" else "and", "prefix": True}
+
             filters.remove(filter_)
 
             print(f'Выбранный фильтр {filter_} задан. Вы можете задать остальные фильтры: ост. {len(filters)}')
@@ -381,10 +439,55 @@ def keywords_confirmation(keywords) -> dict:
     return confirmed_keywords
 
 
+def get_stats_dimension() -> str:
+    """
+    Функция для получения поля, по которому группируется статистика зарплат
+    :return: название поля вакансии
+    """
+    dimensions = {'1': 'location', '2': 'employer', '3': 'experience', '4': 'source'}
+
+    print("Вы можете получить статистику по зарплатам в разрезе:")
+    print("1. Городов")
+    print("2. Работодателей")
+    print("3. Опыта работы")
+    print("4. Источников вакансий")
+
+    while True:
+        choice = input('Введите номер действия: ')
+
+        if choice in dimensions:
+            return dimensions[choice]
+        else:
+            sleep(1)
+            print(f'Неверно указан номер действия: {choice}.\n')
+            continue
+
+
+def show_salary_stats(stats: dict, limit: int = 10):
+    """
+    Функция для вывода статистики зарплат по группам с наибольшим кол-вом вакансий
+    :param stats: словарь {группа: статистика} (см. salary_stats.salary_report)
+    :param limit: кол-во выводимых групп
+    :return: None
+    """
+    if not stats:
+        print("\nНет вакансий с указанной зарплатой.\n")
+        return
+
+    print(f"\nСтатистика по зарплатам (групп: {len(stats)}, показано не больше {limit}):")
+
+    for group, summary in list(stats.items())[:limit]:
+        print(f"{group or 'Не указано'}: вакансий {summary['count']}, "
+              f"медиана {summary['median']:.0f}, 25% {summary['p25']:.0f}, 75% {summary['p75']:.0f}, "
+              f"среднее {summary['mean']:.0f}, мин {summary['min']:.0f}, макс {summary['max']:.0f}")
+
+    print()
+
+
 def perform_action(action: str, file_handler: JsonHandler):
     """
     Функция для выполнения выбранного действия с данными
-    :param action: выбранное пользователем действие (1-5)
+    :param action: выбранное пользователем действие (1-6)
     :param file_handler: объект для работы с файлом данных
     :return: None
     """
@@ -416,9 +519,9 @@ def perform_action(action: str, file_handler: JsonHandler):
             order = get_order_type()
 
             if order == "asc":
-                sorted_vacancies_salary = sorted(file_handler.get_vacancies(), key=lambda el: el.get_salary())
+                sorted_vacancies_salary = sorted(file_handler.get_vacancies(), key=lambda el: el.salary_key)
             else:
-                sorted_vacancies_salary = sorted(file_handler.get_vacancies(), key=lambda el: el.get_salary(),
+                sorted_vacancies_salary = sorted(file_handler.get_vacancies(), key=lambda el: el.salary_key,
                                                  reverse=True)
 
             show_sorted_vacancies(sorted_vacancies_salary, sort_type, order=order)
@@ -448,10 +551,14 @@ def perform_action(action: str, file_handler: JsonHandler):
 
         confirmed_keywords = keywords_confirmation(keywords)
 
-        vacancies_to_delete = file_handler.get_vacancies(**confirmed_keywords)
+        deleted = file_handler.delete_where(**confirmed_keywords)
+        print(f"Из файла {file_handler.filename} удалено {deleted} вакансий.")
+
+    elif action == '5':
+        dimension = get_stats_dimension()
+        report = salary_report(file_handler.iter_vacancies(), dimensions=(dimension,))
 
-        file_handler.delete_vacancies(vacancies_to_delete)
-        print(f"Из файла {file_handler.filename} удалено {len(vacancies_to_delete)} вакансий.")
+        show_salary_stats(report[dimension])
 
 
 def interact() -> int:
@@ -466,14 +573,12 @@ def interact() -> int:
 
     try:
         pages = get_pages()
-        vacancies = get_vacancies(platforms, query, pages)
+        file_handler = save_vacancies_stream(DedupIndex().filter_pages(stream_vacancies(platforms, query, pages)))
     except ValueError:
         print('Ошибка при обработке запроса. Попробуйте еще раз.\n')
         sleep(2)
         return 1
 
-    file_handler = save_vacancies(vacancies)
-
     show_options()
 
     try:
@@ -483,7 +588,7 @@ def interact() -> int:
         sleep(2)
         return 1
 
-    while action != "5":
+    while action != "6":
         try:
             perform_action(action, file_handler)
 
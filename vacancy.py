@@ -1,21 +1,176 @@
 class Vacancy:
-    __slots__ = ('__title', '__location', '__link', '__employer', '__salary',
-                 '__description', '__requirement', '__experience', '__source')
+    __slots__ = ('__title', '__location', '__link', '__employer', '__salary_from', '__salary_to', '__currency',
+                 '__salary_key', '__original_salary', '__description', '__requirement', '__experience', '__source',
+                 '__record')
 
     def __init__(self, **kwargs):
         """
         Конструктор класса Vacancy.
+
+        Зарплата может быть передана словарем {'from', 'to', 'currency'} (данные с API),
+        строкой 'от -> до' (данные из файла) или None и сразу приводится к числам.
+        Исходная зарплата до перевода в рубли (original_salary) передается в том же виде;
+        если ее нет, исходной считается сама зарплата.
         :param kwargs: словарь с приведенными к единому формату данными по вакансии
         """
         self.__title: str = kwargs['title']
         self.__location: str = kwargs['location']
         self.__link: str = kwargs['link']
         self.__employer: str = kwargs['employer']
-        self.__salary: dict | str = kwargs['salary']
+        self.__salary_from, self.__salary_to, self.__currency = self.parse_salary(kwargs['salary'])
+        self.__salary_key: float = self.calc_salary_key(self.__salary_from, self.__salary_to)
+        self.__original_salary: tuple = (self.parse_salary(kwargs['original_salary']) if kwargs.get('original_salary')
+                                         else (self.__salary_from, self.__salary_to, self.__currency))
         self.__description: str = kwargs['description']
         self.__requirement: str = kwargs['requirement']
         self.__experience: str = kwargs['experience']
         self.__source: str = kwargs['source']
+        self.__record: dict | None = None
+
+    @classmethod
+    def from_row(cls, title, location, link, employer, salary_from, salary_to, description, requirement, experience,
+                 source, original_salary: tuple | None = None) -> 'Vacancy':
+        """
+        Метод для быстрого создания вакансии из уже разобранных значений без словаря kwargs и вызова validate.
+
+        Текстовые поля проверяются сразу (не строки заменяются на 'empty...'), зарплата передается
+        числами в рублях, исходная зарплата - кортежем (от, до, валюта)
+        :return: объект класса Vacancy
+        """
+        vacancy = cls.__new__(cls)
+        text = cls.to_text
+
+        vacancy.__title = text(title)
+        vacancy.__location = text(location)
+        vacancy.__link = text(link)
+        vacancy.__employer = text(employer)
+        vacancy.__salary_from = cls.to_number(salary_from)
+        vacancy.__salary_to = cls.to_number(salary_to)
+        vacancy.__currency = 'RUB'
+        vacancy.__salary_key = cls.calc_salary_key(vacancy.__salary_from, vacancy.__salary_to)
+        vacancy.__original_salary = original_salary or (vacancy.__salary_from, vacancy.__salary_to, 'RUB')
+        vacancy.__description = text(description)
+        vacancy.__requirement = text(requirement)
+        vacancy.__experience = text(experience)
+        vacancy.__source = source
+        vacancy.__record = None
+
+        return vacancy
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'Vacancy':
+        """
+        Метод для создания вакансии из словаря, прочитанного из файла.
+
+        Исходная зарплата разбирается только при обращении к ней. Если в словаре есть все поля,
+        он сохраняется как готовый к записи вид вакансии (см. to_dict) и не собирается заново при сохранении
+        :param record: словарь с вакансией
+        :return: объект класса Vacancy
+        """
+        vacancy = cls.__new__(cls)
+        text = cls.to_text
+        salary_from, salary_to, _ = cls.parse_salary(record['salary'])
+        original_salary = record.get('original_salary')
+
+        vacancy.__title = text(record['title'])
+        vacancy.__location = text(record['location'])
+        vacancy.__link = text(record['link'])
+        vacancy.__employer = text(record['employer'])
+        vacancy.__salary_from = salary_from
+        vacancy.__salary_to = salary_to
+        vacancy.__currency = 'RUB'
+        vacancy.__salary_key = cls.calc_salary_key(salary_from, salary_to)
+        vacancy.__original_salary = original_salary or (salary_from, salary_to, 'RUB')
+        vacancy.__description = text(record['description'])
+        vacancy.__requirement = text(record['requirement'])
+        vacancy.__experience = text(record['experience'])
+        vacancy.__source = record['source']
+        # Копия, чтобы изменения словаря вакансии не затрагивали кэш обработчика, из которого он прочитан
+        vacancy.__record = dict(record) if original_salary else None
+
+        return vacancy
+
+    @staticmethod
+    def to_text(value) -> str:
+        """
+        Метод для проверки текстового поля
+        :param value: значение поля
+        :return: значение, если это строка, иначе 'empty...'
+        """
+        return value if isinstance(value, str) else 'empty...'
+
+    @staticmethod
+    def to_number(value) -> int | float:
+        """
+        Метод для приведения суммы к числу: целые значения хранятся как int, остальные как float
+        :param value: сумма (число, строка или None)
+        :return: число
+        """
+        if not value:
+            return 0
+
+        if isinstance(value, int):
+            return value
+
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+
+        value = float(value)
+
+        return int(value) if value.is_integer() else value
+
+    @classmethod
+    def parse_salary(cls, salary: dict | str | None) -> tuple[int | float, int | float, str]:
+        """
+        Метод для приведения зарплаты к числам
+        :param salary: зарплата в виде словаря, строки 'от -> до [валюта]' или None
+        :return: нижняя граница, верхняя граница и код валюты
+        """
+        if salary is None:
+            return 0, 0, 'RUB'
+
+        if isinstance(salary, str):
+            salary_parts = salary.split(' -> ')
+            salary_to, _, currency = salary_parts[1].partition(' ')
+            return cls.to_number(salary_parts[0]), cls.to_number(salary_to), currency or 'RUB'
+
+        return cls.to_number(salary.get('from')), cls.to_number(salary.get('to')), salary.get('currency') or 'RUB'
+
+    @staticmethod
+    def make_key(source: str, link: str, title: str, employer: str, location: str) -> str:
+        """
+        Метод для вычисления ключа, однозначно определяющего вакансию.
+
+        Обычно это ссылка на вакансию, а если ее нет - источник, название, работодатель и город
+        :return: ключ вакансии
+        """
+        if isinstance(link, str) and link.startswith('http'):
+            return link
+
+        return f'{source}|{title}|{employer}|{location}'
+
+    @classmethod
+    def record_key(cls, record: dict) -> str:
+        """
+        Метод для вычисления ключа вакансии по словарю из файла без создания объекта Vacancy
+        :param record: словарь с вакансией
+        :return: ключ вакансии
+        """
+        return cls.make_key(record['source'], record['link'], record['title'], record['employer'], record['location'])
+
+    @staticmethod
+    def calc_salary_key(salary_from: int | float, salary_to: int | float) -> float:
+        """
+        Метод для вычисления ключа сортировки по зарплате: середина вилки,
+        а если указана только одна граница - она сама
+        :param salary_from: нижняя граница зарплаты
+        :param salary_to: верхняя граница зарплаты
+        :return: ключ сортировки
+        """
+        if salary_from and salary_to:
+            return (salary_from + salary_to) / 2
+
+        return float(salary_from or salary_to)
 
     @property
     def title(self):
@@ -34,20 +189,31 @@ class Vacancy:
         return self.__employer
 
     @property
-    def salary_from(self) -> int:
-        if isinstance(self.__salary, dict):
-            return self.__salary['from']
-        else:
-            salary_parts = self.__salary.split(' -> ')
-            return int(float(salary_parts[0]))
+    def salary_from(self) -> int | float:
+        return self.__salary_from
 
     @property
-    def salary_to(self) -> int:
-        if isinstance(self.__salary, dict):
-            return self.__salary['to']
-        else:
-            salary_parts = self.__salary.split(' -> ')
-            return int(float(salary_parts[1]))
+    def salary_to(self) -> int | float:
+        return self.__salary_to
+
+    @property
+    def currency(self) -> str:
+        return self.__currency
+
+    @property
+    def salary_key(self) -> float:
+        return self.__salary_key
+
+    @property
+    def original_salary(self) -> tuple:
+        if isinstance(self.__original_salary, str):
+            self.__original_salary = self.parse_salary(self.__original_salary)
+
+        return self.__original_salary
+
+    @property
+    def key(self) -> str:
+        return self.make_key(self.__source, self.__link, self.__title, self.__employer, self.__location)
 
     @property
     def description(self):
@@ -80,10 +246,12 @@ class Vacancy:
         if len(requirements) > 150:
             requirements = requirements[:147] + "..."
 
+        original = f" (исходно {self.get_original_salary()})" if self.original_salary[2] != 'RUB' else ""
+
         result = (f"Вакансия: {self.__title}\n"
                   f"Город: {self.__location}\n"
                   f"Работодатель: {self.__employer}\n"
-                  f"Зарплата: {self.get_salary()}\n"
+                  f"Зарплата: {self.get_salary()}{original}\n"
                   f"Описание: {description}\n"
                   f"Требования: {requirements}\n"
                   f"Опыт работы: {self.__experience}\n"
@@ -106,8 +274,7 @@ class Vacancy:
         :return: True, если зарплаты равны, иначе False
         """
         if isinstance(other, Vacancy):
-            return (self.__salary['from'] == other.__salary['from']
-                    and self.__salary['to'] == other.__salary['to'])
+            return self.__salary_from == other.__salary_from and self.__salary_to == other.__salary_to
         else:
             raise TypeError('Неподдерживаемый тип операнда. Можно сравнить только объекты класса Vacancy.')
 
@@ -118,8 +285,7 @@ class Vacancy:
         :return: True, если зарплата меньше, иначе False
         """
         if isinstance(other, Vacancy):
-            return (self.__salary['from'] < other.__salary['from']
-                    and self.__salary['to'] < other.__salary['to'])
+            return self.__salary_from < other.__salary_from and self.__salary_to < other.__salary_to
         else:
             raise TypeError('Неподдерживаемый тип операнда. Можно сравнить только объекты класса Vacancy.')
 
@@ -127,22 +293,21 @@ class Vacancy:
         """
         Метод для проверки корректности данных и приведения их к нужному формату.
 
-        Например, если зарплата указана в USD или EUR, то переводит её в рубли.
+        Например, если зарплата указана в USD или EUR, то переводит её в рубли. Если курса валюты
+        нет в rates, зарплата в рублях считается неуказанной, а исходная сохраняется.
+        Зарплаты с API лучше переводить сразу для всей страницы (exchange_rates_api.normalize_salaries).
+        :param rates: словарь {валюта: стоимость в рублях}
         :return:
         """
-        if self.__salary is None:
-            self.__salary = {'from': 0, 'to': 0, 'currency': 'RUB'}
-        elif self.__salary['from'] is None:
-            self.__salary['from'] = 0
-        elif self.__salary['to'] is None:
-            self.__salary['to'] = 0
+        self.__record = None
 
-        if self.__salary['currency'] in rates:
-            rate = rates[self.__salary['currency']]
+        if self.__currency != 'RUB':
+            rate = rates.get(self.__currency, 0)
 
-            self.__salary['from'] *= rate
-            self.__salary['to'] *= rate
-            self.__salary['currency'] = 'RUB'
+            self.__salary_from = self.to_number(self.__salary_from * rate)
+            self.__salary_to = self.to_number(self.__salary_to * rate)
+            self.__salary_key = self.calc_salary_key(self.__salary_from, self.__salary_to)
+            self.__currency = 'RUB'
 
         if self.__title is None or not isinstance(self.__title, str):
             self.__title = 'empty...'
@@ -165,26 +330,41 @@ class Vacancy:
         if self.__experience is None or not isinstance(self.__experience, str):
             self.__experience = 'empty...'
 
+    def to_dict(self) -> dict:
+        """
+        Метод для получения вакансии в виде словаря для записи в файл.
+
+        Словарь создается один раз и кэшируется (изменять его нельзя)
+        :return: словарь с вакансией
+        """
+        if self.__record is None:
+            self.__record = {
+                'title': self.__title,
+                'location': self.__location,
+                'link': self.__link,
+                'employer': self.__employer,
+                'salary': self.get_salary(),
+                'original_salary': self.get_original_salary(),
+                'description': self.__description,
+                'requirement': self.__requirement,
+                'experience': self.__experience,
+                'source': self.__source
+            }
+
+        return self.__record
+
     def get_salary(self) -> str:
         """
         Метод для строкового представления зарплаты
-        :return: строковое представление поля __salary
+        :return: строковое представление зарплаты в виде 'от -> до'
         """
-        if isinstance(self.__salary, str):
-            return self.__salary
-        else:
-            if self.__salary['from'] and self.__salary['to']:
-                salary_total = f'{self.__salary["from"]} -> {self.__salary["to"]}'
-                return salary_total
+        return f'{self.__salary_from} -> {self.__salary_to}'
 
-            elif self.__salary['to']:
-                salary_total = f'0 -> {self.__salary["to"]}'
-                return salary_total
-
-            elif self.__salary['from']:
-                salary_total = f'{self.__salary["from"]} -> 0'
-                return salary_total
+    def get_original_salary(self) -> str:
+        """
+        Метод для строкового представления зарплаты до перевода в рубли
+        :return: строковое представление зарплаты в виде 'от -> до валюта'
+        """
+        salary_from, salary_to, currency = self.original_salary
 
-            else:
-                salary_total = '0 -> 0'
-                return salary_total
+        return f'{salary_from} -> {salary_to} {currency}'
@@ -0,0 +1,238 @@
+import numpy as np
+
+from file_handler.filters import compile_conditions, parse_filters
+from vacancy import Vacancy
+
+CATEGORICAL = ('location', 'employer', 'source', 'experience')
+TEXT = ('title', 'link', 'description', 'requirement')
+NUMERIC = ('salary_from', 'salary_to', 'salary_key')
+
+# Критерии фильтрации (см. filters.parse_filters), которые проверяются по кодам категорий
+CATEGORICAL_KEYS = {'city': 'location', 'employer': 'employer', 'source': 'source', 'experience': 'experience'}
+
+
+class VacancyTable:
+
+    def __init__(self, columns: dict[str, np.ndarray], categories: dict[str, np.ndarray]):
+        """
+        Конструктор класса VacancyTable.
+
+        Таблица хранит вакансии по колонкам: зарплаты - массивами float64, город, работодатель,
+        источник и опыт - кодами категорий (int32) со списком категорий, остальные поля - массивами
+        объектов. Фильтрация, сортировка и группировка выполняются операциями NumPy над колонками.
+        :param columns: словарь {название колонки: массив}
+        :param categories: словарь {название категориальной колонки: массив категорий}
+        """
+        self.__columns = columns
+        self.__categories = categories
+
+    @classmethod
+    def from_vacancies(cls, vacancies: list[Vacancy]) -> 'VacancyTable':
+        """
+        Метод для создания таблицы из списка вакансий
+        :param vacancies: список объектов класса Vacancy
+        :return: объект класса VacancyTable
+        """
+        columns = {}
+        categories = {}
+
+        for name in NUMERIC:
+            columns[name] = np.fromiter((getattr(vacancy, name) for vacancy in vacancies), dtype=np.float64,
+                                        count=len(vacancies))
+
+        for name in TEXT:
+            columns[name] = np.array([getattr(vacancy, name) for vacancy in vacancies], dtype=object)
+
+        for name in CATEGORICAL:
+            values = np.array([getattr(vacancy, name) for vacancy in vacancies], dtype=object)
+            categories[name], codes = np.unique(values, return_inverse=True) if len(values) else (values, values)
+            columns[name] = codes.astype(np.int32)
+
+        # Исходные зарплаты - кортежи (от, до, валюта), поэтому массив объектов заполняется поэлементно
+        columns['original_salary'] = np.empty(len(vacancies), dtype=object)
+
+        for i, vacancy in enumerate(vacancies):
+            columns['original_salary'][i] = vacancy.original_salary
+
+        return cls(columns, categories)
+
+    def to_vacancies(self) -> list[Vacancy]:
+        """
+        Метод для преобразования таблицы в список вакансий
+        :return: список объектов класса Vacancy
+        """
+        vacancies = []
+        columns = self.__columns
+
+        for i in range(len(self)):
+            vacancies.append(Vacancy.from_row(columns['title'][i], self.get_value('location', i), columns['link'][i],
+                                              self.get_value('employer', i), columns['salary_from'][i],
+                                              columns['salary_to'][i], columns['description'][i],
+                                              columns['requirement'][i], self.get_value('experience', i),
+                                              self.get_value('source', i), columns['original_salary'][i]))
+
+        return vacancies
+
+    def __len__(self) -> int:
+        return len(self.__columns['salary_key'])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Метод для получения колонки; для категориальных колонок возвращаются значения, а не коды
+        :param name: название колонки
+        :return: массив значений
+        """
+        if name in self.__categories:
+            return self.__categories[name][self.__columns[name]]
+
+        return self.__columns[name]
+
+    def get_value(self, name: str, i: int):
+        """
+        Метод для получения значения колонки в строке i
+        :param name: название колонки
+        :param i: номер строки
+        :return: значение
+        """
+        if name in self.__categories:
+            return self.__categories[name][self.__columns[name][i]]
+
+        return self.__columns[name][i]
+
+    def take(self, indices: np.ndarray) -> 'VacancyTable':
+        """
+        Метод для создания таблицы из строк с указанными номерами (или по булевой маске)
+        :param indices: массив номеров строк или булева маска
+        :return: объект класса VacancyTable
+        """
+        return VacancyTable({name: column[indices] for name, column in self.__columns.items()}, self.__categories)
+
+    def category_mask(self, name: str, values: frozenset | str) -> np.ndarray:
+        """
+        Метод для получения маски строк, у которых категория (без учета регистра) входит в values
+        :param name: название категориальной колонки
+        :param values: значение или множество значений в нижнем регистре
+        :return: булева маска строк
+        """
+        values = {values} if isinstance(values, str) else values
+        matching = [code for code, category in enumerate(self.__categories[name]) if category.lower() in values]
+
+        return np.isin(self.__columns[name], matching)
+
+    def filter_mask(self, **keywords) -> np.ndarray:
+        """
+        Метод для получения маски строк, удовлетворяющих критериям (см. filters.parse_filters).
+
+        Критерии по категориям и зарплате проверяются операциями над массивами,
+        поиск по тексту - построчно и только для строк, прошедших остальные критерии.
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: булева маска строк
+        """
+        mask = np.ones(len(self), dtype=bool)
+        row_conditions = []
+
+        for condition in parse_filters(keywords):
+            if condition.key in CATEGORICAL_KEYS:
+                condition_mask = self.category_mask(CATEGORICAL_KEYS[condition.key], condition.value)
+            elif condition.op == 'range':
+                low, high = condition.value
+                condition_mask = np.ones(len(self), dtype=bool)
+
+                if low is not None:
+                    condition_mask &= self.__columns['salary_from'] >= low
+
+                if high is not None:
+                    condition_mask &= self.__columns['salary_to'] <= high
+            else:
+                row_conditions.append(condition)
+                continue
+
+            mask &= ~condition_mask if condition.negate else condition_mask
+
+        if row_conditions:
+            is_match = compile_conditions(row_conditions, for_records=True)
+            columns = self.__columns
+
+            for i in np.flatnonzero(mask):
+                record = {name: columns[name][i] for name in TEXT}
+                mask[i] = is_match(record)
+
+        return mask
+
+    def filter(self, **keywords) -> 'VacancyTable':
+        """
+        Метод для отбора строк, удовлетворяющих критериям
+        :param keywords: словарь с критериями для фильтрации вакансий
+        :return: объект класса VacancyTable
+        """
+        return self.take(self.filter_mask(**keywords))
+
+    def sort_keys(self, name: str) -> np.ndarray:
+        """
+        Метод для получения значений колонки, по которым можно сортировать.
+
+        Категории хранятся отсортированными, поэтому для категориальных колонок ключом служит код
+        :param name: название числовой или категориальной колонки
+        :return: массив ключей сортировки
+        """
+        if name not in NUMERIC and name not in CATEGORICAL:
+            raise ValueError(f"Сортировка по колонке {name} не поддерживается")
+
+        return self.__columns[name]
+
+    def sort_by(self, name: str = 'salary_key', reverse: bool = False) -> 'VacancyTable':
+        """
+        Метод для сортировки таблицы по колонке (устойчивая сортировка)
+        :param name: название колонки
+        :param reverse: True - по убыванию
+        :return: объект класса VacancyTable
+        """
+        keys = self.sort_keys(name)
+        order = np.argsort(-keys if reverse else keys, kind='stable')
+
+        return self.take(order)
+
+    def top_by_salary(self, n: int) -> 'VacancyTable':
+        """
+        Метод для получения n строк с наибольшей зарплатой (частичная сортировка)
+        :param n: кол-во строк
+        :return: объект класса VacancyTable, отсортированный по убыванию зарплаты
+        """
+        keys = self.__columns['salary_key']
+
+        if n < len(self):
+            candidates = np.argpartition(-keys, n)[:n]
+        else:
+            candidates = np.arange(len(self))
+
+        order = candidates[np.lexsort((candidates, -keys[candidates]))]
+
+        return self.take(order)
+
+    def group_by(self, name: str, value: str = 'salary_key', skip_empty: bool = True) -> dict[str, dict]:
+        """
+        Метод для расчета статистики колонки value по группам категориальной колонки name
+        :param name: название категориальной колонки (location, employer, source, experience)
+        :param value: название числовой колонки
+        :param skip_empty: не учитывать строки с нулевым значением
+        :return: словарь {категория: {'count', 'mean', 'min', 'p25', 'median', 'p75', 'max'}}
+        """
+        codes = self.__columns[name]
+        values = self.__columns[value]
+
+        if skip_empty:
+            codes, values = codes[values > 0], values[values > 0]
+
+        order = np.argsort(codes, kind='stable')
+        codes, values = codes[order], values[order]
+        unique_codes, starts = np.unique(codes, return_index=True)
+        result = {}
+
+        for code, group in zip(unique_codes, np.split(values, starts[1:])):
+            p25, median, p75 = np.percentile(group, [25, 50, 75])
+            result[str(self.__categories[name][code])] = {
+                'count': int(len(group)), 'mean': float(group.mean()), 'min': float(group.min()),
+                'p25': float(p25), 'median': float(median), 'p75': float(p75), 'max': float(group.max()),
+            }
+
+        return result